@@ -1,8 +1,13 @@
+import time
+
+# Taken before the framework imports so that `startup` includes them
+_import_started = time.perf_counter()
+
 import os
+import threading
 from dotenv import load_dotenv
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from sqlalchemy.orm import DeclarativeBase
 
 # Load environment variables
@@ -15,15 +20,182 @@ db = SQLAlchemy(model_class=Base)
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY") or "sudoku_secret_key"
 
-# Configure database
+# Configure database (checked and bound to the app by create_app)
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-if app.config["SQLALCHEMY_DATABASE_URI"] is None:
-    raise RuntimeError("DATABASE_URL environment variable is not set")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-db.init_app(app)
-migrate = Migrate(app, db)
+# Connection pool shared by the ORM and the raw-SQL helpers in utils/db.py.
+# DB_POOL_MIN_SIZE connections are kept open; up to DB_POOL_MAX_SIZE are
+# opened under load. Connections are pinged before use and recycled after
+# DB_POOL_RECYCLE seconds. The sizes only apply to pooled databases
+# (PostgreSQL, SQLite files), not in-memory SQLite; see engine_options.
+app.config["DB_POOL_MIN_SIZE"] = int(os.environ.get("DB_POOL_MIN_SIZE", 5))
+app.config["DB_POOL_MAX_SIZE"] = int(os.environ.get("DB_POOL_MAX_SIZE", 15))
+app.config["DB_POOL_TIMEOUT"] = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+app.config["DB_POOL_RECYCLE"] = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+app.config["DB_STATEMENT_TIMEOUT"] = int(os.environ.get("DB_STATEMENT_TIMEOUT", 0))
+# Pre-generated puzzle pool used by /new-game
+app.config["PUZZLE_POOL_LOW_WATER"] = int(os.environ.get("PUZZLE_POOL_LOW_WATER", 10))
+app.config["PUZZLE_POOL_HIGH_WATER"] = int(os.environ.get("PUZZLE_POOL_HIGH_WATER", 30))
+app.config["PUZZLE_POOL_WORKERS"] = int(os.environ.get("PUZZLE_POOL_WORKERS", 2))
+# Serve random symmetries of the vetted seed puzzles before generating new ones
+app.config["PUZZLE_SEED_TRANSFORMS"] = os.environ.get("PUZZLE_SEED_TRANSFORMS", "true").lower() == "true"
+
+# Worker processes that run hint analysis and on-demand puzzle generation
+# off the request threads (0 runs them inline). At most
+# COMPUTE_QUEUE_DEPTH calls wait or run at once per web worker; more are
+# answered with 503, and calls taking over COMPUTE_TIMEOUT seconds with 504.
+app.config["COMPUTE_POOL_WORKERS"] = int(os.environ.get("COMPUTE_POOL_WORKERS", 2))
+app.config["COMPUTE_QUEUE_DEPTH"] = int(os.environ.get("COMPUTE_QUEUE_DEPTH", 32))
+app.config["COMPUTE_TIMEOUT"] = float(os.environ.get("COMPUTE_TIMEOUT", 10))
+
+# Optional latency budget (seconds) for hint analysis; the best hint found
+# so far is returned once it is spent
+app.config["HINT_TIME_BUDGET"] = float(os.environ["HINT_TIME_BUDGET"]) if os.environ.get("HINT_TIME_BUDGET") else None
+
+# In-process cache of game solutions looked up by /hint
+app.config["GAME_CACHE_MAX_ENTRIES"] = int(os.environ.get("GAME_CACHE_MAX_ENTRIES", 50000))
+app.config["GAME_CACHE_TTL"] = float(os.environ.get("GAME_CACHE_TTL", 6 * 3600))
+
+# Daily challenge pre-generation: keep this many days (from today) ready,
+# checking every DAILY_SCHEDULER_INTERVAL seconds
+app.config["DAILY_PREGENERATE_DAYS"] = int(os.environ.get("DAILY_PREGENERATE_DAYS", 3))
+app.config["DAILY_SCHEDULER_INTERVAL"] = float(os.environ.get("DAILY_SCHEDULER_INTERVAL", 3600))
+app.config["DAILY_SCHEDULER_ENABLED"] = os.environ.get("DAILY_SCHEDULER_ENABLED", "true").lower() == "true"
+
+# Hint response cache: 'memory' (per worker), 'sqlite' (shared by workers
+# through a local file) or 'none'
+app.config["HINT_CACHE_BACKEND"] = os.environ.get("HINT_CACHE_BACKEND", "memory")
+app.config["HINT_CACHE_PATH"] = os.environ.get("HINT_CACHE_PATH", os.path.join(app.instance_path, "hint_cache.sqlite3"))
+app.config["HINT_CACHE_MAX_ENTRIES"] = int(os.environ.get("HINT_CACHE_MAX_ENTRIES", 10000))
+app.config["HINT_CACHE_MAX_BYTES"] = int(os.environ.get("HINT_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+app.config["HINT_CACHE_TTL"] = float(os.environ.get("HINT_CACHE_TTL", 3600))
+app.config["HINT_CACHE_EVICTION"] = os.environ.get("HINT_CACHE_EVICTION", "lru")
+# Key boards by their symmetry canonical form so equivalent boards share an entry
+# (off by default: canonical_form costs a few ms per board, more than most analyses)
+app.config["HINT_CACHE_CANONICAL"] = os.environ.get("HINT_CACHE_CANONICAL", "false").lower() == "true"
+
+# In-progress games whose conflict counts are kept in memory per worker
+app.config["MOVE_TRACKER_CACHE_SIZE"] = int(os.environ.get("MOVE_TRACKER_CACHE_SIZE", 10000))
+
+# Most submissions accepted by one /submissions/bulk request
+app.config["SUBMISSION_BULK_MAX_SIZE"] = int(os.environ.get("SUBMISSION_BULK_MAX_SIZE", 10000))
+
+# Daily leaderboards are served from memory and synced with the database in the background
+app.config["LEADERBOARD_SYNC_INTERVAL"] = float(os.environ.get("LEADERBOARD_SYNC_INTERVAL", 10))
+app.config["LEADERBOARD_MAX_DAYS"] = int(os.environ.get("LEADERBOARD_MAX_DAYS", 7))
+app.config["LEADERBOARD_MAX_LIMIT"] = int(os.environ.get("LEADERBOARD_MAX_LIMIT", 100))
+# Ranked times are measured by the server from the signed "started" token
+# /daily-challenge hands out; solves faster than this many seconds per empty
+# cell are recorded but not ranked
+app.config["LEADERBOARD_MIN_SECONDS_PER_CELL"] = float(os.environ.get("LEADERBOARD_MIN_SECONDS_PER_CELL", 1.0))
+
+# /metrics: with several worker processes, set METRICS_DIR to a directory
+# they share so each writes its values there every METRICS_FLUSH_INTERVAL
+# seconds and any worker can report the totals
+app.config["METRICS_DIR"] = os.environ.get("METRICS_DIR")
+app.config["METRICS_FLUSH_INTERVAL"] = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+# Application logs are written by a background thread; only LOG_SAMPLE_RATE
+# of the records below WARNING are kept
+app.config["LOG_LEVEL"] = os.environ.get("LOG_LEVEL", "INFO")
+app.config["LOG_SAMPLE_RATE"] = float(os.environ.get("LOG_SAMPLE_RATE", 0.1))
+app.config["LOG_QUEUE_SIZE"] = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+
+# Steps a worker of create_app(warm_up=True) runs after it starts, before
+# /ready reports it ready:
+# "all", "none" or a comma-separated list of database, compute, puzzles,
+# tables and daily (see the warm_up steps in routes.py)
+app.config["WARM_UP"] = os.environ.get("WARM_UP", "all")
+
+# Seconds from the start of this module's import to each start-up milestone
+# (imported, created, warmed_up, first_request); reported by /ready
+startup = {}
+_create_lock = threading.Lock()
+_created = False
+
+
+def mark_startup(milestone: str):
+    """Record ``milestone`` as reached now, unless it already was"""
+    startup.setdefault(milestone, round(time.perf_counter() - _import_started, 4))
 
-with app.app_context():
-    import models
+
+def warmed_up():
+    """Called once the warm-up steps have all succeeded"""
+    mark_startup("warmed_up")
+    app.logger.info("Started: %s", ", ".join(f"{name} {seconds:.3f}s" for name, seconds in startup.items()))
+
+
+def engine_options(uri: str) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for ``uri`` from the DB_POOL_* settings"""
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.pool import QueuePool
+
+    url = make_url(uri)
+    options = {
+        "pool_recycle": app.config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": True,
+    }
+    # In-memory SQLite gets a single static connection, which takes no sizes
+    in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    if not in_memory and issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options.update({
+            "pool_size": app.config["DB_POOL_MIN_SIZE"],
+            "max_overflow": max(app.config["DB_POOL_MAX_SIZE"] - app.config["DB_POOL_MIN_SIZE"], 0),
+            "pool_timeout": app.config["DB_POOL_TIMEOUT"],
+        })
+    if app.config["DB_STATEMENT_TIMEOUT"] and url.get_backend_name() == "postgresql":
+        # Milliseconds; applied by the server to every statement on the connection
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={app.config['DB_STATEMENT_TIMEOUT']}"
+        }
+    return options
+
+
+def create_app(warm_up: bool = False) -> Flask:
+    """Finish setting up the application and return it.
+
+    The first call checks DATABASE_URL, binds the database engine (which
+    connects on first use) and registers the models, routes and CLI
+    commands; later calls return the same app. ``warm_up`` arms the
+    WARM_UP steps without running them: nothing is started here, as the
+    app may be imported by a forking server's master (gunicorn --preload)
+    or by the reloader's watcher process. Each worker runs them from
+    start_warm_up(), called by gunicorn.conf.py after the fork, or else on
+    its first request, and /ready answers 503 until they are done. The
+    ``flask`` command uses create_app() through .flaskenv; main.py and
+    asgi.py warm up.
+    """
+    global _created
+    with _create_lock:
+        if not _created:
+            if app.config["SQLALCHEMY_DATABASE_URI"] is None:
+                raise RuntimeError("DATABASE_URL environment variable is not set")
+            # Alembic is only needed by `flask db`, so it is not imported with this module
+            from flask_migrate import Migrate
+
+            app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config["SQLALCHEMY_DATABASE_URI"]))
+            db.init_app(app)
+            Migrate(app, db)
+            with app.app_context():
+                import models  # noqa: F401
+                import routes  # noqa: F401
+                import commands  # noqa: F401
+            _created = True
+            mark_startup("created")
+
+    if warm_up:
+        import routes
+
+        routes.warm_up.arm()
+    return app
+
+
+def start_warm_up(wait: bool = False):
+    """Start this process's warm-up (if armed); with ``wait``, until every step was tried once"""
     import routes
+
+    routes.warm_up.start(wait)
+
+
+mark_startup("imported")
@@ -0,0 +1,14 @@
+"""ASGI entry point, e.g. ``uvicorn asgi:application --workers 4``.
+
+Needs the ``asgi`` extra (asgiref and uvicorn). The Flask views stay
+synchronous and asgiref runs each one in its thread pool; hint analysis
+and puzzle generation go to routes.compute_pool, so a slow call ties up
+a pool process rather than the event loop. Each worker starts its warm-up
+(see create_app) in the background on its first request, which may be the
+readiness probe; /ready answers 503 until it is done.
+"""
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+
+application = WsgiToAsgi(create_app(warm_up=True))
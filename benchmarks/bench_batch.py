@@ -0,0 +1,63 @@
+"""Batch validation benchmark: vectorised propagation vs. the per-board solver (requires numpy).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch [--puzzles 30000] [--seed 5]
+
+Puzzles are random symmetries of the seed bank, a third per difficulty.
+"rate" compares rate_batch with rate_puzzle per board; "validate" compares
+validate_batch with rate_puzzle + count_solutions + solve per board. The
+last column extrapolates to a million stored puzzles.
+"""
+import argparse
+import random
+import time
+
+from utils.batch import rate_batch, validate_batch
+from utils.generator import DIFFICULTY_PROFILES, transformed_puzzle
+from utils.solver import count_solutions, rate_puzzle, solve
+
+
+def validate_each(puzzles, solutions):
+    return [
+        rate_puzzle(puzzle) is not None and count_solutions(puzzle, 2) == 1 and solve(puzzle) == solution
+        for puzzle, solution in zip(puzzles, solutions)
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--puzzles', type=int, default=30000)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    difficulties = list(DIFFICULTY_PROFILES)
+    puzzles, solutions = [], []
+    for i in range(args.puzzles):
+        result = transformed_puzzle(difficulties[i % len(difficulties)], rng)
+        puzzles.append(result['puzzle'])
+        solutions.append(result['solution'])
+
+    rated, batch_rate = timed(rate_batch, puzzles)
+    expected, each_rate = timed(lambda: [rate_puzzle(p) for p in puzzles])
+    assert rated == expected
+    (valid, _), batch_validate = timed(validate_batch, puzzles, solutions)
+    expected, each_validate = timed(validate_each, puzzles, solutions)
+    assert valid == expected
+
+    scale = 1_000_000 / args.puzzles
+    print(f"{args.puzzles} puzzles")
+    print(f"{'':<10} {'per-board (s)':>14} {'batch (s)':>10} {'speed-up':>9} {'1M batch (min)':>15}")
+    for name, each, batch in (('rate', each_rate, batch_rate), ('validate', each_validate, batch_validate)):
+        print(f"{name:<10} {each:>14.2f} {batch:>10.2f} {each / batch:>8.1f}x {batch * scale / 60:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Board type benchmark: parse+validate, peer iteration and cloning.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_board [--boards 2000] [--seed 11]
+
+"before" reproduces the string handling the hint path used previously:
+the route's set-comprehension character checks and per-cell comparison
+with the solution, then the generator's own checks and list-of-lists
+board; peers came from nested row/column/box loops with ``3 * (row // 3)``
+arithmetic. "after" is Board.parse plus agrees_with, and the PEERS table.
+Cloning compares copying every buffer with Board.clone's copy-on-write.
+"""
+import argparse
+import random
+import time
+
+from utils.board import PEERS, Board
+from utils.generator import CandidateGrid, random_solution
+
+
+def legacy_parse(current_state, solution):
+    if {c for c in current_state if c not in '0123456789'}:
+        return None
+    if {c for c in solution if c not in '123456789'}:
+        return None
+    for current, expected in zip(current_state, solution):
+        if current != '0' and current != expected:
+            return None
+    if not all(c in '0123456789' for c in current_state) or not all(c in '123456789' for c in solution):
+        return None
+    return [list(current_state[i:i + 9]) for i in range(0, 81, 9)]
+
+
+def board_parse(current_state, solution):
+    board = Board.parse(current_state)
+    return board if board.agrees_with(Board.parse(solution, complete=True)) else None
+
+
+def legacy_peers(index):
+    row, col = divmod(index, 9)
+    peers = set()
+    for c in range(9):
+        peers.add(row * 9 + c)
+    for r in range(9):
+        peers.add(r * 9 + col)
+    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
+    for r in range(box_row, box_row + 3):
+        for c in range(box_col, box_col + 3):
+            peers.add(r * 9 + c)
+    peers.discard(index)
+    return peers
+
+
+def legacy_copy(grid):
+    return (list(grid.cells), list(grid.candidates),
+            [positions[:] for positions in grid.positions], grid.empty[:])
+
+
+def per_call(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(*item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--boards', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = []
+    for _ in range(args.boards):
+        solution = random_solution(rng)
+        pairs.append((''.join(d if rng.random() < 0.4 else '0' for d in solution), solution))
+    assert all((legacy_parse(*pair) is None) == (board_parse(*pair) is None) for pair in pairs)
+
+    cells = [(rng.randrange(81),) for _ in range(args.boards * 10)]
+    grids = [(CandidateGrid(state),) for state, _ in pairs[:500]]
+
+    def sum_peers(peers):
+        return lambda index: sum(1 for _ in peers(index))
+
+    rows = [
+        ('parse+validate', per_call(legacy_parse, pairs), per_call(board_parse, pairs)),
+        ('peer iteration', per_call(sum_peers(legacy_peers), cells), per_call(sum_peers(PEERS.__getitem__), cells)),
+        ('clone', per_call(legacy_copy, grids), per_call(CandidateGrid.copy, grids)),
+    ]
+    print(f"{'operation':<16} {'before (us)':>12} {'after (us)':>11} {'speed-up':>9}")
+    for name, before, after in rows:
+        print(f"{name:<16} {before:>12.2f} {after:>11.2f} {before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Symmetry canonicalisation benchmark: cold vs. memoised canonical_form.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_canonical [--grids 200] [--copies 5] [--seed 17]
+
+"cold" canonicalises a board whose solution has not been seen, which runs
+the minimal-form search. "warm" canonicalises another board of a game
+already seen (the hint cache case: every board in a game shares one
+solution), which only applies the memoised transform. Each board is also
+shuffled into random equivalent copies to check they all land on one
+canonical form.
+"""
+import argparse
+import random
+import time
+
+from utils.generator import _minlex_cached, canonical_form, random_solution, random_transform
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--grids', type=int, default=200)
+    parser.add_argument('--copies', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = []
+    for _ in range(args.grids):
+        solution = random_solution(rng)
+        states = [''.join(d if rng.random() < keep else '0' for d in solution) for keep in (0.4, 0.6)]
+        games.append((solution, states))
+
+    _minlex_cached.cache_clear()
+    start = time.perf_counter()
+    for solution, states in games:
+        canonical_form(states[0], solution)
+    cold = (time.perf_counter() - start) / len(games)
+
+    start = time.perf_counter()
+    for solution, states in games:
+        canonical_form(states[1], solution)
+    warm = (time.perf_counter() - start) / len(games)
+
+    forms = set()
+    for solution, states in games:
+        for _ in range(args.copies):
+            transform = random_transform(rng)
+            forms.add(canonical_form(transform.apply(states[0]), transform.apply(solution))[:2])
+
+    print(f"cold: {cold * 1000:.2f} ms per board (new solution)")
+    print(f"warm: {warm * 1000:.3f} ms per board (solution seen before)")
+    print(f"{args.grids * args.copies} shuffled copies of {args.grids} boards -> {len(forms)} canonical forms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Light-request latency while puzzles are generated, inline vs in the compute pool.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compute [--threads 4] [--seconds 5] [--workers 2]
+
+``--threads`` threads generate hard puzzles back to back, either inline
+(the old /new-game miss path) or through a ComputePool with
+``--workers`` processes. Meanwhile the main thread times a small piece of
+Python work every 10ms, standing in for a cheap request served by the
+same worker, including the wait to get the GIL back after sleeping.
+Inline generation holds the GIL, so these probes queue behind it. The
+pool row also shows the mean queue wait and run time per generation.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from utils import metrics
+from utils.compute import ComputePool
+from utils.generator import generate_unique_puzzle
+
+
+def probe():
+    """Sleep 10ms, then do a little work; returns the time beyond the 10ms"""
+    start = time.perf_counter()
+    time.sleep(0.01)
+    sum(i * i for i in range(2000))
+    return time.perf_counter() - start - 0.01
+
+
+def run(pool, threads, seconds):
+    stop = time.monotonic() + seconds
+    generated = []
+
+    def generate():
+        while time.monotonic() < stop:
+            pool.call('generate', generate_unique_puzzle, 'hard')
+            generated.append(1)
+
+    workers = [threading.Thread(target=generate) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    samples = []
+    while time.monotonic() < stop:
+        samples.append(probe())
+    for worker in workers:
+        worker.join()
+    samples.sort()
+    return (len(generated) / seconds, statistics.median(samples) * 1e3,
+            samples[int(len(samples) * 0.99) - 1] * 1e3)
+
+
+def mean(name, task='generate'):
+    counts = metrics.collect()[name]['samples'].get((task,))
+    return counts[-1] / sum(counts[:-1]) * 1e3 if counts else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'puzzles/s':>10} {'probe p50 (ms)':>15} {'probe p99 (ms)':>15} "
+          f"{'wait (ms)':>10} {'run (ms)':>9}")
+    rate, p50, p99 = run(ComputePool(workers=0), args.threads, args.seconds)
+    print(f"{'inline':<8} {rate:>10.1f} {p50:>15.3f} {p99:>15.3f} {'-':>10} {mean('sudoku_compute_run_seconds'):>9.1f}")
+
+    pool = ComputePool(workers=args.workers, max_pending=args.threads, timeout=None)
+    pool.start(wait=True)
+    for metric in (metrics.COMPUTE_WAIT, metrics.COMPUTE_RUN):
+        metric.reset()
+    rate, p50, p99 = run(pool, args.threads, args.seconds)
+    pool.shutdown()
+    print(f"{'pool':<8} {rate:>10.1f} {p50:>15.3f} {p99:>15.3f} "
+          f"{mean('sudoku_compute_queue_wait_seconds'):>10.1f} {mean('sudoku_compute_run_seconds'):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Raw SQL benchmark: pooled connections and bulk loads vs. one connection per query.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_db [--queries 2000] [--rows 5000] [--threads 8]
+
+Uses DATABASE_URL when set (point it at a scratch PostgreSQL database),
+otherwise a temporary SQLite file. "before" opens a fresh connection for
+every statement, as utils/db.py originally did; "after" borrows from the
+application's pool. Inserts compare one committed statement per row with
+executemany and copy_rows.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}"
+os.environ.setdefault('DAILY_SCHEDULER_ENABLED', 'false')
+os.environ.setdefault('PUZZLE_POOL_WORKERS', '0')
+os.environ.setdefault('COMPUTE_POOL_WORKERS', '0')
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app import create_app, db
+from utils.db import copy_rows, execute_sql, executemany, pool_stats, stream_sql
+
+app = create_app()
+
+TABLE = 'bench_db_rows'
+
+
+def placeholder():
+    return '?' if db.engine.dialect.paramstyle == 'qmark' else '%s'
+
+
+def unpooled_query(engine, query, params):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(query, params).fetchall()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_queries(func, queries, threads):
+    def work(i):
+        with app.app_context():
+            func(i)
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(work, range(queries)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    rows = [(i, '0' * 81) for i in range(args.rows)]
+
+    with app.app_context():
+        mark = placeholder()
+        query = f"SELECT id, puzzle FROM {TABLE} WHERE id = {mark}"
+        insert = f"INSERT INTO {TABLE} (id, puzzle) VALUES ({mark}, {mark})"
+        print(f"database: {db.engine.dialect.name}")
+        execute_sql(f"DROP TABLE IF EXISTS {TABLE}")
+        execute_sql(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, puzzle VARCHAR(81))")
+
+        print(f"{'inserts':<28} {'seconds':>8} {'rows/s':>10}")
+        for name, load in (
+            ('one statement per row', lambda: [execute_sql(insert, row) for row in rows]),
+            ('executemany', lambda: executemany(insert, rows)),
+            ('copy_rows', lambda: copy_rows(TABLE, ['id', 'puzzle'], rows)),
+        ):
+            execute_sql(f"DELETE FROM {TABLE}")
+            seconds = timed(load)
+            print(f"{name:<28} {seconds:>8.2f} {args.rows / seconds:>10.0f}")
+
+        unpooled = create_engine(app.config['SQLALCHEMY_DATABASE_URI'], poolclass=NullPool)
+        ids = [i % args.rows for i in range(args.queries)]
+        print(f"\n{args.queries} point queries from {args.threads} threads")
+        before = timed(run_queries, lambda i: unpooled_query(unpooled, query, (ids[i],)), args.queries, args.threads)
+        after = timed(run_queries, lambda i: execute_sql(query, (ids[i],)), args.queries, args.threads)
+        print(f"{'connection per query':<28} {before:>8.2f}s")
+        print(f"{'pooled':<28} {after:>8.2f}s  {before / after:.1f}x")
+
+        start = time.perf_counter()
+        streamed = sum(1 for _ in stream_sql(f"SELECT id, puzzle FROM {TABLE}", batch_size=500))
+        print(f"\nstream_sql: {streamed} rows in {time.perf_counter() - start:.2f}s")
+
+        execute_sql(f"DROP TABLE {TABLE}")
+        print(f"\npool: {pool_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""Hint analysis benchmark: per-request candidate grid vs. per-cell rescans.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_hint [--boards 20] [--seed 99]
+
+Boards are cut from fixed-seed solutions with 30, 50 and 60 empty cells.
+"before" is the original analyze_hint_candidates loop, which recomputes
+candidate sets through the per-cell helpers (kept below) for every empty
+cell of a list-of-lists board.
+"""
+import argparse
+import random
+import time
+
+from utils.generator import analyze_hint_candidates, random_solution
+
+
+def calculate_hint_impact(board, row, col, value):
+    """Calculate how impactful a hint would be based on surrounding empty cells"""
+    impact = 0
+    # Check row
+    impact += sum(1 for c in range(9) if board[row][c] == '0')
+    # Check column
+    impact += sum(1 for r in range(9) if board[r][col] == '0')
+    # Check 3x3 box
+    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
+    for r in range(box_row, box_row + 3):
+        for c in range(box_col, box_col + 3):
+            if board[r][c] == '0':
+                impact += 1
+    return impact
+
+
+def determine_solving_technique_with_cells(board, row, col, value):
+    """Determine which solving technique could be used for this cell and return related cells"""
+    related_cells = []
+    
+    # Check for single candidate
+    if is_single_candidate(board, row, col, value):
+        # Get cells that led to the elimination
+        related_cells = get_single_candidate_related_cells(board, row, col, value)
+        return "single_candidate", related_cells
+    
+    # Check for hidden single in row/column/box
+    hidden_single_result = is_hidden_single_with_cells(board, row, col, value)
+    if hidden_single_result[0]:
+        return "hidden_single", hidden_single_result[1]
+    
+    # If no specific technique is found, it's a basic elimination
+    return "basic_elimination", get_basic_elimination_cells(board, row, col)
+
+
+def is_single_candidate(board, row, col, value):
+    """Check if the cell has only one possible candidate"""
+    possible_values = get_possible_values(board, row, col)
+    return len(possible_values) == 1 and str(value) in possible_values
+
+
+def get_possible_values(board, row, col):
+    """Get set of possible values for a cell"""
+    if board[row][col] != '0':
+        return set()
+        
+    possible_values = set('123456789')
+    
+    # Remove values from row
+    for c in range(9):
+        if board[row][c] != '0':
+            possible_values.discard(board[row][c])
+            
+    # Remove values from column
+    for r in range(9):
+        if board[r][col] != '0':
+            possible_values.discard(board[r][col])
+            
+    # Remove values from 3x3 box
+    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
+    for r in range(box_row, box_row + 3):
+        for c in range(box_col, box_col + 3):
+            if board[r][c] != '0':
+                possible_values.discard(board[r][c])
+                
+    return possible_values
+
+
+def get_single_candidate_related_cells(board, row, col, value):
+    """Get cells that contribute to making this cell a single candidate"""
+    related_cells = []
+    
+    # Add filled cells in the same row
+    for c in range(9):
+        if board[row][c] != '0' and c != col:
+            related_cells.append({'row': row, 'col': c})
+    
+    # Add filled cells in the same column
+    for r in range(9):
+        if board[r][col] != '0' and r != row:
+            related_cells.append({'row': r, 'col': col})
+    
+    # Add filled cells in the same 3x3 box
+    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
+    for r in range(box_row, box_row + 3):
+        for c in range(box_col, box_col + 3):
+            if board[r][c] != '0' and (r != row or c != col):
+                related_cells.append({'row': r, 'col': c})
+    
+    return related_cells
+
+
+def is_hidden_single_with_cells(board, row, col, value):
+    """Check if the cell is a hidden single and return related cells"""
+    related_cells = []
+    str_value = str(value)
+    
+    # Check row
+    row_possible = []
+    for c in range(9):
+        if board[row][c] == '0' and str_value in get_possible_values(board, row, c):
+            row_possible.append(c)
+    if len(row_possible) == 1:
+        # Add all cells in the row
+        related_cells = [{'row': row, 'col': c} for c in range(9) if c != col]
+        return True, related_cells
+    
+    # Check column
+    col_possible = []
+    for r in range(9):
+        if board[r][col] == '0' and str_value in get_possible_values(board, r, col):
+            col_possible.append(r)
+    if len(col_possible) == 1:
+        # Add all cells in the column
+        related_cells = [{'row': r, 'col': col} for r in range(9) if r != row]
+        return True, related_cells
+    
+    # Check box
+    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
+    box_possible = []
+    for r in range(box_row, box_row + 3):
+        for c in range(box_col, box_col + 3):
+            if board[r][c] == '0' and str_value in get_possible_values(board, r, c):
+                box_possible.append((r, c))
+    if len(box_possible) == 1:
+        # Add all cells in the box
+        related_cells = [
+            {'row': r, 'col': c}
+            for r in range(box_row, box_row + 3)
+            for c in range(box_col, box_col + 3)
+            if r != row or c != col
+        ]
+        return True, related_cells
+    
+    return False, []
+
+
+def get_basic_elimination_cells(board, row, col):
+    """Get related cells for basic elimination technique"""
+    return [
+        {'row': row, 'col': c}
+        for c in range(9)
+        if c != col and board[row][c] != '0'
+    ]
+
+
+def legacy_analyze(current_state, solution):
+    board = [list(current_state[i:i + 9]) for i in range(0, 81, 9)]
+    solution_board = [list(solution[i:i + 9]) for i in range(0, 81, 9)]
+    candidates = []
+    for row in range(9):
+        for col in range(9):
+            if board[row][col] == '0':
+                value = solution_board[row][col]
+                impact_score = calculate_hint_impact(board, row, col, value)
+                technique, related_cells = determine_solving_technique_with_cells(board, row, col, value)
+                if not related_cells:
+                    continue
+                candidates.append({
+                    'row': row,
+                    'col': col,
+                    'value': value,
+                    'impact_score': impact_score,
+                    'technique': technique,
+                    'related_cells': related_cells
+                })
+    if not candidates:
+        return None
+    candidates.sort(key=lambda x: (-x['impact_score'], -len(x['technique'])))
+    return candidates[0]
+
+
+def build_boards(count, empties, rng):
+    boards = []
+    for _ in range(count):
+        solution = random_solution(rng)
+        cells = list(solution)
+        for index in rng.sample(range(81), empties):
+            cells[index] = '0'
+        boards.append((''.join(cells), solution))
+    return boards
+
+
+def time_per_board(func, boards):
+    start = time.perf_counter()
+    for state, solution in boards:
+        func(state, solution)
+    return (time.perf_counter() - start) / len(boards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--boards', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=99)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'empties':>8} {'before (ms)':>12} {'after (ms)':>12} {'speed-up':>9}")
+    for empties in (30, 50, 60):
+        boards = build_boards(args.boards, empties, rng)
+        before = time_per_board(legacy_analyze, boards)
+        after = time_per_board(analyze_hint_candidates, boards)
+        print(f"{empties:>8} {before * 1000:>12.2f} {after * 1000:>12.2f} {before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
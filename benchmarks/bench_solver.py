@@ -0,0 +1,102 @@
+"""Solved-grids-per-second benchmark: bitmask solver vs. the old backtracker.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_solver [--count 200] [--seed 1234]
+
+The corpus is built from a fixed seed so runs are comparable. It contains
+the grids ``generate_puzzle`` actually solves (three shuffled diagonal
+boxes) plus 45-hole puzzles cut from those solutions.
+"""
+import argparse
+import random
+import time
+
+from utils.solver import solve, count_solutions
+
+
+def legacy_solve(board):
+    """The recursive backtracker previously nested in generate_puzzle"""
+    def is_valid(board, row, col, num):
+        for x in range(9):
+            if board[row][x] == num:
+                return False
+        for x in range(9):
+            if board[x][col] == num:
+                return False
+        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
+        for i in range(3):
+            for j in range(3):
+                if board[i + start_row][j + start_col] == num:
+                    return False
+        return True
+
+    def _solve(board):
+        for i in range(9):
+            for j in range(9):
+                if board[i][j] == 0:
+                    for num in range(1, 10):
+                        if is_valid(board, i, j, num):
+                            board[i][j] = num
+                            if _solve(board):
+                                return True
+                            board[i][j] = 0
+                    return False
+        return True
+
+    _solve(board)
+    return ''.join(str(num) for row in board for num in row)
+
+
+def build_corpus(count, seed):
+    rng = random.Random(seed)
+    diagonal = []
+    for _ in range(count):
+        board = [[0] * 9 for _ in range(9)]
+        nums = list(range(1, 10))
+        for i in range(0, 9, 3):
+            rng.shuffle(nums)
+            for j in range(3):
+                for k in range(3):
+                    board[i + j][i + k] = nums[j * 3 + k]
+        diagonal.append(board)
+
+    puzzles = []
+    for board in diagonal:
+        solution = solve(board)
+        cells = list(solution)
+        for index in rng.sample(range(81), 45):
+            cells[index] = '0'
+        puzzles.append([[int(c) for c in ''.join(cells)[r * 9:r * 9 + 9]] for r in range(9)])
+    return diagonal, puzzles
+
+
+def run(name, func, corpus):
+    boards = [[row[:] for row in board] for board in corpus]
+    start = time.perf_counter()
+    for board in boards:
+        func(board)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<18} {len(boards) / elapsed:10.1f} grids/s  ({elapsed * 1000:.1f} ms total)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    diagonal, puzzles = build_corpus(args.count, args.seed)
+    for label, corpus in (('diagonal fill', diagonal), ('45-hole puzzles', puzzles)):
+        print(f"{label} ({len(corpus)} grids, seed {args.seed}):")
+        legacy = run('legacy backtracker', legacy_solve, corpus)
+        bitmask = run('bitmask solve()', solve, corpus)
+        print(f"  speed-up: {legacy / bitmask:.1f}x")
+
+    print("count_solutions(limit=2) on 45-hole puzzles:")
+    run('count_solutions', count_solutions, puzzles)
+
+
+if __name__ == '__main__':
+    main()
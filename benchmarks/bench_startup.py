@@ -0,0 +1,112 @@
+"""Worker start-up: import time and first-request latency with and without warm-up.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--runs 5]
+
+Each run starts a fresh interpreter on a new SQLite file, imports app,
+calls create_app() (and runs its warm-up to completion for the "warm" rows, with the
+WARM_UP steps from the environment), then times the first and second
+GET /new-game/easy, GET /daily-challenge and POST /hint. "first response"
+is the wall time from starting the process to the end of the first
+request. Medians over the runs are printed, in milliseconds. Pools are
+configured from the environment as usual, so the compute and puzzle pool
+processes are started per run.
+"""
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ENDPOINTS = ('new-game', 'daily', 'hint')
+
+
+def child(database, warm):
+    """Worker stand-in: report its start-up timings as one JSON line"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ.setdefault('DAILY_SCHEDULER_ENABLED', 'false')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    timings = {}
+
+    start = time.perf_counter()
+    from app import create_app, db, start_warm_up
+    timings['import'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app = create_app()
+    timings['create_app'] = time.perf_counter() - start
+    with app.app_context():
+        db.create_all()
+    if warm:
+        start = time.perf_counter()
+        create_app(warm_up=True)
+        start_warm_up(wait=True)
+        timings['warm_up'] = time.perf_counter() - start
+
+    client = app.test_client()
+    game = None
+    for attempt in ('first', 'second'):
+        for name in ENDPOINTS:
+            start = time.perf_counter()
+            if name == 'new-game':
+                game = client.get('/new-game/easy').get_json()
+            elif name == 'daily':
+                client.get('/daily-challenge')
+            else:
+                client.post('/hint', json={'game_id': game['game_id'], 'current_state': game['puzzle']})
+            timings[f'{name} {attempt}'] = time.perf_counter() - start
+            if 'first response' not in timings:
+                timings['first response'] = time.time()
+    print(json.dumps(timings), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', nargs=2, metavar=('DATABASE', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1] == 'warm')
+        return
+
+    directory = tempfile.mkdtemp()
+    results = {}
+    for mode in ('cold', 'warm'):
+        runs = []
+        for run in range(args.runs):
+            database = os.path.join(directory, f'{mode}{run}.sqlite3')
+            started = time.time()
+            # In its own session so that its pool processes are stopped with it
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'benchmarks.bench_startup', '--child', database, mode],
+                stdout=subprocess.PIPE, text=True, start_new_session=True
+            )
+            try:
+                line = process.stdout.readline()
+            finally:
+                os.killpg(process.pid, signal.SIGTERM)
+                process.wait()
+            if not line:
+                raise SystemExit(f"Run {run} ({mode}) failed")
+            timings = json.loads(line)
+            timings['first response'] -= started
+            runs.append(timings)
+        results[mode] = {key: statistics.median(run[key] for run in runs) * 1e3 for key in runs[0]}
+
+    keys = ['import', 'create_app', 'warm_up', 'first response'] + [
+        f'{name} {attempt}' for attempt in ('first', 'second') for name in ENDPOINTS
+    ]
+    print(f"{'median (ms)':<20} {'cold':>10} {'warm':>10}")
+    for key in keys:
+        cells = [f"{results[mode][key]:.1f}" if key in results[mode] else '-' for mode in ('cold', 'warm')]
+        print(f"{key:<20} {cells[0]:>10} {cells[1]:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Puzzle throughput: transformed seed puzzles vs. fresh uniqueness-verified generation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transform [--seconds 2] [--processes 4]
+
+Each source runs for ``--seconds`` per difficulty in one process, then the
+transform path is repeated across ``--processes`` worker processes to show
+how it scales. Throughput is reported per core.
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.generator import DIFFICULTY_PROFILES, generate_unique_puzzle, load_seed_bank, transformed_puzzle
+
+
+def run_for(func, difficulty, seconds):
+    """Call func(difficulty) repeatedly for ``seconds``; return (count, elapsed)"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        func(difficulty)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count, elapsed
+
+
+def transform_worker(args):
+    difficulty, seconds = args
+    return run_for(transformed_puzzle, difficulty, seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    seeds = load_seed_bank()
+    print("seed bank: " + ', '.join(f"{d}={len(seeds.get(d, []))}" for d in DIFFICULTY_PROFILES))
+    print(f"{'difficulty':<11} {'generate/s':>11} {'transform/s':>12} {'speed-up':>9}")
+    for difficulty in DIFFICULTY_PROFILES:
+        generated, generate_time = run_for(generate_unique_puzzle, difficulty, args.seconds)
+        transformed, transform_time = run_for(transformed_puzzle, difficulty, args.seconds)
+        generate_rate = generated / generate_time
+        transform_rate = transformed / transform_time
+        print(f"{difficulty:<11} {generate_rate:>11.1f} {transform_rate:>12.0f} {transform_rate / generate_rate:>8.0f}x")
+
+    with ProcessPoolExecutor(args.processes) as executor:
+        results = list(executor.map(transform_worker, [('medium', args.seconds)] * args.processes))
+    total = sum(count / elapsed for count, elapsed in results)
+    print(f"\ntransform, {args.processes} processes: {total:.0f}/s total, {total / args.processes:.0f}/s per core")
+
+
+if __name__ == '__main__':
+    main()
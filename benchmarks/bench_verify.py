@@ -0,0 +1,111 @@
+"""Submission verification latency: single boards and bulk batches.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_verify [--games 200] [--requests 500] [--bulk 1000,10000]
+
+Uses DATABASE_URL when set, otherwise a temporary SQLite file. "check"
+times the unit-mask check alone (is_solved per board, verify_batch per
+batch when numpy is installed); "endpoint" times /game/<id>/submit and
+/submissions/bulk through the Flask test client, including the game
+lookup and the INSERT. A tenth of the boards have two digits swapped so
+both outcomes are exercised.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}"
+os.environ.setdefault('DAILY_SCHEDULER_ENABLED', 'false')
+os.environ.setdefault('PUZZLE_POOL_WORKERS', '0')
+os.environ.setdefault('COMPUTE_POOL_WORKERS', '0')
+
+from app import create_app, db
+from utils.games import create_game
+from utils.generator import transformed_puzzle
+from utils.solver import is_solved
+from utils.submissions import verify_batch
+
+app = create_app()
+
+
+def spoil(board, rng):
+    """Swap two different digits in the board"""
+    cells = list(board)
+    i, j = rng.sample(range(81), 2)
+    while cells[i] == cells[j]:
+        j = rng.randrange(81)
+    cells[i], cells[j] = cells[j], cells[i]
+    return ''.join(cells)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--bulk', default='1000,10000')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with app.app_context():
+        db.create_all()
+        games = []
+        for _ in range(args.games):
+            result = transformed_puzzle('medium', rng)
+            game_id = create_game(result['puzzle'], result['solution'], 'medium')
+            games.append((game_id, result['puzzle'], result['solution']))
+
+    def submission():
+        game_id, puzzle, solution = rng.choice(games)
+        board = spoil(solution, rng) if rng.random() < 0.1 else solution
+        return game_id, puzzle, board
+
+    samples = [submission() for _ in range(args.requests)]
+    timings = []
+    for _, puzzle, board in samples:
+        start = time.perf_counter()
+        is_solved(board, puzzle)
+        timings.append(time.perf_counter() - start)
+    p50, p99 = percentiles(timings)
+    print(f"{'single':<22} {'p50 (us)':>10} {'p99 (us)':>10}")
+    print(f"{'check':<22} {p50:>10.1f} {p99:>10.1f}")
+
+    client = app.test_client()
+    timings = []
+    for game_id, _, board in samples:
+        start = time.perf_counter()
+        response = client.post(f'/game/{game_id}/submit', json={'board': board, 'seconds': 60})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    p50, p99 = percentiles(timings)
+    print(f"{'endpoint':<22} {p50:>10.1f} {p99:>10.1f}")
+
+    print(f"\n{'bulk':<22} {'total (ms)':>10} {'per board (us)':>15}")
+    for size in (int(value) for value in args.bulk.split(',')):
+        batch = [submission() for _ in range(size)]
+        boards = [board for _, _, board in batch]
+        puzzles = [puzzle for _, puzzle, _ in batch]
+        runs = [('loop', lambda: [is_solved(b, p) for b, p in zip(boards, puzzles)])]
+        if verify_batch is not None:
+            runs.append(('verify_batch', lambda: verify_batch(boards, puzzles)))
+        payload = {'submissions': [{'game_id': g, 'board': b, 'seconds': 60} for g, _, b in batch]}
+        runs.append(('endpoint', lambda: client.post('/submissions/bulk', json=payload)))
+        for name, func in runs:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            print(f"{f'{name} x{size}':<22} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Concurrency check for /daily-challenge across a date boundary.
+
+Run from the repository root:
+
+    python -m benchmarks.daily_concurrency [--processes 4] [--threads 50]
+
+Several worker processes share one SQLite database file (standing in for
+gunicorn workers sharing PostgreSQL) and hammer /daily-challenge from many
+threads at once for ``--window`` seconds either side of a simulated
+midnight. Pre-generation is disabled and nothing is in the database, so
+every worker races to create the first day's puzzle, then races again when
+the clock moves to the next day. The run
+fails if any request errors, if two requests for the same date get
+different puzzles, or if a date ends up with more than one row.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+DAY = date(2030, 1, 1)
+
+
+def configure(database):
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ['DAILY_SCHEDULER_ENABLED'] = 'false'
+    os.environ['PUZZLE_POOL_WORKERS'] = '0'
+    os.environ['COMPUTE_POOL_WORKERS'] = '0'
+    os.environ['HINT_CACHE_BACKEND'] = 'none'
+
+
+def worker(database, threads, window, boundary, barrier, outcomes):
+    configure(database)
+    from app import create_app
+    app = create_app()
+    import utils.daily
+
+    # Every process flips to the next day at the same wall-clock instant
+    utils.daily.current_date = lambda: DAY if time.time() < boundary.value else DAY + timedelta(days=1)
+
+    results = []
+    lock = threading.Lock()
+
+    def hammer():
+        client = app.test_client()
+        local = []
+        while time.time() < boundary.value + window:
+            response = client.get('/daily-challenge')
+            body = response.get_json(silent=True) or {}
+            local.append((response.status_code, body.get('date'), body.get('game_id'), body.get('puzzle')))
+        with lock:
+            results.extend(local)
+
+    pool = [threading.Thread(target=hammer) for _ in range(threads)]
+    barrier.wait()
+    # The first worker released fixes the switch time for everyone
+    with boundary.get_lock():
+        if not boundary.value:
+            boundary.value = time.time() + window
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    outcomes.put((results, time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--window', type=float, default=1.0,
+                        help='Seconds of traffic on each side of midnight')
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), 'daily.sqlite3')
+    configure(database)
+    from app import create_app, db
+    app = create_app()
+    from models import DailyPuzzle
+    with app.app_context():
+        db.create_all()
+
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(args.processes)
+    boundary = context.Value('d', 0.0)
+    queue = context.Queue()
+    workers = [
+        context.Process(target=worker, args=(database, args.threads, args.window, boundary, barrier, queue))
+        for _ in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+    outcomes = [queue.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    results = [row for rows, _ in outcomes for row in rows]
+    elapsed = max(seconds for _, seconds in outcomes)
+    errors = [row for row in results if row[0] != 200]
+    served = {}
+    for status, day, game_id, puzzle in results:
+        if status == 200:
+            served.setdefault(day, set()).add((game_id, puzzle))
+
+    with app.app_context():
+        rows = {}
+        for daily_puzzle in DailyPuzzle.query.all():
+            rows[daily_puzzle.puzzle_date.isoformat()] = rows.get(daily_puzzle.puzzle_date.isoformat(), 0) + 1
+
+    print(f"{len(results)} requests from {args.processes} processes x {args.threads} threads "
+          f"in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s)")
+    for day in sorted(served):
+        print(f"  {day}: {sum(1 for r in results if r[1] == day)} responses, "
+              f"{len(served[day])} distinct puzzle(s), {rows.get(day, 0)} row(s)")
+    print(f"  errors: {len(errors)}")
+
+    ok = not errors and all(len(v) == 1 for v in served.values()) and all(n == 1 for n in rows.values())
+    print("PASS" if ok else "FAIL")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Local load test: /new-game, /hint and /daily-challenge over HTTP.
+
+Run from the repository root:
+
+    python -m benchmarks.loadtest [--concurrency 8] [--duration 20] [--mix new-game=1,hint=4,daily=5]
+                                  [--url http://127.0.0.1:5000] [--output results.json] [--baseline baseline.json]
+
+Without --url the app is started in a separate process on a free port,
+using Werkzeug's threaded server and a fresh SQLite file as a stand-in for
+PostgreSQL. The other settings come from the environment, so the puzzle
+pool, compute pool and caches are exercised as configured (daily
+pre-generation is off unless set). With --url an already running server
+is driven instead, e.g. gunicorn or uvicorn, to measure a real deployment.
+
+``--concurrency`` client threads send requests back to back for
+``--duration`` seconds. Each request picks an endpoint by the --mix
+weights: a new game of a random difficulty, a hint for a random board
+position of one of the games created before the run, or today's daily
+challenge. Throughput and p50/p95/p99 latency are reported per endpoint
+and in total. Responses with status 500 or above, and failed
+connections, are counted as errors. Results can be saved and compared
+with a baseline as in benchmarks.suite.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.results import add_arguments, finish, summarize
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+def serve(database):
+    """Server process: run the app on a free local port and print the port"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ.setdefault('DAILY_SCHEDULER_ENABLED', 'false')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    from werkzeug.serving import make_server
+
+    from app import create_app, db, start_warm_up
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    # Warmed up like a deployed worker, now that the tables exist
+    create_app(warm_up=True)
+    start_warm_up(wait=True)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+
+def request(base_url, path, body=None):
+    """Send one request; returns (status, parsed JSON body or None)"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            return response.status, json.loads(response.read() or 'null')
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def create_games(base_url, count):
+    games = []
+    for n in range(count):
+        status, body = request(base_url, f'/new-game/{DIFFICULTIES[n % len(DIFFICULTIES)]}')
+        if status != 200:
+            raise SystemExit(f"Could not create games: /new-game returned {status}")
+        games.append((body['game_id'], body['puzzle'], body['solution']))
+    return games
+
+
+def hint_body(games, rng):
+    """A hint request for a game with a random share of its empty cells filled in"""
+    game_id, puzzle, solution = rng.choice(games)
+    empty = [i for i, c in enumerate(puzzle) if c == '0']
+    cells = list(puzzle)
+    for index in rng.sample(empty, rng.randrange(len(empty) - 1)):
+        cells[index] = solution[index]
+    return {'game_id': game_id, 'current_state': ''.join(cells)}
+
+
+def parse_mix(text):
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('new-game', 'hint', 'daily'):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in --mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Drive this server instead of starting one')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--mix', type=parse_mix, default='new-game=1,hint=4,daily=5')
+    parser.add_argument('--games', type=int, default=30, help='Games created up front for /hint')
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--serve', metavar='DATABASE', help=argparse.SUPPRESS)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        # In its own session so that the server and its worker pools are stopped together
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.loadtest', '--serve', os.path.join(tempfile.mkdtemp(), 'load.sqlite3')],
+            stdout=subprocess.PIPE, text=True, start_new_session=True
+        )
+        base_url = f'http://127.0.0.1:{server.stdout.readline().strip()}'
+    base_url = base_url.rstrip('/')
+
+    try:
+        games = create_games(base_url, args.games)
+        request(base_url, '/daily-challenge')
+
+        names, weights = zip(*args.mix.items())
+        samples = {name: [] for name in names}
+        errors = {name: 0 for name in names}
+        lock = threading.Lock()
+        stop = time.monotonic() + args.duration
+
+        def client(seed):
+            rng = random.Random(seed)
+            local = {name: [] for name in names}
+            failed = {name: 0 for name in names}
+            while time.monotonic() < stop:
+                name = rng.choices(names, weights)[0]
+                if name == 'new-game':
+                    path, body = f'/new-game/{rng.choice(DIFFICULTIES)}', None
+                elif name == 'hint':
+                    path, body = '/hint', hint_body(games, rng)
+                else:
+                    path, body = '/daily-challenge', None
+                start = time.perf_counter()
+                try:
+                    status, _ = request(base_url, path, body)
+                except OSError:
+                    status = None
+                local[name].append(time.perf_counter() - start)
+                if status is None or status >= 500:
+                    failed[name] += 1
+            with lock:
+                for name in names:
+                    samples[name].extend(local[name])
+                    errors[name] += failed[name]
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(args.seed + n,)) for n in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+    results = {}
+    for name in names:
+        if samples[name]:
+            results[name] = dict(summarize(samples[name], elapsed), errors=errors[name])
+    results['total'] = dict(
+        summarize([sample for name in names for sample in samples[name]], elapsed),
+        errors=sum(errors.values())
+    )
+    print(f"{results['total']['count']} requests from {args.concurrency} clients in {elapsed:.1f}s, "
+          f"{results['total']['errors']} errors\n")
+    args.mix = ','.join(f'{name}={weight:g}' for name, weight in args.mix.items())
+    finish('loadtest', args, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Saving benchmark results as JSON and comparing them with a baseline.
+
+Used by benchmarks.suite and benchmarks.loadtest. A results file holds
+the run's arguments and environment plus one entry per case with its
+latency percentiles in milliseconds (and ``throughput`` in operations per
+second where it applies). A case regressed when its p50 or p95 is more
+than ``threshold`` (a fraction) above the baseline, or its throughput more
+than ``threshold`` below it. Latency changes under MIN_CHANGE_MS are
+ignored so that microsecond cases do not flap. Cases missing from either
+file are listed but never fail the comparison. Only compare runs made on
+the same machine.
+"""
+import json
+import platform
+import statistics
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+MIN_CHANGE_MS = 0.005
+
+
+def summarize(samples: Sequence[float], elapsed: Optional[float] = None) -> Dict:
+    """Count, mean and p50/p95/p99 (ms) of durations in seconds; throughput if ``elapsed`` is given"""
+    ordered = sorted(samples)
+
+    def percentile(q):
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))] * 1e3
+
+    summary = {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered) * 1e3,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99)
+    }
+    if elapsed:
+        summary['throughput'] = len(ordered) / elapsed
+    return summary
+
+
+def save(path: str, kind: str, args: Dict, results: Dict[str, Dict]):
+    document = {
+        'kind': kind,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'args': args,
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"{'case':<32} {'count':>7} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'ops/s':>9}")
+    for name, summary in results.items():
+        throughput = f"{summary['throughput']:.1f}" if 'throughput' in summary else '-'
+        print(f"{name:<32} {summary['count']:>7} {summary['p50']:>10.4f} {summary['p95']:>10.4f} "
+              f"{summary['p99']:>10.4f} {throughput:>9}")
+
+
+def compare(results: Dict[str, Dict], baseline_path: str, threshold: float) -> List[str]:
+    """Print each case against the baseline file and return the regressed case names"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    print(f"\nAgainst {baseline_path} (threshold {threshold:.0%}):")
+    print(f"{'case':<32} {'base p50':>10} {'p50':>10} {'change':>8} {'base p95':>10} {'p95':>10} {'change':>8}")
+    for name in sorted(set(results) | set(baseline)):
+        if name not in baseline or name not in results:
+            print(f"{name:<32} {'only in ' + ('results' if name in results else 'baseline'):>30}")
+            continue
+        current, base = results[name], baseline[name]
+        changes = {key: current[key] / base[key] - 1 for key in ('p50', 'p95') if base[key]}
+        regressed = any(
+            change > threshold and current[key] - base[key] > MIN_CHANGE_MS for key, change in changes.items()
+        )
+        line = (f"{name:<32} {base['p50']:>10.4f} {current['p50']:>10.4f} {changes.get('p50', 0):>+8.0%} "
+                f"{base['p95']:>10.4f} {current['p95']:>10.4f} {changes.get('p95', 0):>+8.0%}")
+        if base.get('throughput') and 'throughput' in current:
+            change = current['throughput'] / base['throughput'] - 1
+            regressed = regressed or change < -threshold
+            line += f"  ops/s {change:+.0%}"
+        if regressed:
+            regressions.append(name)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def finish(kind: str, args, results: Dict[str, Dict]):
+    """Print, save and compare according to the common --output/--baseline/--threshold options"""
+    print_table(results)
+    options = vars(args)
+    if args.output:
+        save(args.output, kind, options, results)
+        print(f"\nSaved to {args.output}")
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+def add_arguments(parser):
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare with a results file saved earlier; exits 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown as a fraction of the baseline (default 0.2)')
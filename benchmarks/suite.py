@@ -0,0 +1,143 @@
+"""Benchmark suite: puzzle generation, hint analysis and the daily challenge DB paths.
+
+Run from the repository root:
+
+    python -m benchmarks.suite [--output results.json] [--baseline baseline.json]
+
+Cases:
+
+- ``generate_puzzle/<difficulty>``: generate_puzzle with the global RNG
+  seeded per difficulty, so each run attempts the same puzzles (the
+  generator's time budget still applies).
+- ``hint/<board>``: analyze_hint_candidates on the fixed corpus below,
+  each at its starting position and with half of the empty cells filled.
+  The corpus includes a minimal 17-clue puzzle and Arto Inkala's "hardest"
+  puzzle, which needs search.
+- ``daily/create``, ``daily/load``, ``daily/cached``: get_daily_puzzle for
+  days that are not in the database yet (generate and insert), in the
+  database but not in the process cache (one SELECT), and in the cache.
+  ``daily/endpoint`` is GET /daily-challenge through the test client.
+
+Uses DATABASE_URL when set, otherwise a temporary SQLite file. Results can
+be saved with --output and compared with an earlier file with --baseline
+(see benchmarks/results.py); hint cases are the steadiest to compare.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}"
+os.environ.setdefault('DAILY_SCHEDULER_ENABLED', 'false')
+os.environ.setdefault('PUZZLE_POOL_WORKERS', '0')
+os.environ.setdefault('COMPUTE_POOL_WORKERS', '0')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from app import create_app, db
+from benchmarks.results import add_arguments, finish, summarize
+from utils import daily
+from utils.generator import DIFFICULTY_PROFILES, analyze_hint_candidates, generate_puzzle
+from utils.solver import solve
+
+app = create_app()
+
+HINT_CORPUS = {
+    'generated_easy': '047000090000067831008000047700004009500036402304520076860901520050003008000250000',
+    'generated_medium': '007000090000060801000000047700000009500036402004020076860901020050003008000250000',
+    'generated_hard': '007000090000060801000000040700000009500036002004020076860001020050003000000250000',
+    'minimal_17_clue': '000000010400000000020000000000050407008000300001090000300400200050100000000806000',
+    'inkala_hardest': '800000000003600000070090200050007000000045700000100030001000068008500010090000400',
+}
+
+# Far enough ahead not to meet real daily puzzles in a shared database
+FIRST_DAY = date(2099, 1, 1)
+
+
+def half_filled(puzzle, solution):
+    """The puzzle with every other empty cell filled in from the solution"""
+    cells = list(puzzle)
+    for n, index in enumerate(i for i, c in enumerate(puzzle) if c == '0'):
+        if n % 2:
+            cells[index] = solution[index]
+    return ''.join(cells)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_generation(count, seed):
+    results = {}
+    for difficulty in DIFFICULTY_PROFILES:
+        random.seed(seed)
+        results[f'generate_puzzle/{difficulty}'] = summarize(
+            [timed(generate_puzzle, difficulty) for _ in range(count)]
+        )
+    return results
+
+
+def bench_hints(repeat):
+    results = {}
+    for name, puzzle in HINT_CORPUS.items():
+        solution = solve(puzzle)
+        for label, state in (('start', puzzle), ('half', half_filled(puzzle, solution))):
+            assert analyze_hint_candidates(state, solution) is not None
+            results[f'hint/{name}/{label}'] = summarize(
+                [timed(analyze_hint_candidates, state, solution) for _ in range(repeat)]
+            )
+    return results
+
+
+def bench_daily(days, repeat):
+    client = app.test_client()
+    created, loaded, cached = [], [], []
+    with app.app_context():
+        db.create_all()
+        for offset in range(days):
+            day = FIRST_DAY + timedelta(days=offset)
+            daily._cache.clear()
+            created.append(timed(daily.get_daily_puzzle, day))
+        for _ in range(max(repeat // days, 1)):
+            for offset in range(days):
+                daily._cache.clear()
+                loaded.append(timed(daily.get_daily_puzzle, FIRST_DAY + timedelta(days=offset)))
+        cached = [timed(daily.get_daily_puzzle, FIRST_DAY) for _ in range(repeat)]
+
+    daily.current_date = lambda: FIRST_DAY
+    client.get('/daily-challenge')
+    endpoint = [timed(client.get, '/daily-challenge') for _ in range(repeat)]
+    return {
+        'daily/create': summarize(created),
+        'daily/load': summarize(loaded),
+        'daily/cached': summarize(cached),
+        'daily/endpoint': summarize(endpoint)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--generate', type=int, default=10, help='Puzzles generated per difficulty')
+    parser.add_argument('--repeat', type=int, default=200, help='Runs per hint and daily case')
+    parser.add_argument('--days', type=int, default=5, help='Daily puzzles created')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--only', choices=['generate', 'hint', 'daily'], help='Run one group of cases')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    results = {}
+    if args.only in (None, 'generate'):
+        results.update(bench_generation(args.generate, args.seed))
+    if args.only in (None, 'hint'):
+        results.update(bench_hints(args.repeat))
+    if args.only in (None, 'daily'):
+        results.update(bench_daily(args.days, args.repeat))
+    finish('suite', args, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import click
+from sqlalchemy import delete, select
+
+from app import app, db
+from models import PuzzleBank
+from utils.generator import (
+    DIFFICULTY_PROFILES, RATING_DIFFICULTY, SEED_BANK_PATH, canonicalize, generate_chunk,
+    generate_unique_puzzle, vet_seed
+)
+from utils.codec import pack_game
+from utils.daily import pregenerate
+from utils.puzzle_bank import insert_puzzles
+
+
+@app.cli.group('puzzle-bank')
+def puzzle_bank():
+    """Manage the pre-generated puzzle bank."""
+
+
+@puzzle_bank.command('fill')
+@click.option('--count', default=1000, show_default=True,
+              help='Puzzles to generate per difficulty.')
+@click.option('--difficulty', 'difficulties', multiple=True,
+              type=click.Choice(list(DIFFICULTY_PROFILES)),
+              help='Difficulty to generate (repeatable, default: all).')
+@click.option('--batch-size', default=500, show_default=True,
+              help='Puzzles per multi-row INSERT.')
+def fill_puzzle_bank(count, difficulties, batch_size):
+    """Generate puzzles and store them in the puzzle bank."""
+    for difficulty in difficulties or DIFFICULTY_PROFILES:
+        start = time.perf_counter()
+        generated = inserted = 0
+        batch = []
+        while generated < count:
+            result = generate_unique_puzzle(difficulty)
+            generated += 1
+            # Stored under its rated difficulty, which differs from the
+            # requested one if the time budget ran out
+            batch.append(result)
+            if len(batch) >= batch_size or generated == count:
+                inserted += insert_puzzles(batch)
+                batch = []
+                click.echo(f"{difficulty}: {generated}/{count} generated, {inserted} new")
+        elapsed = time.perf_counter() - start
+        click.echo(f"{difficulty}: done in {elapsed:.1f}s ({generated / elapsed:.1f} puzzles/s)")
+
+
+@puzzle_bank.command('export-seeds')
+@click.option('--count', default=30, show_default=True,
+              help='Seed puzzles per difficulty.')
+@click.option('--output', default=SEED_BANK_PATH, show_default=True,
+              help='Seed bank file to write.')
+def export_seeds(count, output):
+    """Generate and vet the seed puzzles used for transformed variants."""
+    seeds = {}
+    for difficulty in DIFFICULTY_PROFILES:
+        pairs = set()
+        attempts = 0
+        while len(pairs) < count:
+            attempts += 1
+            result = generate_unique_puzzle(difficulty)
+            if vet_seed(result['puzzle'], result['solution'], difficulty):
+                pairs.add(canonicalize(result['puzzle'], result['solution']))
+        seeds[difficulty] = sorted(pairs)
+        click.echo(f"{difficulty}: {count} seeds from {attempts} generated")
+    with open(output, 'w') as f:
+        json.dump(seeds, f, indent=1)
+    click.echo(f"Wrote {output}")
+
+
+@puzzle_bank.command('validate')
+@click.option('--chunk-size', default=20000, show_default=True,
+              help='Puzzles checked per vectorised batch.')
+@click.option('--delete-invalid', is_flag=True,
+              help='Delete puzzles that are not uniquely solvable or have the wrong solution.')
+def validate_puzzle_bank(chunk_size, delete_invalid):
+    """Check every banked puzzle is unique and correctly rated (requires numpy)."""
+    try:
+        from utils.batch import validate_batch
+    except ImportError:
+        raise click.ClickException("numpy is required: pip install numpy")
+
+    start = time.perf_counter()
+    checked = 0
+    invalid = []
+    misrated = {}
+    query = select(PuzzleBank.id, PuzzleBank.board, PuzzleBank.difficulty).execution_options(yield_per=chunk_size)
+    for rows in db.session.execute(query).partitions():
+        valid, ratings = validate_batch([row.board[0] for row in rows], [row.board[1] for row in rows])
+        for row, ok, rating in zip(rows, valid, ratings):
+            if not ok:
+                invalid.append(row.id)
+            elif RATING_DIFFICULTY[rating] != row.difficulty:
+                key = (row.difficulty, RATING_DIFFICULTY[rating])
+                misrated[key] = misrated.get(key, 0) + 1
+        checked += len(rows)
+        elapsed = time.perf_counter() - start
+        click.echo(f"{checked} checked, {len(invalid)} invalid ({checked / elapsed:.0f} puzzles/s)")
+
+    for (stored, rated), count in sorted(misrated.items()):
+        click.echo(f"{count} stored as {stored} rate as {rated}")
+    if delete_invalid and invalid:
+        db.session.execute(delete(PuzzleBank).where(PuzzleBank.id.in_(invalid)))
+        db.session.commit()
+        click.echo(f"Deleted {len(invalid)} invalid puzzles")
+
+
+def _generate_task(task, canonical=False):
+    return generate_chunk(*task, canonical=canonical)
+
+
+@app.cli.command('generate-puzzles')
+@click.option('--count', default=1000, show_default=True,
+              help='Puzzles to generate per difficulty.')
+@click.option('--difficulty', 'difficulties', multiple=True,
+              type=click.Choice(list(DIFFICULTY_PROFILES)),
+              help='Difficulty to generate (repeatable, default: all).')
+@click.option('--workers', default=os.cpu_count(), show_default=True,
+              help='Generator processes.')
+@click.option('--seed', default=None,
+              help='Base seed; the same seed gives the same puzzles for any --workers.')
+@click.option('--chunk-size', default=50, show_default=True,
+              help='Puzzles per task handed to a worker.')
+@click.option('--output', type=click.Path(dir_okay=False),
+              help='File to stream puzzles to.')
+@click.option('--format', 'output_format', type=click.Choice(['jsonl', 'binary']), default='jsonl',
+              show_default=True,
+              help='jsonl: one JSON object per line; binary: 53-byte records '
+                   '(52-byte packed game from utils.codec, then the rating index).')
+@click.option('--to-db', is_flag=True,
+              help='Also insert the puzzles into the puzzle bank.')
+@click.option('--batch-size', default=500, show_default=True,
+              help='Puzzles per multi-row INSERT with --to-db.')
+def generate_puzzles(count, difficulties, workers, seed, chunk_size, output, output_format, to_db, batch_size):
+    """Generate puzzles on a process pool, to a file and/or the puzzle bank."""
+    if not output and not to_db:
+        raise click.UsageError('Give --output, --to-db or both.')
+    if seed is None:
+        seed = str(random.getrandbits(64))
+    click.echo(f"Seed: {seed}")
+
+    # Each task is seeded from its own position, so results do not depend
+    # on how tasks are spread over workers; map() keeps them in order.
+    levels = list(DIFFICULTY_PROFILES)
+    tasks = []
+    for difficulty in difficulties or DIFFICULTY_PROFILES:
+        for index, offset in enumerate(range(0, count, chunk_size)):
+            tasks.append((difficulty, f"{seed}:{difficulty}:{index}", min(chunk_size, count - offset)))
+    total = sum(task[2] for task in tasks)
+
+    out = open(output, 'wb' if output_format == 'binary' else 'w') if output else None
+    workers_seen = {}
+    generated = inserted = 0
+    batch = []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # With --to-db the workers also canonicalise, keeping that off the parent
+            for chunk in executor.map(partial(_generate_task, canonical=to_db), tasks):
+                puzzles = chunk['puzzles']
+                done, busy = workers_seen.get(chunk['pid'], (0, 0.0))
+                workers_seen[chunk['pid']] = (done + len(puzzles), busy + chunk['elapsed'])
+                if out is not None:
+                    for result in puzzles:
+                        if output_format == 'binary':
+                            rating = bytes([levels.index(result['rating'])])
+                            out.write(pack_game(result['puzzle'], result['solution']) + rating)
+                        else:
+                            record = {key: result[key] for key in ('puzzle', 'solution', 'difficulty', 'rating', 'clues')}
+                            out.write(json.dumps(record) + '\n')
+                if to_db:
+                    batch.extend(puzzles)
+                    if len(batch) >= batch_size:
+                        inserted += insert_puzzles(batch)
+                        batch = []
+                generated += len(puzzles)
+                elapsed = time.perf_counter() - start
+                click.echo(f"{generated}/{total} generated ({generated / elapsed:.1f} puzzles/s)")
+        if batch:
+            inserted += insert_puzzles(batch)
+    finally:
+        if out is not None:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    click.echo(f"Done: {generated} puzzles in {elapsed:.1f}s ({generated / elapsed:.1f} puzzles/s)")
+    if to_db:
+        click.echo(f"{inserted} new puzzles in the bank")
+    for pid, (done, busy) in sorted(workers_seen.items()):
+        click.echo(f"  worker {pid}: {done} puzzles, {done / busy:.1f} puzzles/s")
+
+
+@app.cli.group('daily-puzzles')
+def daily_puzzles():
+    """Manage daily challenge puzzles."""
+
+
+@daily_puzzles.command('pregenerate')
+@click.option('--days', default=7, show_default=True,
+              help='Number of days, starting today, to make sure exist.')
+def pregenerate_daily_puzzles(days):
+    """Create any missing daily puzzles for the coming days."""
+    for day in pregenerate(days):
+        click.echo(f"Daily puzzle ready for {day}")
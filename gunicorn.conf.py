@@ -0,0 +1,12 @@
+"""gunicorn settings, read from the working directory by ``gunicorn main:app``."""
+
+
+def post_worker_init(worker):
+    """Warm up each worker after the fork, before it accepts connections.
+
+    Works with ``--preload`` too: the master only imports the app, so the
+    pools and database connections are created in the workers.
+    """
+    from app import start_warm_up
+
+    start_warm_up(wait=True)
@@ -1,4 +1,8 @@
-from app import app
+from app import create_app
+
+# Each worker runs the WARM_UP steps (app.py) after it starts: from the
+# post-fork hook in gunicorn.conf.py, or else on its first request
+app = create_app(warm_up=True)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,37 @@
+"""Add PuzzleBank model
+
+Revision ID: 3f6c2b8e1a47
+Revises: 961a192d0911
+Create Date: 2026-10-18 10:12:41.208533
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c2b8e1a47'
+down_revision = '961a192d0911'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('puzzle_bank',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('canonical', sa.String(length=81), nullable=False),
+    sa.Column('solution', sa.String(length=81), nullable=False),
+    sa.Column('difficulty', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('canonical')
+    )
+    with op.batch_alter_table('puzzle_bank', schema=None) as batch_op:
+        batch_op.create_index('ix_puzzle_bank_difficulty_id', ['difficulty', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('puzzle_bank', schema=None) as batch_op:
+        batch_op.drop_index('ix_puzzle_bank_difficulty_id')
+
+    op.drop_table('puzzle_bank')
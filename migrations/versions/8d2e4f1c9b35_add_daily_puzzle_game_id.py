@@ -0,0 +1,28 @@
+"""Link DailyPuzzle to a Game session
+
+Revision ID: 8d2e4f1c9b35
+Revises: 3f6c2b8e1a47
+Create Date: 2026-10-18 11:05:17.442871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4f1c9b35'
+down_revision = '3f6c2b8e1a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('daily_puzzle', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('game_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_daily_puzzle_game_id', 'game', ['game_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('daily_puzzle', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_daily_puzzle_game_id', type_='foreignkey')
+        batch_op.drop_column('game_id')
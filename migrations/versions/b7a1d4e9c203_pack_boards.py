@@ -0,0 +1,80 @@
+"""Store puzzle and solution as one packed board column
+
+Revision ID: b7a1d4e9c203
+Revises: 8d2e4f1c9b35
+Create Date: 2026-10-18 12:20:03.518904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.codec import GAME_BYTES, pack_game, unpack_game
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7a1d4e9c203'
+down_revision = '8d2e4f1c9b35'
+branch_labels = None
+depends_on = None
+
+# (table, column holding the puzzle string)
+TABLES = [('game', 'puzzle'), ('daily_puzzle', 'puzzle'), ('puzzle_bank', 'canonical')]
+
+BATCH_SIZE = 5000
+
+
+def _convert(table, source_columns, target_columns, convert):
+    """Rewrite every row of ``table`` in id-ordered batches"""
+    conn = op.get_bind()
+    columns = [sa.column('id')] + [sa.column(name) for name in source_columns + target_columns]
+    rows = sa.table(table, *columns)
+    update = rows.update().where(rows.c.id == sa.bindparam('row_id')).values(
+        {name: sa.bindparam(f'new_{name}') for name in target_columns}
+    )
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            sa.select(rows.c.id, *[rows.c[name] for name in source_columns])
+            .where(rows.c.id > last_id).order_by(rows.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            return
+        conn.execute(update, [
+            dict(zip([f'new_{name}' for name in target_columns], convert(*row[1:])), row_id=row[0])
+            for row in batch
+        ])
+        last_id = batch[-1][0]
+
+
+def upgrade():
+    for table, puzzle_column in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('board', sa.LargeBinary(length=GAME_BYTES), nullable=True))
+
+        _convert(table, [puzzle_column, 'solution'], ['board'],
+                 lambda puzzle, solution: (pack_game(puzzle, solution),))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('board', existing_type=sa.LargeBinary(length=GAME_BYTES), nullable=False)
+            batch_op.drop_column(puzzle_column)
+            batch_op.drop_column('solution')
+            if table == 'puzzle_bank':
+                batch_op.create_unique_constraint('uq_puzzle_bank_board', ['board'])
+
+
+def downgrade():
+    for table, puzzle_column in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column(puzzle_column, sa.String(length=81), nullable=True))
+            batch_op.add_column(sa.Column('solution', sa.String(length=81), nullable=True))
+
+        _convert(table, ['board'], [puzzle_column, 'solution'],
+                 lambda board: unpack_game(bytes(board)))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(puzzle_column, existing_type=sa.String(length=81), nullable=False)
+            batch_op.alter_column('solution', existing_type=sa.String(length=81), nullable=False)
+            if table == 'puzzle_bank':
+                batch_op.drop_constraint('uq_puzzle_bank_board', type_='unique')
+                batch_op.create_unique_constraint('uq_puzzle_bank_canonical', [puzzle_column])
+            batch_op.drop_column('board')
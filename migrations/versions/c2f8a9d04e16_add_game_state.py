@@ -0,0 +1,28 @@
+"""Track the current board of a game
+
+Revision ID: c2f8a9d04e16
+Revises: b7a1d4e9c203
+Create Date: 2026-10-18 14:02:37.915442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f8a9d04e16'
+down_revision = 'b7a1d4e9c203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('state', sa.LargeBinary(length=41), nullable=True))
+        batch_op.add_column(sa.Column('move_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('game', schema=None) as batch_op:
+        batch_op.drop_column('move_count')
+        batch_op.drop_column('state')
@@ -0,0 +1,39 @@
+"""Add Submission model
+
+Revision ID: d5e3b71a8f02
+Revises: c2f8a9d04e16
+Create Date: 2026-10-18 15:21:08.664190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e3b71a8f02'
+down_revision = 'c2f8a9d04e16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('submission',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('board', sa.LargeBinary(length=41), nullable=False),
+    sa.Column('valid', sa.Boolean(), nullable=False),
+    sa.Column('player', sa.String(length=64), nullable=True),
+    sa.Column('seconds', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['game_id'], ['game.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index('ix_submission_game_id', ['game_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_game_id')
+
+    op.drop_table('submission')
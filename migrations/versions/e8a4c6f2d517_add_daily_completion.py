@@ -0,0 +1,37 @@
+"""Add DailyCompletion model
+
+Revision ID: e8a4c6f2d517
+Revises: d5e3b71a8f02
+Create Date: 2026-10-18 16:40:52.310874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a4c6f2d517'
+down_revision = 'd5e3b71a8f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_completion',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('puzzle_date', sa.Date(), nullable=False),
+    sa.Column('player', sa.String(length=64), nullable=False),
+    sa.Column('seconds', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('puzzle_date', 'player')
+    )
+    with op.batch_alter_table('daily_completion', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_completion_date_seconds', ['puzzle_date', 'seconds'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('daily_completion', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_completion_date_seconds')
+
+    op.drop_table('daily_completion')
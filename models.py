@@ -1,17 +1,135 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.types import LargeBinary, TypeDecorator
+from utils.codec import BOARD_BYTES, GAME_BYTES, pack_board, pack_game, unpack_board, unpack_game
 
-class Game(db.Model):
+
+def insert_ignoring_conflicts(model, rows, index_elements):
+    """Build a multi-row INSERT that silently skips rows violating a unique constraint"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"INSERT ... ON CONFLICT is not supported on {dialect}")
+    return insert(model).values(rows).on_conflict_do_nothing(index_elements=index_elements)
+
+
+class PackedGame(TypeDecorator):
+    """A (puzzle, solution) pair stored as 52 packed bytes (see utils.codec)"""
+    impl = LargeBinary(GAME_BYTES)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        puzzle, solution = value
+        if puzzle is None or solution is None:
+            raise ValueError("Both puzzle and solution must be set")
+        return pack_game(puzzle, solution)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return unpack_game(bytes(value))
+
+
+class PackedBoard(TypeDecorator):
+    """A single 81-digit board stored as 41 packed bytes"""
+    impl = LargeBinary(BOARD_BYTES)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else pack_board(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else unpack_board(bytes(value))
+
+
+class PackedBoardMixin:
+    """``puzzle`` and ``solution`` strings backed by a PackedGame ``board`` column"""
+
+    @property
+    def puzzle(self):
+        return self.board[0] if self.board else None
+
+    @puzzle.setter
+    def puzzle(self, value):
+        self.board = (value, self.board[1] if self.board else None)
+
+    @property
+    def solution(self):
+        return self.board[1] if self.board else None
+
+    @solution.setter
+    def solution(self, value):
+        self.board = (self.board[0] if self.board else None, value)
+
+
+class Game(PackedBoardMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    puzzle = db.Column(db.String(81), nullable=False)
-    solution = db.Column(db.String(81), nullable=False)
+    board = db.Column(PackedGame, nullable=False)
+    # Board after the moves sent to /game/<id>/moves (None before the first)
+    state = db.Column(PackedBoard, nullable=True)
+    move_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     difficulty = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-class DailyPuzzle(db.Model):
+class DailyPuzzle(PackedBoardMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     puzzle_date = db.Column(db.Date, nullable=False, unique=True)
-    puzzle = db.Column(db.String(81), nullable=False)
-    solution = db.Column(db.String(81), nullable=False)
+    board = db.Column(PackedGame, nullable=False)
+    difficulty = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Game session shared by everyone playing this day's puzzle
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=True)
+
+class PuzzleBank(PackedBoardMixin, db.Model):
+    """Pre-generated puzzles served by /new-game.
+
+    Puzzles are stored in canonical form (see utils.generator.canonicalize)
+    so the unique ``board`` deduplicates equivalent puzzles. The composite
+    (difficulty, id) index backs random sampling by id (see
+    utils.puzzle_bank.sample_puzzle).
+    """
+    __table_args__ = (
+        db.Index('ix_puzzle_bank_difficulty_id', 'difficulty', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    board = db.Column(PackedGame, nullable=False, unique=True)
     difficulty = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Submission(db.Model):
+    """A completed board sent for a game, checked with utils.solver.is_solved"""
+    __table_args__ = (
+        db.Index('ix_submission_game_id', 'game_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
+    board = db.Column(PackedBoard, nullable=False)
+    valid = db.Column(db.Boolean, nullable=False)
+    player = db.Column(db.String(64), nullable=True)
+    # Solve time reported by the client
+    seconds = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DailyCompletion(db.Model):
+    """A player's first verified solve of a daily challenge.
+
+    The (puzzle_date, seconds) index serves the leaderboard rebuild, which
+    reads a day's completions fastest first.
+    """
+    __table_args__ = (
+        db.UniqueConstraint('puzzle_date', 'player'),
+        db.Index('ix_daily_completion_date_seconds', 'puzzle_date', 'seconds'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    puzzle_date = db.Column(db.Date, nullable=False)
+    player = db.Column(db.String(64), nullable=False)
+    seconds = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,40 +1,258 @@
 from flask import render_template, jsonify, request, flash, redirect, url_for
-from app import app
-from utils.generator import generate_puzzle, analyze_hint_candidates
+from app import app, db, mark_startup, startup, warmed_up
+from models import Game
+from utils.board import Board, BoardError
+from utils.generator import (
+    DIFFICULTY_PROFILES, analyze_hint_candidates, canonical_form, load_seed_bank, solving_path, transformed_puzzle
+)
+from utils.cache import HintCache, create_backend
+from utils.codec import encode_game
+from utils.compute import ComputeBusy, ComputePool, ComputeTimeout
+from utils.daily import DailyPuzzleScheduler, current_date, get_daily_puzzle, use_compute_pool
+from utils.db import pool_stats
+from utils.games import create_game, get_solution
+from utils.leaderboard import LeaderboardSync, issue_start_token, leaderboard
+from utils.logs import configure_logging
+from utils import metrics
+from utils.moves import MoveError, play_moves, replay_moves
+from utils.puzzle_bank import sample_puzzle
+from utils.submissions import SubmissionError, submit_board, submit_boards
+from utils.puzzle_pool import PuzzlePool
+from utils.warmup import WarmUp
 
 from datetime import datetime, timedelta
 import random
+import time
+
+metrics.configure(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'])
+configure_logging(app.logger, app.config['LOG_LEVEL'], app.config['LOG_SAMPLE_RATE'], app.config['LOG_QUEUE_SIZE'])
+
+compute_pool = ComputePool(
+    workers=app.config['COMPUTE_POOL_WORKERS'],
+    max_pending=app.config['COMPUTE_QUEUE_DEPTH'],
+    timeout=app.config['COMPUTE_TIMEOUT']
+)
+
+use_compute_pool(compute_pool)
+
+puzzle_pool = PuzzlePool(
+    low_water=app.config['PUZZLE_POOL_LOW_WATER'],
+    high_water=app.config['PUZZLE_POOL_HIGH_WATER'],
+    workers=app.config['PUZZLE_POOL_WORKERS'],
+    compute=compute_pool
+)
+
+hint_cache = None
+if app.config['HINT_CACHE_BACKEND'] != 'none':
+    hint_cache = HintCache(create_backend(
+        app.config['HINT_CACHE_BACKEND'],
+        path=app.config['HINT_CACHE_PATH'],
+        max_entries=app.config['HINT_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['HINT_CACHE_MAX_BYTES'],
+        ttl=app.config['HINT_CACHE_TTL'],
+        eviction=app.config['HINT_CACHE_EVICTION']
+    ), canonical=app.config['HINT_CACHE_CANONICAL'])
+
+daily_scheduler = DailyPuzzleScheduler(
+    days=app.config['DAILY_PREGENERATE_DAYS'],
+    interval=app.config['DAILY_SCHEDULER_INTERVAL']
+)
+
+leaderboard_sync = LeaderboardSync(interval=app.config['LEADERBOARD_SYNC_INTERVAL'])
+
+warm_up = WarmUp(app.config['WARM_UP'], app.logger, context=app.app_context, on_ready=warmed_up)
+
+@warm_up.step('database')
+def open_db_connections():
+    """Open the connections the pool keeps, so early requests do not wait for them"""
+    connections = [db.engine.connect() for _ in range(app.config['DB_POOL_MIN_SIZE'])]
+    for connection in connections:
+        connection.close()
+
+@warm_up.step('compute')
+def start_compute_pool():
+    compute_pool.start(wait=True)
+
+@warm_up.step('puzzles')
+def fill_puzzle_caches():
+    """Read the puzzle bank bounds and seed bank; pool-fill difficulties neither can serve (see new_game)"""
+    seeds = load_seed_bank() if app.config['PUZZLE_SEED_TRANSFORMS'] else {}
+    for difficulty in DIFFICULTY_PROFILES:
+        try:
+            banked = sample_puzzle(difficulty) is not None
+        except Exception:
+            db.session.rollback()
+            raise
+        if not banked and not seeds.get(difficulty):
+            puzzle_pool.refill(difficulty)
+
+@warm_up.step('tables')
+def fill_lookup_tables():
+    """Analyse one seed puzzle so that the symmetry and hint code paths have run once"""
+    seeds = load_seed_bank()
+    for difficulty in DIFFICULTY_PROFILES:
+        if seeds.get(difficulty):
+            puzzle, solution = seeds[difficulty][0]
+            if app.config['HINT_CACHE_CANONICAL']:
+                canonical_form(puzzle, solution)
+            analyze_hint_candidates(puzzle, solution)
+            return
+
+@warm_up.step('daily')
+def load_daily_puzzle():
+    try:
+        get_daily_puzzle()
+    except Exception:
+        db.session.rollback()
+        raise
+
+@app.before_request
+def start_background_jobs():
+    # Without gunicorn.conf.py's post-fork hook, the first request starts the warm-up
+    warm_up.start()
+    compute_pool.start()
+    if app.config['DAILY_SCHEDULER_ENABLED']:
+        daily_scheduler.ensure_started()
+    leaderboard_sync.ensure_started()
+
+@app.before_request
+def start_request_timer():
+    request.environ['sudoku.start'] = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    start = request.environ.get('sudoku.start')
+    if start is not None:
+        elapsed = time.perf_counter() - start
+        metrics.REQUEST_LATENCY.observe(
+            elapsed, endpoint=request.endpoint or 'unmatched', method=request.method, status=response.status_code
+        )
+        app.logger.info("%s %s %s %.1fms", request.method, request.path, response.status_code, elapsed * 1000)
+        if request.endpoint != 'ready':
+            mark_startup('first_request')
+    return response
+
+@app.errorhandler(ComputeBusy)
+def compute_busy(e):
+    response = jsonify({
+        'error': 'Server busy',
+        'details': str(e)
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@app.errorhandler(ComputeTimeout)
+def compute_timeout(e):
+    return jsonify({
+        'error': 'Request timed out',
+        'details': str(e)
+    }), 504
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def board_fields(puzzle, solution):
+    """Puzzle and solution for a JSON response; ?format=compact packs them into one base64 'board' field"""
+    if request.args.get('format') == 'compact':
+        return {'board': encode_game(puzzle, solution)}
+    return {'puzzle': puzzle, 'solution': solution}
+
 @app.route('/new-game/<difficulty>')
 def new_game(difficulty):
-    puzzle, solution = generate_puzzle(difficulty)
-    return jsonify({
-        'puzzle': puzzle,
-        'solution': solution
+    # Serve from the puzzle bank when it has been filled, then from
+    # transformed seed puzzles, and only then generate
+    try:
+        result = sample_puzzle(difficulty)
+    except Exception as e:
+        app.logger.error(f"Puzzle bank unavailable: {str(e)}")
+        db.session.rollback()
+        result = None
+    if result is None and app.config['PUZZLE_SEED_TRANSFORMS']:
+        result = transformed_puzzle(difficulty)
+    if result is None:
+        result = puzzle_pool.get(difficulty)
+
+    response = jsonify({
+        'game_id': create_game(result['puzzle'], result['solution'], result['rating']),
+        **board_fields(result['puzzle'], result['solution']),
+        'rating': result['rating']
     })
+    if 'generation_time' in result:
+        # Report generation time so slow generations show up in browser/APM tooling.
+        # Pooled puzzles were generated in the background, so this is not request latency.
+        response.headers['Server-Timing'] = f"generate;dur={result['generation_time'] * 1000:.1f}"
+    return response
+
+HINT_MESSAGES = {
+    'single_candidate': 'This cell has only one possible number based on the current state',
+    'hidden_single': 'This number can only go in this specific position within its group',
+    'basic_elimination': 'Use basic elimination rules to find the correct number',
+    'naked_pair': 'Two cells in this group can only contain the same two numbers',
+    'hidden_pair': 'These two numbers can only appear in these two cells',
+    'pointing_pair': 'These two cells force this number to be in a specific position',
+    'box_line_reduction': 'This number must be in this line within this box'
+}
+
+def parse_board_payload(current_state, solution):
+    """Parse a posted board and check it against the solution.
+
+    Returns ``(board, None)`` if valid, else ``(None, (error, details))``.
+    """
+    if not current_state or not solution:
+        return None, ('Missing required fields', 'current_state and either game_id or solution are required')
+    
+    if not isinstance(current_state, str) or not isinstance(solution, str):
+        return None, ('Invalid data types', 'Both current_state and solution must be strings')
+        
+    if len(current_state) != 81 or len(solution) != 81:
+        return None, ('Invalid board size', 'Both current_state and solution must be exactly 81 characters long')
+
+    try:
+        board = Board.parse(current_state)
+    except BoardError as e:
+        return None, ('Invalid characters', f'Current state contains invalid characters: {", ".join(e.characters)}')
+    try:
+        expected = Board.parse(solution, complete=True)
+    except BoardError as e:
+        return None, ('Invalid characters', f'Solution contains invalid characters: {", ".join(e.characters)}')
+
+    if not board.agrees_with(expected):
+        return None, ('Invalid board state', 'Current state conflicts with solution')
+    
+    return board, None
+
+def resolve_solution(data):
+    """Get the solution for a hint request.
+
+    Returns ``(solution, error)``: the solution is looked up by
+    ``game_id`` when given, otherwise taken from the request body.
+    ``error`` is a ready (response, status) tuple when the game is unknown.
+    """
+    game_id = data.get('game_id')
+    if game_id is None:
+        return data.get('solution'), None
+    if not isinstance(game_id, int) or isinstance(game_id, bool):
+        return None, (jsonify({
+            'error': 'Invalid game id',
+            'details': 'game_id must be an integer'
+        }), 400)
+    solution = get_solution(game_id)
+    if solution is None:
+        return None, (jsonify({
+            'error': 'Game not found',
+            'details': f'No game with id {game_id}'
+        }), 404)
+    return solution, None
 
 @app.route('/hint', methods=['POST'])
 def get_hint():
     try:
-        # Define hint messages at the start
-        hint_messages = {
-            'single_candidate': 'This cell has only one possible number based on the current state',
-            'hidden_single': 'This number can only go in this specific position within its group',
-            'basic_elimination': 'Use basic elimination rules to find the correct number',
-            'naked_pair': 'Two cells in this group can only contain the same two numbers',
-            'hidden_pair': 'These two numbers can only appear in these two cells',
-            'pointing_pair': 'These two cells force this number to be in a specific position',
-            'box_line_reduction': 'This number must be in this line within this box'
-        }
-
         # Get and validate request data
+        stage_start = time.perf_counter()
         data = request.get_json()
         request_id = request.headers.get('X-Request-ID', 'unknown')
-        app.logger.info(f"[{request_id}] Processing hint request")
+        app.logger.info("[%s] Processing hint request", request_id)
         
         if not data:
             app.logger.error(f"[{request_id}] Hint request received with no data")
@@ -45,67 +263,36 @@ def get_hint():
 
         # Extract and validate required fields
         current_state = data.get('current_state')
-        solution = data.get('solution')
+        solution, error_response = resolve_solution(data)
+        if error_response:
+            app.logger.error(f"[{request_id}] Could not resolve game: {data.get('game_id')!r}")
+            return error_response
         
         # Log request details (excluding solution for security)
-        app.logger.info(f"[{request_id}] Request details - Current state length: {len(current_state) if current_state else 'None'}")
+        app.logger.info("[%s] Request details - Current state length: %s", request_id,
+                        len(current_state) if current_state else 'None')
         
-        # Detailed input validation with improved logging
-        if not current_state or not solution:
-            app.logger.error(f"[{request_id}] Missing required fields: current_state={'Yes' if current_state else 'No'}, solution={'Yes' if solution else 'No'}")
-            return jsonify({
-                'error': 'Missing required fields',
-                'details': 'Both current_state and solution are required'
-            }), 400
-        
-        # Type validation
-        if not isinstance(current_state, str) or not isinstance(solution, str):
-            app.logger.error(f"[{request_id}] Invalid data types: current_state={type(current_state)}, solution={type(solution)}")
-            return jsonify({
-                'error': 'Invalid data types',
-                'details': 'Both current_state and solution must be strings'
-            }), 400
-            
-        # Length validation
-        if len(current_state) != 81 or len(solution) != 81:
-            app.logger.error(f"[{request_id}] Invalid length: current_state={len(current_state)}, solution={len(solution)}")
-            return jsonify({
-                'error': 'Invalid board size',
-                'details': 'Both current_state and solution must be exactly 81 characters long'
-            }), 400
-            
-        # Character validation with detailed error reporting
-        invalid_chars_current = set(c for c in current_state if c not in '0123456789')
-        if invalid_chars_current:
-            app.logger.error(f"[{request_id}] Invalid characters in current_state: {invalid_chars_current}")
-            return jsonify({
-                'error': 'Invalid characters',
-                'details': f'Current state contains invalid characters: {", ".join(invalid_chars_current)}'
-            }), 400
-            
-        invalid_chars_solution = set(c for c in solution if c not in '123456789')
-        if invalid_chars_solution:
-            app.logger.error(f"[{request_id}] Invalid characters in solution: {invalid_chars_solution}")
+        board, validation_error = parse_board_payload(current_state, solution)
+        if validation_error:
+            error, details = validation_error
+            app.logger.error(f"[{request_id}] {error}: {details}")
             return jsonify({
-                'error': 'Invalid characters',
-                'details': f'Solution contains invalid characters: {", ".join(invalid_chars_solution)}'
+                'error': error,
+                'details': details
             }), 400
             
-        # Validate solution consistency
-        zero_positions = [i for i, c in enumerate(current_state) if c != '0']
-        for pos in zero_positions:
-            if current_state[pos] != solution[pos]:
-                app.logger.error(f"[{request_id}] Solution inconsistency at position {pos}")
-                return jsonify({
-                    'error': 'Invalid board state',
-                    'details': 'Current state conflicts with solution'
-                }), 400
-            
-        app.logger.info(f"[{request_id}] Input validation passed, analyzing hint candidates")
-        hint = analyze_hint_candidates(current_state, solution)
+        metrics.HINT_STAGE.observe(time.perf_counter() - stage_start, stage='validation')
+
+        app.logger.info("[%s] Input validation passed, analyzing hint candidates", request_id)
+        with metrics.HINT_STAGE.time(stage='analysis'):
+            def analyze():
+                return compute_pool.call(
+                    'hint', analyze_hint_candidates, str(board), solution, app.config['HINT_TIME_BUDGET']
+                )
+            hint = analyze() if hint_cache is None else hint_cache.get_or_compute(str(board), solution, analyze)
         
         if not hint:
-            app.logger.info(f"[{request_id}] No valid hints available for current board state")
+            app.logger.info("[%s] No valid hints available for current board state", request_id)
             return jsonify({
                 'error': 'No hints available',
                 'details': 'No valid hints could be generated for the current board state'
@@ -116,7 +303,7 @@ def get_hint():
             'row': (int, lambda x: 0 <= x < 9),
             'col': (int, lambda x: 0 <= x < 9),
             'value': (str, lambda x: x in '123456789'),
-            'technique': (str, lambda x: x in hint_messages),
+            'technique': (str, lambda x: x in HINT_MESSAGES),
             'related_cells': (list, lambda x: all(
                 isinstance(cell, dict) and
                 all(k in cell for k in ['row', 'col']) and
@@ -146,7 +333,7 @@ def get_hint():
             
         # Validate hint technique
         
-        if hint['technique'] not in hint_messages:
+        if hint['technique'] not in HINT_MESSAGES:
             app.logger.error(f"[{request_id}] Unknown technique: {hint['technique']}")
             return jsonify({
                 'error': 'Invalid technique',
@@ -158,14 +345,17 @@ def get_hint():
             'col': hint['col'],
             'value': hint['value'],
             'technique': hint['technique'],
-            'message': hint_messages[hint['technique']],
+            'message': HINT_MESSAGES[hint['technique']],
             'related_cells': hint['related_cells']
         }
         
-        app.logger.info(f"[{request_id}] Hint generated successfully using technique: {hint['technique']}")
-        app.logger.debug(f"[{request_id}] Full hint response: {response_data}")
+        app.logger.info("[%s] Hint generated successfully using technique: %s", request_id, hint['technique'])
+        app.logger.debug("[%s] Hint analysis timings: %s", request_id, hint.get('timings'))
+        app.logger.debug("[%s] Full hint response: %s", request_id, response_data)
         return jsonify(response_data)
         
+    except (ComputeBusy, ComputeTimeout):
+        raise
     except ValueError as ve:
         app.logger.error(f"[{request_id}] Validation error in hint request: {str(ve)}")
         return jsonify({
@@ -180,6 +370,209 @@ def get_hint():
             'details': 'An unexpected error occurred while processing the hint request'
         }), 500
 
+@app.route('/hint/path', methods=['POST'])
+def get_hint_path():
+    """Return the next hints in solving order so the client can cache them"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'details': 'Request body is empty'
+            }), 400
+
+        current_state = data.get('current_state')
+        solution, error_response = resolve_solution(data)
+        if error_response:
+            return error_response
+        board, validation_error = parse_board_payload(current_state, solution)
+        if validation_error:
+            error, details = validation_error
+            return jsonify({
+                'error': error,
+                'details': details
+            }), 400
+
+        max_steps = data.get('max_steps', 81)
+        if not isinstance(max_steps, int) or not 1 <= max_steps <= 81:
+            return jsonify({
+                'error': 'Invalid max_steps',
+                'details': 'max_steps must be an integer between 1 and 81'
+            }), 400
+
+        def compute_path():
+            return compute_pool.call('hint_path', solving_path, str(board), solution, max_steps)
+        if hint_cache is None:
+            path = compute_path()
+        else:
+            path = hint_cache.get_or_compute_path(str(board), solution, max_steps, compute_path)
+        return jsonify({
+            'hints': [
+                {
+                    'row': hint['row'],
+                    'col': hint['col'],
+                    'value': hint['value'],
+                    'technique': hint['technique'],
+                    'message': HINT_MESSAGES[hint['technique']],
+                    'related_cells': hint['related_cells']
+                }
+                for hint in path
+            ],
+            'complete': len(board.empty_cells()) == len(path)
+        })
+
+    except (ComputeBusy, ComputeTimeout):
+        raise
+    except Exception as e:
+        app.logger.error(f"Unexpected error in hint path request: {str(e)}")
+        app.logger.exception("Detailed error traceback:")
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred while processing the hint path request'
+        }), 500
+
+@app.route('/game/<int:game_id>/moves', methods=['POST'])
+def game_moves(game_id):
+    """Apply moves to a stored game and report conflicts and completion.
+
+    With ``replay`` the moves are checked from the starting puzzle and
+    nothing is stored; the shared daily challenge game only accepts this.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'details': 'Request body is empty'
+            }), 400
+
+        if data.get('replay'):
+            game = db.session.get(Game, game_id)
+            outcome = replay_moves(game.puzzle, data.get('moves')) if game else None
+        else:
+            outcome = play_moves(game_id, data.get('moves'))
+        if outcome is None:
+            return jsonify({
+                'error': 'Game not found',
+                'details': f"No game with id {game_id}"
+            }), 404
+        return jsonify(outcome)
+
+    except MoveError as me:
+        return jsonify({
+            'error': 'Invalid move',
+            'details': str(me)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Unexpected error applying moves to game {game_id}: {str(e)}")
+        app.logger.exception("Detailed error traceback:")
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred while applying the moves'
+        }), 500
+
+@app.route('/game/<int:game_id>/submit', methods=['POST'])
+def submit_game(game_id):
+    """Verify a completed board for a game and record the result"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'details': 'Request body is empty'
+            }), 400
+
+        result = submit_board(game_id, data)
+        if result is None:
+            return jsonify({
+                'error': 'Game not found',
+                'details': f"No game with id {game_id}"
+            }), 404
+        return jsonify(result)
+
+    except SubmissionError as se:
+        return jsonify({
+            'error': 'Invalid submission',
+            'details': str(se)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Unexpected error submitting game {game_id}: {str(e)}")
+        app.logger.exception("Detailed error traceback:")
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred while verifying the submission'
+        }), 500
+
+@app.route('/submissions/bulk', methods=['POST'])
+def submit_games():
+    """Verify and record many completed boards at once, e.g. for leaderboard processing"""
+    try:
+        data = request.get_json(silent=True)
+        submissions = data.get('submissions') if isinstance(data, dict) else None
+        max_size = app.config['SUBMISSION_BULK_MAX_SIZE']
+        if not isinstance(submissions, list) or not submissions:
+            return jsonify({
+                'error': 'No submissions provided',
+                'details': 'submissions must be a non-empty list'
+            }), 400
+        if len(submissions) > max_size:
+            return jsonify({
+                'error': 'Too many submissions',
+                'details': f"At most {max_size} submissions per request"
+            }), 413
+
+        results = submit_boards(submissions)
+        accepted = sum(1 for result in results if result['valid'])
+        return jsonify({
+            'results': results,
+            'valid': accepted,
+            'invalid': len(results) - accepted
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Unexpected error in bulk submission: {str(e)}")
+        app.logger.exception("Detailed error traceback:")
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred while verifying the submissions'
+        }), 500
+
+@app.route('/stats/puzzle-pool')
+def puzzle_pool_stats():
+    return jsonify(puzzle_pool.stats())
+
+@app.route('/stats/compute-pool')
+def compute_pool_stats():
+    return jsonify(compute_pool.stats())
+
+@app.route('/stats/hint-cache')
+def hint_cache_stats():
+    if hint_cache is None:
+        return jsonify({'backend': None})
+    return jsonify(hint_cache.stats())
+
+@app.route('/ready')
+def ready():
+    """Readiness probe: 200 once the WARM_UP steps have succeeded, else 503.
+
+    Only reports; the steps run in the warm-up thread, which retries
+    failed ones.
+    """
+    stats = dict(warm_up.stats(), startup=startup)
+    return jsonify(stats), 200 if stats['ready'] else 503
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Request latency and stage timings of all workers in the Prometheus text format"""
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/stats/db-pool')
+def db_pool_stats():
+    return jsonify(pool_stats())
+
 @app.route('/contact', methods=['GET', 'POST'])
 def contact():
     if request.method == 'POST':
@@ -256,51 +649,39 @@ def privacy():
 @app.route('/daily-challenge')
 def daily_challenge():
     try:
-        from models import DailyPuzzle
-        from utils.generator import generate_puzzle
-        from app import db
-        import logging
-        
-        logging.info("Accessing daily challenge endpoint")
-        today = datetime.now().date()
-        
-        # Try to get today's puzzle from the database
-        try:
-            daily_puzzle = DailyPuzzle.query.filter_by(puzzle_date=today).first()
-            logging.info(f"Queried daily puzzle for date: {today}")
-        except Exception as db_error:
-            logging.error(f"Database error while fetching daily puzzle: {str(db_error)}")
-            return jsonify({'error': 'Failed to fetch daily puzzle'}), 500
-        
-        if not daily_puzzle:
-            logging.info("No puzzle found for today, generating new puzzle")
-            try:
-                # Generate a new puzzle with random difficulty
-                difficulty = random.choice(['easy', 'medium', 'hard'])
-                puzzle, solution = generate_puzzle(difficulty)
-                
-                # Create new daily puzzle
-                daily_puzzle = DailyPuzzle(
-                    puzzle_date=today,
-                    puzzle=puzzle,
-                    solution=solution,
-                    difficulty=difficulty
-                )
-                db.session.add(daily_puzzle)
-                db.session.commit()
-                logging.info(f"Created new daily puzzle with difficulty: {difficulty}")
-            except Exception as gen_error:
-                logging.error(f"Error generating/saving new puzzle: {str(gen_error)}")
-                db.session.rollback()
-                return jsonify({'error': 'Failed to generate new puzzle'}), 500
-        
+        daily_puzzle = dict(get_daily_puzzle())
+        daily_puzzle.update(board_fields(daily_puzzle.pop('puzzle'), daily_puzzle.pop('solution')))
+        # Sent back with a solve so the leaderboard can time it server-side
+        daily_puzzle['started'] = issue_start_token(datetime.strptime(daily_puzzle['date'], '%Y-%m-%d').date())
+        response = jsonify(daily_puzzle)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    except (ComputeBusy, ComputeTimeout):
+        db.session.rollback()
+        raise
+    except Exception as e:
+        app.logger.error(f"Error loading daily puzzle: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Failed to load daily puzzle'}), 500
+
+@app.route('/daily-challenge/leaderboard')
+def daily_leaderboard():
+    """Fastest solves of a day's challenge (today by default), plus ?player='s rank"""
+    try:
+        day = request.args.get('date')
+        day = datetime.strptime(day, '%Y-%m-%d').date() if day else current_date()
+        limit = request.args.get('limit', app.config['LEADERBOARD_MAX_LIMIT'], type=int)
+        if not 1 <= limit <= app.config['LEADERBOARD_MAX_LIMIT']:
+            raise ValueError(f"limit must be between 1 and {app.config['LEADERBOARD_MAX_LIMIT']}")
+    except ValueError as ve:
         return jsonify({
-            'puzzle': daily_puzzle.puzzle,
-            'solution': daily_puzzle.solution,
-            'difficulty': daily_puzzle.difficulty,
-            'date': daily_puzzle.puzzle_date.strftime('%Y-%m-%d')
-        })
-        
+            'error': 'Invalid request',
+            'details': str(ve)
+        }), 400
+
+    try:
+        return jsonify(leaderboard(day, limit, request.args.get('player')))
     except Exception as e:
-        logging.error(f"Unexpected error in daily challenge: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
+        app.logger.error(f"Error loading leaderboard: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Failed to load leaderboard'}), 500
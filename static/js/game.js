@@ -5,12 +5,14 @@ class SudokuGame {
         this.selectedCell = null;
         this.puzzle = null;
         this.solution = null;
+        this.gameId = null;
         this.currentNumbers = null;
         this.pencilMode = false;
         this.pencilMarks = null;
         this.gameState = null;
         this.timer = null;
         this.isPaused = false;
+        this.hintPath = [];
 
         // Ensure initialization happens after DOM is loaded
         if (document.readyState === 'loading') {
@@ -154,7 +156,9 @@ class SudokuGame {
             
             this.puzzle = data.puzzle;
             this.solution = data.solution;
+            this.gameId = data.game_id ?? null;
             this.currentNumbers = [...this.puzzle];
+            this.hintPath = [];
             
             // Reset game state
             this.gameState = {
@@ -278,31 +282,45 @@ class SudokuGame {
             this.clearTechniqueVisualizations();
             document.querySelectorAll('.game-error, .hint-message, .hint-overlay').forEach(el => el.remove());
 
-            console.log('Requesting hint...');
-            const response = await fetch('/hint', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
+            let data = this.takeCachedHint(currentState);
+            if (!data) {
+                console.log('Requesting hint path...');
+                // The server looks the solution up by game id; only send it
+                // when the game could not be saved server-side
+                const payload = {
                     current_state: currentState,
-                    solution: this.solution
-                })
-            });
+                    max_steps: this.gameState.remainingHints
+                };
+                if (this.gameId !== null) {
+                    payload.game_id = this.gameId;
+                } else {
+                    payload.solution = this.solution;
+                }
+                const response = await fetch('/hint/path', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(payload)
+                });
 
-            const data = await response.json();
+                const pathData = await response.json();
 
-            if (!response.ok) {
-                if (response.status === 404) {
-                    throw new Error(data.error || 'No hints available');
+                if (!response.ok) {
+                    // If it's a server error and we haven't exceeded retry attempts
+                    if (response.status === 500 && retryCount < 2) {
+                        console.log(`Retrying hint request (attempt ${retryCount + 1})...`);
+                        await new Promise(resolve => setTimeout(resolve, 1000));
+                        return this.getHint(retryCount + 1);
+                    }
+                    throw new Error(pathData.error || 'Failed to get hint');
                 }
-                // If it's a server error and we haven't exceeded retry attempts
-                if (response.status === 500 && retryCount < 2) {
-                    console.log(`Retrying hint request (attempt ${retryCount + 1})...`);
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    return this.getHint(retryCount + 1);
+
+                this.cacheHintPath(currentState, pathData.hints || []);
+                data = this.takeCachedHint(currentState);
+                if (!data) {
+                    throw new Error('No hints available');
                 }
-                throw new Error(data.error || 'Failed to get hint');
             }
 
             // Validate hint response
@@ -413,6 +431,27 @@ class SudokuGame {
         }
     }
 
+    cacheHintPath(state, hints) {
+        // Remember the board each hint applies to, so later hints can be
+        // served locally while the player follows the hinted path
+        const cells = state.split('');
+        this.hintPath = hints.map(hint => {
+            const entry = { state: cells.join(''), hint };
+            cells[hint.row * 9 + hint.col] = hint.value;
+            return entry;
+        });
+    }
+
+    takeCachedHint(state) {
+        const position = this.hintPath.findIndex(entry => entry.state === state);
+        if (position < 0) {
+            return null;
+        }
+        const { hint } = this.hintPath[position];
+        this.hintPath = this.hintPath.slice(position + 1);
+        return hint;
+    }
+
     updateHintCount() {
         const hintButton = document.getElementById('hint');
         const hintCount = hintButton.querySelector('.hint-count');
@@ -544,7 +583,9 @@ class SudokuGame {
                         const data = await response.json();
                         this.puzzle = data.puzzle;
                         this.solution = data.solution;
+                        this.gameId = data.game_id ?? null;
                         this.currentNumbers = [...this.puzzle];
+                        this.hintPath = [];
                         
                         // Reset game state
                         this.gameState = {
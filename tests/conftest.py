@@ -0,0 +1,49 @@
+"""Test configuration: the app runs on a throwaway SQLite file with background work off.
+
+app.py reads its settings from the environment when it is imported, so
+they are set here, before any test module imports it.
+"""
+import os
+import random
+import tempfile
+
+import pytest
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.sqlite3')}"
+os.environ['DAILY_SCHEDULER_ENABLED'] = 'false'
+os.environ['COMPUTE_POOL_WORKERS'] = '0'
+os.environ['PUZZLE_POOL_WORKERS'] = '0'
+os.environ['HINT_CACHE_BACKEND'] = 'none'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def random_game():
+    """Build a random (puzzle, solution) pair, about 40% clues, from an rng"""
+    from utils.generator import random_solution
+
+    def build(rng: random.Random):
+        solution = random_solution(rng)
+        puzzle = ''.join(digit if rng.random() < 0.4 else '0' for digit in solution)
+        return puzzle, solution
+    return build
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from utils.board import PEERS, UNITS
+from utils.generator import CandidateGrid
+
+
+def brute_candidates(board):
+    candidates = []
+    for i, digit in enumerate(board):
+        if digit != '0':
+            candidates.append(0)
+            continue
+        used = {board[p] for p in PEERS[i]}
+        candidates.append(sum(1 << (d - 1) for d in range(1, 10) if str(d) not in used))
+    return candidates
+
+
+def assert_consistent(grid, board):
+    assert grid.candidates == brute_candidates(board)
+    for u, unit in enumerate(UNITS):
+        assert grid.empty[u] == sum(board[i] == '0' for i in unit)
+        for d in range(9):
+            expected = sum(1 << k for k, i in enumerate(unit) if grid.candidates[i] >> d & 1)
+            assert grid.positions[u][d] == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_brute_force(random_game, seed):
+    puzzle, _ = random_game(random.Random(seed))
+    assert_consistent(CandidateGrid(puzzle), puzzle)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_place_updates_incrementally(random_game, seed):
+    rng = random.Random(seed)
+    puzzle, solution = random_game(rng)
+    grid = CandidateGrid(puzzle)
+    board = list(puzzle)
+    for index in rng.sample([i for i, d in enumerate(puzzle) if d == '0'], 10):
+        grid.place(index, int(solution[index]))
+        board[index] = solution[index]
+        assert_consistent(grid, ''.join(board))
+
+
+def test_copy_is_independent(random_game):
+    puzzle, solution = random_game(random.Random(1))
+    grid = CandidateGrid(puzzle)
+    clone = grid.copy()
+    index = puzzle.index('0')
+    clone.place(index, int(solution[index]))
+    assert_consistent(grid, puzzle)
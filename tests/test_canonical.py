@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from utils.generator import canonical_form, random_transform
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_invariant_under_random_transform(random_game, seed):
+    rng = random.Random(seed)
+    puzzle, solution = random_game(rng)
+    canonical = canonical_form(puzzle, solution)[:2]
+    for _ in range(5):
+        transform = random_transform(rng)
+        assert canonical_form(transform.apply(puzzle), transform.apply(solution))[:2] == canonical
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_transform_maps_to_canonical(random_game, seed):
+    puzzle, solution = random_game(random.Random(seed))
+    canonical_puzzle, canonical_solution, transform = canonical_form(puzzle, solution)
+    assert transform.apply(puzzle) == canonical_puzzle
+    assert transform.apply(solution) == canonical_solution
+    assert transform.inverse().apply(canonical_puzzle) == puzzle
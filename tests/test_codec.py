@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from utils.codec import GAME_BYTES, decode_game, encode_game, pack_board, pack_game, unpack_board, unpack_game
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_game_round_trip(random_game, seed):
+    puzzle, solution = random_game(random.Random(seed))
+    packed = pack_game(puzzle, solution)
+    assert len(packed) == GAME_BYTES
+    assert unpack_game(packed) == (puzzle, solution)
+    assert decode_game(encode_game(puzzle, solution)) == (puzzle, solution)
+
+
+def test_board_round_trip(random_game):
+    for board in ('0' * 81, '9' * 81, random_game(random.Random(1))[0]):
+        assert unpack_board(pack_board(board)) == board
+
+
+def test_clue_must_match_solution(random_game):
+    puzzle, solution = random_game(random.Random(2))
+    index = puzzle.index('0')
+    wrong = str(int(solution[index]) % 9 + 1)
+    with pytest.raises(ValueError):
+        pack_game(puzzle[:index] + wrong + puzzle[index + 1:], solution)
+
+
+@pytest.mark.parametrize('board', ['0' * 80, '0' * 80 + 'x'])
+def test_invalid_board(board):
+    with pytest.raises(ValueError):
+        pack_board(board)
@@ -0,0 +1,80 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils.compute import ComputeBusy, ComputePool, ComputeTimeout
+
+
+@pytest.fixture
+def pool():
+    pool = ComputePool(workers=1, max_pending=1, timeout=5)
+    pool.start(wait=True)
+    yield pool
+    pool.shutdown()
+
+
+def test_call_returns_the_result(pool):
+    assert pool.call('test', pow, 2, 10) == 1024
+    assert ComputePool(workers=0).call('test', pow, 2, 10) == 1024
+
+
+def test_errors_are_raised_in_the_caller(pool):
+    with pytest.raises(ValueError):
+        pool.call('test', int, 'x')
+
+
+def test_slow_call_times_out(pool):
+    start = time.perf_counter()
+    with pytest.raises(ComputeTimeout):
+        pool.call('test', time.sleep, 2, timeout=0.2)
+    assert time.perf_counter() - start < 1
+
+
+def test_full_pool_rejects_calls(pool):
+    busy = threading.Thread(target=pool.call, args=('test', time.sleep, 0.5))
+    busy.start()
+    time.sleep(0.1)
+    try:
+        with pytest.raises(ComputeBusy):
+            pool.call('test', pow, 2, 2)
+    finally:
+        busy.join()
+    assert pool.call('test', pow, 2, 2) == 4
+
+
+def test_call_expired_while_queued_is_skipped():
+    pool = ComputePool(workers=1, max_pending=2, timeout=5)
+    try:
+        busy = threading.Thread(target=pool.call, args=('test', time.sleep, 0.5))
+        busy.start()
+        time.sleep(0.1)
+        with pytest.raises(ComputeTimeout):
+            pool.call('test', pow, 2, 2, timeout=0.1)
+        busy.join()
+    finally:
+        pool.shutdown()
+
+
+def test_pool_is_replaced_after_a_worker_dies(pool):
+    with pytest.raises(BrokenProcessPool):
+        pool.call('test', os._exit, 1)
+    assert pool.call('test', pow, 3, 2) == 9
+
+
+@pytest.mark.parametrize('error, status', [(ComputeBusy, 503), (ComputeTimeout, 504)])
+def test_routes_answer_busy_and_timeout(client, random_game, monkeypatch, error, status):
+    import routes
+
+    def fail(*args, **kwargs):
+        raise error('test')
+    monkeypatch.setattr(routes.compute_pool, 'call', fail)
+    puzzle, solution = random_game(random.Random(10))
+    response = client.post('/hint', json={'current_state': puzzle, 'solution': solution})
+    assert response.status_code == status
+    if status == 503:
+        assert response.headers['Retry-After'] == '1'
+    assert client.post('/hint/path', json={'current_state': puzzle, 'solution': solution}).status_code == status
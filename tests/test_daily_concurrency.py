@@ -0,0 +1,15 @@
+"""Runs benchmarks/daily_concurrency.py at a small scale; it exits non-zero on a race."""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_daily_challenge_race_across_midnight():
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.daily_concurrency', '--processes', '2', '--threads', '8', '--window', '0.5'],
+        cwd=ROOT, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert 'PASS' in result.stdout
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from utils.db import copy_rows, execute_sql, executemany
+
+TABLE = 'db_helpers_test'
+
+
+@pytest.fixture
+def table(app_context):
+    execute_sql(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, puzzle TEXT)")
+    yield TABLE
+    execute_sql(f"DROP TABLE {TABLE}")
+
+
+def count():
+    return execute_sql(f"SELECT COUNT(*) AS n FROM {TABLE}", fetchall=False)['n']
+
+
+def test_executemany_and_copy_rows(table):
+    assert executemany(f"INSERT INTO {table} (id, puzzle) VALUES (?, ?)", [(1, 'a'), (2, 'b')]) == 2
+    assert copy_rows(table, ['id', 'puzzle'], ((i, 'x') for i in range(3, 2503)), batch_size=1000) == 2500
+    assert count() == 2502
+
+
+def test_copy_rows_failure_is_logged_and_rolled_back(table, caplog):
+    rows = [(1, 'a'), (2, 'b'), (1, 'duplicate')]
+    with pytest.raises(IntegrityError):
+        copy_rows(table, ['id', 'puzzle'], rows, batch_size=2)
+    assert count() == 0
+    assert f"Bulk load into {table} failed after 2 rows" in caplog.text
+
+
+def test_executemany_failure_is_logged(table, caplog):
+    with pytest.raises(IntegrityError):
+        executemany(f"INSERT INTO {table} (id, puzzle) VALUES (?, ?)", [(1, 'a'), (1, 'b')])
+    assert count() == 0
+    assert 'executemany of 2 rows failed' in caplog.text
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from utils.generator import (
+    DIFFICULTY_PROFILES, RATING_DIFFICULTY, generate_chunk, generate_puzzle, generate_unique_puzzle
+)
+from utils.solver import count_solutions, is_solved, rate_puzzle
+
+
+@pytest.mark.parametrize('difficulty', list(DIFFICULTY_PROFILES))
+def test_unique_puzzle_is_unique_and_rated(difficulty):
+    result = generate_unique_puzzle(difficulty, time_budget=None, rng=random.Random(difficulty), max_attempts=50)
+    puzzle, solution = result['puzzle'], result['solution']
+    assert count_solutions(puzzle, 2) == 1
+    assert is_solved(solution, puzzle)
+    assert result['rating'] == RATING_DIFFICULTY[rate_puzzle(puzzle)]
+    assert result['clues'] == 81 - puzzle.count('0') >= DIFFICULTY_PROFILES[difficulty]['min_clues']
+
+
+def test_easy_and_medium_hit_their_rating():
+    for difficulty in ('easy', 'medium'):
+        result = generate_unique_puzzle(difficulty, time_budget=None, rng=random.Random(0), max_attempts=50)
+        assert result['rating'] == difficulty
+
+
+def test_unknown_difficulty_is_easy():
+    assert generate_unique_puzzle('impossible', rng=random.Random(1))['difficulty'] == 'easy'
+
+
+def test_generation_depends_only_on_rng():
+    first = generate_unique_puzzle('medium', time_budget=None, rng=random.Random(9), max_attempts=3)
+    second = generate_unique_puzzle('medium', time_budget=None, rng=random.Random(9), max_attempts=3)
+    assert (first['puzzle'], first['solution']) == (second['puzzle'], second['solution'])
+
+
+def test_chunk_is_reproducible_from_its_seed():
+    first = generate_chunk('easy', 'seed-1', 3)
+    second = generate_chunk('easy', 'seed-1', 3, canonical=True)
+    assert [p['puzzle'] for p in first['puzzles']] == [p['puzzle'] for p in second['puzzles']]
+    assert all('canonical' in p for p in second['puzzles'])
+
+
+def test_generate_puzzle_returns_a_unique_pair():
+    puzzle, solution = generate_puzzle('easy')
+    assert count_solutions(puzzle, 2) == 1
+    assert is_solved(solution, puzzle)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from utils.cache import HintCache, create_backend
+from utils.generator import analyze_hint_candidates, random_transform, solving_path
+
+
+@pytest.fixture(params=[False, True], ids=['plain', 'canonical'])
+def cache(request):
+    return HintCache(create_backend('memory'), canonical=request.param)
+
+
+@pytest.fixture
+def board(random_game):
+    return random_game(random.Random(5))
+
+
+class Counter:
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.func()
+
+
+def test_hint_is_cached(cache, board):
+    puzzle, solution = board
+    compute = Counter(lambda: analyze_hint_candidates(puzzle, solution))
+    first = cache.get_or_compute(puzzle, solution, compute)
+    second = cache.get_or_compute(puzzle, solution, compute)
+    assert compute.calls == 1
+    assert (second['row'], second['col'], second['value']) == (first['row'], first['col'], first['value'])
+    assert cache.stats()['hits'] == 1
+
+
+def test_budget_truncated_hint_is_not_cached(cache, board):
+    puzzle, solution = board
+    truncated = cache.get_or_compute(puzzle, solution, lambda: analyze_hint_candidates(puzzle, solution, 0.0))
+    assert truncated['complete'] is False
+    compute = Counter(lambda: analyze_hint_candidates(puzzle, solution))
+    cache.get_or_compute(puzzle, solution, compute)
+    cache.get_or_compute(puzzle, solution, compute)
+    assert compute.calls == 1
+
+
+def test_path_serves_shorter_requests_and_hint(cache, board):
+    puzzle, solution = board
+    compute = Counter(lambda: solving_path(puzzle, solution, 10))
+    path = cache.get_or_compute_path(puzzle, solution, 10, compute)
+    assert cache.get_or_compute_path(puzzle, solution, 3, compute) == path[:3]
+    assert compute.calls == 1
+
+    hint = cache.get_or_compute(puzzle, solution, lambda: pytest.fail('first step should be cached'))
+    assert (hint['row'], hint['col'], hint['value']) == (path[0]['row'], path[0]['col'], path[0]['value'])
+
+
+def test_longer_path_is_computed_unless_exhausted(cache, board):
+    puzzle, solution = board
+    cache.get_or_compute_path(puzzle, solution, 2, lambda: solving_path(puzzle, solution, 2))
+    longer = Counter(lambda: solving_path(puzzle, solution, 81))
+    full = cache.get_or_compute_path(puzzle, solution, 81, longer)
+    assert longer.calls == 1
+    assert cache.get_or_compute_path(puzzle, solution, 81, longer) == full
+    assert longer.calls == 1
+
+
+def test_canonical_entries_are_shared_between_equivalent_boards(board):
+    cache = HintCache(create_backend('memory'), canonical=True)
+    puzzle, solution = board
+    cache.get_or_compute_path(puzzle, solution, 5, lambda: solving_path(puzzle, solution, 5))
+    transform = random_transform(random.Random(1))
+    moved_puzzle, moved_solution = transform.apply(puzzle), transform.apply(solution)
+    path = cache.get_or_compute_path(moved_puzzle, moved_solution, 5, lambda: pytest.fail('should be cached'))
+    for hint in path:
+        index = hint['row'] * 9 + hint['col']
+        assert moved_puzzle[index] == '0' and moved_solution[index] == hint['value']
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from utils.games import create_game
+from utils.generator import analyze_hint_candidates
+
+
+@pytest.fixture
+def board(random_game):
+    return random_game(random.Random(6))
+
+
+def test_path_matches_repeated_hints(client, board):
+    puzzle, solution = board
+    response = client.post('/hint/path', json={'current_state': puzzle, 'solution': solution, 'max_steps': 10})
+    assert response.status_code == 200
+    hints = response.get_json()['hints']
+    assert len(hints) == 10
+    state = puzzle
+    for hint in hints:
+        expected = analyze_hint_candidates(state, solution)
+        assert (hint['row'], hint['col'], hint['value'], hint['technique']) == \
+            (expected['row'], expected['col'], expected['value'], expected['technique'])
+        assert hint['message']
+        index = hint['row'] * 9 + hint['col']
+        state = state[:index] + hint['value'] + state[index + 1:]
+
+
+def test_full_path_solves_the_board(client, board):
+    puzzle, solution = board
+    data = client.post('/hint/path', json={'current_state': puzzle, 'solution': solution}).get_json()
+    assert data['complete'] is True
+    state = list(puzzle)
+    for hint in data['hints']:
+        state[hint['row'] * 9 + hint['col']] = hint['value']
+    assert ''.join(state) == solution
+
+
+def test_solution_is_looked_up_by_game_id(client, app_context, board):
+    puzzle, solution = board
+    game_id = create_game(puzzle, solution, 'easy')
+    data = client.post('/hint/path', json={'current_state': puzzle, 'game_id': game_id, 'max_steps': 1}).get_json()
+    hint = data['hints'][0]
+    assert hint['value'] == solution[hint['row'] * 9 + hint['col']]
+    assert client.post('/hint/path', json={'current_state': puzzle, 'game_id': 10 ** 9}).status_code == 404
+
+
+@pytest.mark.parametrize('max_steps', [0, 82, '5', None])
+def test_invalid_max_steps(client, board, max_steps):
+    puzzle, solution = board
+    response = client.post('/hint/path', json={'current_state': puzzle, 'solution': solution, 'max_steps': max_steps})
+    assert response.status_code == 400
+
+
+def test_invalid_board(client, board):
+    _, solution = board
+    assert client.post('/hint/path', json={'current_state': '0' * 80, 'solution': solution}).status_code == 400
+    assert client.post('/hint/path', json={}).status_code == 400
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from utils.generator import HINT_PRIORITY, CandidateGrid, analyze_hint_candidates, classify_cell
+
+
+def best_single_rank(puzzle, solution):
+    grid = CandidateGrid(puzzle)
+    return min(
+        HINT_PRIORITY.index(classify_cell(grid, i, solution[i])[0])
+        for i, digit in enumerate(puzzle) if digit == '0'
+    )
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_hint_is_correct_and_best(random_game, seed):
+    puzzle, solution = random_game(random.Random(seed))
+    hint = analyze_hint_candidates(puzzle, solution)
+    index = hint['row'] * 9 + hint['col']
+    assert puzzle[index] == '0' and hint['value'] == solution[index]
+    assert hint['complete'] is True
+    if best_single_rank(puzzle, solution) < HINT_PRIORITY.index('basic_elimination'):
+        assert HINT_PRIORITY.index(hint['technique']) == best_single_rank(puzzle, solution)
+
+
+def test_stops_at_the_first_naked_single(random_game):
+    _, solution = random_game(random.Random(1))
+    rng = random.Random(1)
+    puzzle = ''.join('0' if rng.random() < 0.3 else digit for digit in solution)
+    hint = analyze_hint_candidates(puzzle, solution)
+    assert hint['technique'] == 'single_candidate'
+    assert hint['cells_examined'] < puzzle.count('0')
+
+
+def test_spent_budget_returns_an_incomplete_hint(random_game):
+    puzzle, solution = random_game(random.Random(2))
+    hint = analyze_hint_candidates(puzzle, solution, time_budget=0.0)
+    assert hint['complete'] is False
+    index = hint['row'] * 9 + hint['col']
+    assert hint['value'] == solution[index]
+
+
+def test_no_hint_for_a_solved_or_invalid_board(random_game):
+    _, solution = random_game(random.Random(3))
+    assert analyze_hint_candidates(solution, solution) is None
+    assert analyze_hint_candidates('0' * 80, solution) is None
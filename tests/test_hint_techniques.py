@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from utils.generator import (
+    HINT_TECHNIQUES, CandidateGrid, classify_cell, find_elimination_hint, generate_unique_puzzle
+)
+
+
+@pytest.fixture(scope='module')
+def hard_grids():
+    """Candidate grids of hard puzzles with every available single placed"""
+    grids = []
+    for seed in range(12):
+        result = generate_unique_puzzle('hard', time_budget=None, rng=random.Random(seed), max_attempts=20)
+        solution = result['solution']
+        grid = CandidateGrid(result['puzzle'])
+        placed = True
+        while placed:
+            placed = False
+            for index in range(81):
+                if not grid.cells[index] and classify_cell(grid, index, solution[index])[0] != 'basic_elimination':
+                    grid.place(index, int(solution[index]))
+                    placed = True
+        grids.append((grid, solution))
+    return grids
+
+
+def test_detectors_never_remove_the_solution(hard_grids):
+    fired = set()
+    for grid, solution in hard_grids:
+        grid = grid.copy()
+        changed = True
+        while changed:
+            changed = False
+            for _, name, detect in HINT_TECHNIQUES:
+                for pattern, eliminations in detect(grid):
+                    assert pattern and all(not grid.cells[i] for i in pattern)
+                    for index, mask in eliminations:
+                        assert not mask & 1 << (int(solution[index]) - 1), (name, index)
+                        if grid.eliminate(index, mask):
+                            changed = True
+                            fired.add(name)
+    assert fired == {name for _, name, _ in HINT_TECHNIQUES}
+
+
+def test_elimination_hint_is_correct(hard_grids):
+    found = 0
+    for grid, solution in hard_grids:
+        hint = find_elimination_hint(grid.copy(), solution, {})
+        if hint is None:
+            continue
+        technique, index, cells = hint
+        assert technique in {name for _, name, _ in HINT_TECHNIQUES}
+        assert not grid.cells[index] and cells
+        found += 1
+    assert found
+
+
+def test_expired_deadline_stops_the_search(hard_grids):
+    grid, solution = hard_grids[0]
+    assert find_elimination_hint(grid.copy(), solution, {}, deadline=0.0) is None
@@ -0,0 +1,73 @@
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from itsdangerous import TimestampSigner
+
+from utils.leaderboard import DayBoard, issue_start_token, solve_time
+
+DAY = date(2030, 6, 1)
+EMPTY_CELLS = 50
+
+
+def test_day_board_ranks_fastest_first():
+    board = DayBoard()
+    now = datetime(2030, 6, 1)
+    assert board.add(300, now, 'b')
+    assert board.add(200, now, 'a')
+    assert board.add(300, now + timedelta(seconds=1), 'c')
+    assert not board.add(100, now, 'a')
+    assert [entry['player'] for entry in board.top(10)] == ['a', 'b', 'c']
+    assert board.rank('c') == 3 and board.rank('nobody') is None
+    assert board.top(1) == [{'rank': 1, 'player': 'a', 'seconds': 200}]
+
+
+def test_solve_time_needs_a_valid_token_for_the_day(app_context):
+    assert solve_time(None, DAY, 600, EMPTY_CELLS)[0] is None
+    assert solve_time('forged', DAY, 600, EMPTY_CELLS)[1] == 'started token is invalid or expired'
+    other_day = issue_start_token(DAY + timedelta(days=1))
+    assert solve_time(other_day, DAY, 600, EMPTY_CELLS)[1] == 'started token is for another day'
+    assert solve_time(issue_start_token(DAY), DAY, 600, EMPTY_CELLS) == (600, None)
+
+
+def test_solve_time_floor(app, app_context):
+    token = issue_start_token(DAY)
+    floor = EMPTY_CELLS * app.config['LEADERBOARD_MIN_SECONDS_PER_CELL']
+    assert solve_time(token, DAY, 5, EMPTY_CELLS) == (None, 'solve time is faster than plausible')
+    assert solve_time(token, DAY, int(floor), EMPTY_CELLS) == (int(floor), None)
+
+
+def test_reported_time_is_raised_to_the_server_time(app_context, monkeypatch):
+    issued_at = int(time.time()) - 900
+    monkeypatch.setattr(TimestampSigner, 'get_timestamp', lambda self: issued_at)
+    token = issue_start_token(DAY)
+    monkeypatch.undo()
+    seconds, error = solve_time(token, DAY, 60, EMPTY_CELLS)
+    assert error is None and 900 <= seconds < 910
+
+
+def test_daily_solve_is_ranked(client, app_context):
+    from utils.games import get_solution
+
+    daily = client.get('/daily-challenge').get_json()
+    solution = get_solution(daily['game_id'])
+    submit = {'board': solution, 'player': 'tester', 'started': daily['started']}
+
+    too_fast = client.post(f"/game/{daily['game_id']}/submit", json=dict(submit, seconds=1)).get_json()
+    assert too_fast['valid'] and too_fast['rank'] is None and too_fast['rank_error']
+
+    ranked = client.post(f"/game/{daily['game_id']}/submit", json=dict(submit, seconds=3600)).get_json()
+    assert ranked['rank'] == 1
+
+    unsigned = client.post(f"/game/{daily['game_id']}/submit",
+                           json={'board': solution, 'player': 'other', 'seconds': 3600}).get_json()
+    assert unsigned['rank'] is None
+
+    board = client.get(f"/daily-challenge/leaderboard?date={daily['date']}&player=tester").get_json()
+    assert board['total'] == 1
+    assert board['player'] == {'rank': 1, 'player': 'tester', 'seconds': 3600}
+
+
+@pytest.mark.parametrize('query', ['date=2030-13-01', 'limit=0', 'limit=100000'])
+def test_leaderboard_validation(client, query):
+    assert client.get(f'/daily-challenge/leaderboard?{query}').status_code == 400
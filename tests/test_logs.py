@@ -0,0 +1,37 @@
+import logging
+import os
+import time
+
+from utils.logs import configure_logging
+
+
+def test_forked_child_writes_its_records(tmp_path):
+    path = tmp_path / 'child.log'
+    logger = logging.getLogger('tests.logs.fork')
+    logger.addHandler(logging.FileHandler(path))
+    configure_logging(logger, 'INFO', 1.0, 100)
+
+    pid = os.fork()
+    if pid == 0:
+        logger.error('from the child')
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if 'from the child' in path.read_text():
+                os._exit(0)
+            time.sleep(0.05)
+        os._exit(1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+def test_warnings_are_kept_when_sampled_out(tmp_path):
+    path = tmp_path / 'sampled.log'
+    logger = logging.getLogger('tests.logs.sampled')
+    logger.addHandler(logging.FileHandler(path))
+    configure_logging(logger, 'INFO', 0.0, 100)
+    logger.info('routine')
+    logger.warning('kept')
+    deadline = time.time() + 5
+    while 'kept' not in path.read_text() and time.time() < deadline:
+        time.sleep(0.05)
+    assert path.read_text() == 'kept\n'
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from models import Game
+from utils.games import create_game
+from utils.generator import random_solution
+from utils.moves import MoveError, play_moves
+
+
+@pytest.fixture
+def game(app_context):
+    solution = random_solution(random.Random(3))
+    puzzle = ''.join(digit if i % 3 == 0 else '0' for i, digit in enumerate(solution))
+    game_id = create_game(puzzle, solution, 'easy')
+    empty = [i for i, digit in enumerate(puzzle) if digit == '0']
+    return game_id, solution, empty
+
+
+def move(index, solution):
+    return {'row': index // 9, 'col': index % 9, 'value': int(solution[index])}
+
+
+def test_moves_are_stored(game):
+    game_id, solution, empty = game
+    outcome = play_moves(game_id, [move(empty[0], solution), move(empty[1], solution)])
+    assert outcome['move_count'] == 2
+    stored = db.session.get(Game, game_id)
+    db.session.refresh(stored)
+    assert stored.move_count == 2
+    assert stored.state[empty[0]] == solution[empty[0]]
+
+
+def test_version_conflict_reloads_tracker(game):
+    game_id, solution, empty = game
+    play_moves(game_id, [move(empty[0], solution)])
+
+    # Another worker moves the game behind this worker's cached tracker
+    state = db.session.get(Game, game_id).state
+    state = state[:empty[1]] + solution[empty[1]] + state[empty[1] + 1:]
+    db.session.execute(update(Game).where(Game.id == game_id).values(state=state, move_count=5))
+    db.session.commit()
+
+    outcome = play_moves(game_id, [move(empty[2], solution)])
+    assert outcome['move_count'] == 6
+    stored = db.session.get(Game, game_id)
+    db.session.refresh(stored)
+    assert stored.move_count == 6
+    assert all(stored.state[i] == solution[i] for i in empty[:3])
+
+
+def test_invalid_move_is_not_applied(game):
+    game_id, solution, empty = game
+    with pytest.raises(MoveError):
+        play_moves(game_id, [move(empty[0], solution), {'row': 9, 'col': 0, 'value': 1}])
+    assert play_moves(game_id, [move(empty[0], solution)])['move_count'] == 1
+
+
+def test_missing_game(app_context):
+    assert play_moves(10 ** 9, [{'row': 0, 'col': 0, 'value': 1}]) is None
@@ -0,0 +1,32 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils.puzzle_pool import PuzzlePool
+
+
+def wait_for_depth(pool, difficulty, depth, timeout=30):
+    deadline = time.time() + timeout
+    while pool.stats()['difficulties'][difficulty]['depth'] < depth:
+        assert time.time() < deadline, pool.stats()
+        time.sleep(0.05)
+
+
+def test_refill_recovers_from_a_dead_worker():
+    pool = PuzzlePool(low_water=1, high_water=1, workers=1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            pool._get_executor().submit(os._exit, 1).result(timeout=30)
+        pool.refill('easy')
+        wait_for_depth(pool, 'easy', 1)
+        assert pool.get('easy')['puzzle']
+    finally:
+        pool.shutdown()
+
+
+def test_synchronous_without_workers():
+    pool = PuzzlePool(workers=0)
+    assert pool.get('easy')['puzzle']
+    assert pool.stats()['difficulties']['easy']['misses'] == 1
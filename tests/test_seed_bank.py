@@ -0,0 +1,26 @@
+import logging
+import random
+
+from utils.generator import load_seed_bank, transformed_puzzle, vet_seed
+from utils.solver import count_solutions
+
+
+def test_missing_seed_bank_is_logged(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING, logger='utils.generator'):
+        assert load_seed_bank(str(tmp_path / 'missing.json')) == {}
+    assert 'Seed bank unavailable' in caplog.text
+
+
+def test_shipped_seeds_are_vetted():
+    seeds = load_seed_bank()
+    assert seeds
+    for difficulty, pairs in seeds.items():
+        assert vet_seed(*pairs[0], difficulty)
+
+
+def test_transformed_puzzle_keeps_uniqueness():
+    rng = random.Random(4)
+    for difficulty in load_seed_bank():
+        result = transformed_puzzle(difficulty, rng)
+        assert count_solutions(result['puzzle'], 2) == 1
+        assert all(clue in ('0', answer) for clue, answer in zip(result['puzzle'], result['solution']))
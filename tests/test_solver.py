@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from utils.generator import random_solution
+from utils.solver import count_solutions, is_solved, parse_grid, rate_puzzle, solve
+
+# A 21-clue puzzle that needs search
+HARD = '800000000003600000070090200050007000000045700000100030001000068008500010090000400'
+
+
+def test_solves_hard_puzzle():
+    solution = solve(HARD)
+    assert is_solved(solution, HARD)
+    assert count_solutions(HARD) == 1
+    assert rate_puzzle(HARD) == 'search'
+
+
+def test_accepts_dots_and_rows():
+    rows = [[HARD[r * 9 + c] for c in range(9)] for r in range(9)]
+    assert solve(HARD.replace('0', '.')) == solve(rows) == solve(HARD)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_full_grid_is_its_own_solution(seed):
+    solution = random_solution(random.Random(seed))
+    assert solve(solution) == solution
+    assert count_solutions(solution) == 1
+    assert rate_puzzle(solution) == 'naked_single'
+
+
+def test_counts_stop_at_limit():
+    assert count_solutions('0' * 81, 2) == 2
+    assert count_solutions('0' * 81, 5) == 5
+    # With every 1 and 2 blanked the two digits can swap
+    solution = random_solution(random.Random(1))
+    assert count_solutions(solution.replace('1', '0').replace('2', '0'), 10) >= 2
+
+
+def test_contradiction_has_no_solution():
+    clash = '11' + '0' * 79
+    assert solve(clash) is None
+    assert count_solutions(clash) == 0
+    assert rate_puzzle(clash) is None
+    # Valid givens that leave a cell without candidates
+    stuck = '123456780' + '0' * 8 + '9' + '0' * 63
+    assert solve(stuck) is None
+
+
+def test_is_solved_checks_units_and_givens():
+    solution = random_solution(random.Random(2))
+    assert is_solved(solution)
+    swapped = solution[1] + solution[0] + solution[2:]
+    assert not is_solved(swapped)
+    assert not is_solved(solution[:80] + '0')
+    puzzle = ''.join(d if i % 2 else '0' for i, d in enumerate(solution))
+    assert is_solved(solution, puzzle)
+    other = random_solution(random.Random(3))
+    assert not is_solved(other, puzzle)
+
+
+@pytest.mark.parametrize('grid', ['0' * 80, '0' * 80 + 'x', [[0] * 9] * 8])
+def test_invalid_grid(grid):
+    with pytest.raises(ValueError):
+        parse_grid(grid)
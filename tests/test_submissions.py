@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from app import db
+from models import Submission
+from utils import submissions
+from utils.games import create_game
+from utils.generator import random_solution
+
+
+@pytest.fixture
+def game(app_context, random_game):
+    puzzle, solution = random_game(random.Random(8))
+    return create_game(puzzle, solution, 'easy'), puzzle, solution
+
+
+def other_solution(puzzle, solution):
+    """A valid grid that breaks one of ``puzzle``'s givens: ``solution`` with two digits swapped"""
+    index = next(i for i, digit in enumerate(puzzle) if digit != '0')
+    a, b = solution[index], '1' if solution[index] != '1' else '2'
+    return solution.translate(str.maketrans(a + b, b + a))
+
+
+def test_single_submission(client, game):
+    game_id, puzzle, solution = game
+    wrong = solution[1] + solution[0] + solution[2:]
+    for board, valid in ((solution, True), (wrong, False), (other_solution(puzzle, solution), False)):
+        response = client.post(f'/game/{game_id}/submit', json={'board': board})
+        assert response.status_code == 200
+        result = response.get_json()
+        assert result['valid'] is valid
+        assert db.session.get(Submission, result['submission_id']).valid is valid
+
+
+def test_single_submission_errors(client, game):
+    game_id, _, solution = game
+    assert client.post(f'/game/{10 ** 9}/submit', json={'board': solution}).status_code == 404
+    assert client.post(f'/game/{game_id}/submit', json={'board': solution[:80]}).status_code == 400
+    assert client.post(f'/game/{game_id}/submit', json={'board': solution, 'seconds': -1}).status_code == 400
+    assert client.post(f'/game/{game_id}/submit', json={}).status_code == 400
+
+
+@pytest.mark.parametrize('batch', [True, False], ids=['numpy', 'python'])
+def test_bulk_submissions_keep_their_order(client, game, monkeypatch, batch):
+    if not batch:
+        monkeypatch.setattr(submissions, 'verify_batch', None)
+    elif submissions.verify_batch is None:
+        pytest.skip('numpy is not installed')
+    game_id, puzzle, solution = game
+    items = [
+        {'game_id': game_id, 'board': solution},
+        {'game_id': 10 ** 9, 'board': solution},
+        {'game_id': 'x', 'board': solution},
+        {'game_id': game_id, 'board': other_solution(puzzle, solution)},
+        {'game_id': game_id, 'board': random_solution(random.Random(9))},
+    ]
+    before = Submission.query.count()
+    results = client.post('/submissions/bulk', json={'submissions': items}).get_json()['results']
+    assert [result['valid'] for result in results] == [True, False, False, False, False]
+    assert results[1]['error'] == 'Game not found'
+    assert 'error' in results[2]
+    assert Submission.query.count() - before == 3
+
+
+def test_bulk_limits(client, app):
+    assert client.post('/submissions/bulk', json={'submissions': []}).status_code == 400
+    too_many = [{}] * (app.config['SUBMISSION_BULK_MAX_SIZE'] + 1)
+    assert client.post('/submissions/bulk', json={'submissions': too_many}).status_code == 413
@@ -0,0 +1,53 @@
+import os
+import threading
+
+from app import app, db
+
+
+class PeriodicJob:
+    """Background thread that calls ``run_once`` every ``interval`` seconds.
+
+    ``run_once`` runs inside an application context; errors are logged and
+    the session rolled back so one failed run does not stop the thread.
+    """
+    name = 'periodic-job'
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def run_once(self):
+        raise NotImplementedError
+
+    def ensure_started(self):
+        """Start the thread in this process if it is not running yet.
+
+        Called per request rather than at import so that each forked
+        worker starts its own thread.
+        """
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with app.app_context():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    app.logger.error(f"Error in {self.name}: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._stop.wait(self.interval)
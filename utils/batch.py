@@ -0,0 +1,212 @@
+"""Vectorised constraint propagation over many boards at once (requires NumPy).
+
+N boards are held as an ``(N, 81)`` uint8 array (0 for empty) and their
+candidates as an ``(N, 81)`` uint16 array of digit bitmasks, the same
+encoding utils.solver uses per board (digit ``d`` is bit ``d - 1``).
+Each round recomputes the candidates of every unfinished board with array
+operations and places all naked singles, or all hidden singles for boards
+with no naked single left. Only boards that singles cannot finish (rated
+'search') need search, which splits them on their most constrained
+cell and propagates the children as a batch in turn.
+
+Singles are forced moves, so a board they fill has exactly one solution,
+and the order they are placed in does not change the outcome: ratings
+match utils.solver.rate_puzzle.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.board import ALL, UNITS
+from utils.solver import TECHNIQUES
+
+UNIT_CELLS = np.array(UNITS)
+# The row, column and box unit of every cell
+CELL_UNITS = np.array([[u for u, unit in enumerate(UNITS) if i in unit] for i in range(81)])
+
+# Digit -> bit, bit count of a mask, and digit of a single-bit mask
+BIT = np.array([0] + [1 << d for d in range(9)], dtype=np.uint16)
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(ALL + 1)], dtype=np.uint8)
+DIGIT_OF = np.zeros(ALL + 1, dtype=np.uint8)
+DIGIT_OF[BIT[1:]] = np.arange(1, 10)
+
+# Outcome codes per board
+STALLED, SOLVED, INVALID = 0, 1, -1
+
+
+def to_array(boards: Iterable[str]) -> np.ndarray:
+    """Stack 81-digit board strings into an (N, 81) uint8 array"""
+    data = ''.join(boards).encode('ascii')
+    return (np.frombuffer(data, dtype=np.uint8) - ord('0')).reshape(-1, 81)
+
+
+def to_strings(boards: np.ndarray) -> List[str]:
+    """Inverse of to_array"""
+    return [row.tobytes().decode('ascii') for row in boards + ord('0')]
+
+
+def _cell_union(unit_masks: np.ndarray) -> np.ndarray:
+    """OR the masks of each cell's three units: (N, 27) -> (N, 81)"""
+    return (unit_masks[:, CELL_UNITS[:, 0]] | unit_masks[:, CELL_UNITS[:, 1]]
+            | unit_masks[:, CELL_UNITS[:, 2]])
+
+
+def _candidates(boards: np.ndarray):
+    """Per-unit cell bits, per-unit placed masks and per-cell candidate masks"""
+    unit_cells = BIT[boards][:, UNIT_CELLS]
+    placed = np.bitwise_or.reduce(unit_cells, axis=2)
+    candidates = np.where(boards == 0, ALL & ~_cell_union(placed), 0).astype(np.uint16)
+    return unit_cells, placed, candidates
+
+
+def propagate(boards: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fill every board as far as naked and hidden singles go.
+
+    Returns ``(filled, outcome, hardest)``: the propagated boards (a copy),
+    SOLVED/STALLED/INVALID per board, and the index into
+    utils.solver.TECHNIQUES of the hardest technique used (0 for naked
+    singles only, 1 if hidden singles were needed, 2 for stalled boards).
+    """
+    boards = np.array(boards, dtype=np.uint8, copy=True)
+    outcome = np.full(len(boards), STALLED, dtype=np.int8)
+    hardest = np.zeros(len(boards), dtype=np.int8)
+    active = np.arange(len(boards))
+
+    while len(active):
+        current = boards[active]
+        empty = current == 0
+        unit_cells, placed, candidates = _candidates(current)
+        options = POPCOUNT[candidates]
+
+        # A repeated digit leaves fewer bits than filled cells in its unit
+        invalid = (
+            (POPCOUNT[placed] != (unit_cells > 0).sum(axis=2)).any(axis=1)
+            | (empty & (options == 0)).any(axis=1)
+        )
+        solved = ~empty.any(axis=1) & ~invalid
+
+        naked = empty & (options == 1)
+        has_naked = naked.any(axis=1) & ~invalid
+        naked &= has_naked[:, None]
+        current[naked] = DIGIT_OF[candidates[naked]]
+
+        has_hidden = np.zeros(len(active), dtype=bool)
+        rows = np.flatnonzero(~has_naked & ~invalid & ~solved)
+        if len(rows):
+            unit_candidates = candidates[rows][:, UNIT_CELLS]
+            once = np.zeros((len(rows), 27), dtype=np.uint16)
+            twice = np.zeros_like(once)
+            for slot in range(9):
+                mask = unit_candidates[:, :, slot]
+                twice |= once & mask
+                once |= mask
+            # A digit with no place left in a unit
+            dead = ((once | placed[rows]) != ALL).any(axis=1)
+            hidden = candidates[rows] & _cell_union(once & ~twice)
+            clash = (POPCOUNT[hidden] > 1).any(axis=1)
+            invalid[rows] |= dead | clash
+            found = hidden.any(axis=1) & ~dead & ~clash
+            if found.any():
+                targets = current[rows[found]]
+                cells = hidden[found]
+                filled = cells > 0
+                targets[filled] = DIGIT_OF[cells[filled]]
+                current[rows[found]] = targets
+                has_hidden[rows[found]] = True
+                hardest[active[rows[found]]] = 1
+
+        boards[active] = current
+        outcome[active[solved]] = SOLVED
+        outcome[active[invalid]] = INVALID
+        stalled = ~has_naked & ~has_hidden & ~solved & ~invalid
+        hardest[active[stalled]] = 2
+        active = active[has_naked | has_hidden]
+
+    return boards, outcome, hardest
+
+
+def rate_batch(puzzles: List[str]) -> List[Optional[str]]:
+    """rate_puzzle for many puzzles: the hardest technique needed, or None if contradictory"""
+    _, outcome, hardest = propagate(to_array(puzzles))
+    return [None if code == INVALID else TECHNIQUES[level] for code, level in zip(outcome, hardest)]
+
+
+def count_solutions_batch(boards: np.ndarray, limit: int = 2,
+                          max_batch: int = 20000) -> Tuple[np.ndarray, np.ndarray]:
+    """Count each board's solutions (up to ``limit``) with a vectorised search.
+
+    Boards are propagated; every stalled board is split on its cell with
+    the fewest candidates and the children are propagated together. The
+    newest children are searched first (depth first over batches of at
+    most ``max_batch`` boards), so boards with many solutions reach
+    ``limit`` quickly and memory stays bounded. Returns ``(counts, first)``
+    where ``first`` holds the first solution found per board (zeros when
+    there is none).
+    """
+    count = len(boards)
+    counts = np.zeros(count, dtype=np.int32)
+    first = np.zeros((count, 81), dtype=np.uint8)
+    stack = [(boards, np.arange(count))]
+    while stack:
+        boards, origin = stack.pop()
+        open_origin = counts[origin] < limit
+        boards, origin = boards[open_origin], origin[open_origin]
+        if not len(boards):
+            continue
+        filled, outcome, _ = propagate(boards)
+        solved = outcome == SOLVED
+        for board, source in zip(filled[solved], origin[solved]):
+            if counts[source] == 0:
+                first[source] = board
+            counts[source] += 1
+
+        stalled = (outcome == STALLED) & (counts[origin] < limit)
+        boards, origin = filled[stalled], origin[stalled]
+        if not len(boards):
+            continue
+        _, _, candidates = _candidates(boards)
+        options = np.where(candidates > 0, POPCOUNT[candidates], 10)
+        cells = options.argmin(axis=1)
+        masks = candidates[np.arange(len(boards)), cells]
+        children, child_origin = [], []
+        for digit in range(1, 10):
+            branch = (masks & BIT[digit]) > 0
+            if branch.any():
+                child = boards[branch].copy()
+                child[np.arange(len(child)), cells[branch]] = digit
+                children.append(child)
+                child_origin.append(origin[branch])
+        children = np.concatenate(children)
+        child_origin = np.concatenate(child_origin)
+        for offset in range(0, len(children), max_batch):
+            stack.append((children[offset:offset + max_batch], child_origin[offset:offset + max_batch]))
+    return np.minimum(counts, limit), first
+
+
+def validate_batch(puzzles: List[str], solutions: List[str]) -> Tuple[List[bool], List[Optional[str]]]:
+    """Check stored puzzles have exactly one solution, equal to the stored one, and rate them.
+
+    Returns ``(valid, ratings)`` lists aligned with the input. Boards that
+    singles solve are checked against their solution directly; the rest
+    are counted with count_solutions_batch.
+    """
+    filled, outcome, hardest = propagate(to_array(puzzles))
+    expected = to_array(solutions)
+    valid = (outcome == SOLVED) & (filled == expected).all(axis=1)
+    residue = np.flatnonzero(outcome == STALLED)
+    if len(residue):
+        counts, first = count_solutions_batch(filled[residue])
+        valid[residue] = (counts == 1) & (first == expected[residue]).all(axis=1)
+    ratings = [None if code == INVALID else TECHNIQUES[level] for code, level in zip(outcome, hardest)]
+    return valid.tolist(), ratings
+
+
+def verify_batch(boards: List[str], puzzles: List[str]) -> List[bool]:
+    """utils.solver.is_solved for many boards: every unit mask is ALL and the givens are kept.
+
+    Boards and puzzles must already be 81-character digit strings.
+    """
+    filled, givens = to_array(boards), to_array(puzzles)
+    placed = np.bitwise_or.reduce(BIT[filled][:, UNIT_CELLS], axis=2)
+    valid = (placed == ALL).all(axis=1) & ((givens == 0) | (givens == filled)).all(axis=1)
+    return valid.tolist()
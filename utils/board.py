@@ -0,0 +1,159 @@
+"""Shared board representation and cell index tables.
+
+Cells are numbered 0-80 row by row. Units are the 9 rows, then the 9
+columns, then the 9 boxes, and every table below is computed once at
+import so callers never redo ``3 * (row // 3)`` arithmetic. Digits are
+stored as bits (digit ``d`` is ``1 << (d - 1)``) wherever sets of them
+are needed.
+"""
+from typing import List, Optional
+
+ALL = 0x1FF
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [3 * (i // 27) + (i % 9) // 3 for i in range(81)]
+
+ROWS = [[r * 9 + c for c in range(9)] for r in range(9)]
+COLS = [[r * 9 + c for r in range(9)] for c in range(9)]
+BOXES = [
+    [(3 * (b // 3) + r) * 9 + 3 * (b % 3) + c for r in range(3) for c in range(3)]
+    for b in range(9)
+]
+UNITS = ROWS + COLS + BOXES
+
+# The 20 cells sharing a row, column or box with each cell
+PEERS = [
+    sorted(set(ROWS[ROW_OF[i]] + COLS[COL_OF[i]] + BOXES[BOX_OF[i]]) - {i})
+    for i in range(81)
+]
+
+# (row, column, box) unit numbers of every cell, indexing UNITS
+CELL_UNITS = [(ROW_OF[i], 9 + COL_OF[i], 18 + BOX_OF[i]) for i in range(81)]
+
+# Position of every cell within its row, column and box
+CELL_SLOTS = [(COL_OF[i], ROW_OF[i], 3 * (ROW_OF[i] % 3) + COL_OF[i] % 3) for i in range(81)]
+
+# Bit of each digit character; anything else (including '0') is 0
+DIGIT_BITS = {str(d): 1 << (d - 1) for d in range(1, 10)}
+
+# Byte translation tables between '0'-'9' (or '.') and cell values 0-9
+_INVALID = 0xFF
+_DECODE = bytearray([_INVALID]) * 256
+for _digit in range(10):
+    _DECODE[ord('0') + _digit] = _digit
+_DECODE[ord('.')] = 0
+_DECODE = bytes(_DECODE)
+_ENCODE = bytes(range(ord('0'), ord('0') + 10)) + bytes(246)
+
+
+class BoardError(ValueError):
+    """A board string of the wrong length or with characters other than digits"""
+
+    def __init__(self, message: str, characters: List[str] = ()):
+        super().__init__(message)
+        self.characters = list(characters)
+
+
+class Board:
+    """81 cells in a bytearray, plus candidate bitmasks once computed.
+
+    ``candidates[i]`` has bit ``d - 1`` set when digit ``d`` can go in
+    empty cell ``i`` (0 for filled cells); it is None until
+    compute_candidates() is called, so parsing alone stays cheap.
+    clone() shares the buffers until either board is modified.
+    """
+    __slots__ = ('cells', 'candidates', '_shared')
+
+    def __init__(self, cells: bytearray, candidates: Optional[List[int]] = None):
+        self.cells = cells
+        self.candidates = candidates
+        self._shared = False
+
+    @classmethod
+    def parse(cls, text: str, complete: bool = False) -> 'Board':
+        """Build a board from an 81-character string ('0' or '.' for empty cells).
+
+        Length and characters are checked in one pass over the bytes. With
+        ``complete``, empty cells are rejected too. Raises BoardError.
+        """
+        if not isinstance(text, str):
+            raise BoardError("Board must be a string")
+        data = text.encode('ascii', 'replace')
+        if len(data) != 81:
+            raise BoardError("Board must contain exactly 81 cells")
+        cells = bytearray(data.translate(_DECODE))
+        if _INVALID in cells or (complete and 0 in cells):
+            bad = sorted({char for char, value in zip(text, cells)
+                          if value == _INVALID or (complete and value == 0)})
+            raise BoardError(f"Invalid characters: {', '.join(bad)}", bad)
+        return cls(cells)
+
+    def __str__(self) -> str:
+        return self.cells.translate(_ENCODE).decode('ascii')
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def compute_candidates(self) -> List[int]:
+        """Fill in ``candidates`` from the placed digits (idempotent)"""
+        if self.candidates is None:
+            rows = [0] * 9
+            cols = [0] * 9
+            boxes = [0] * 9
+            for i, digit in enumerate(self.cells):
+                if digit:
+                    bit = 1 << (digit - 1)
+                    rows[ROW_OF[i]] |= bit
+                    cols[COL_OF[i]] |= bit
+                    boxes[BOX_OF[i]] |= bit
+            self.candidates = [
+                0 if digit else ALL & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                for i, digit in enumerate(self.cells)
+            ]
+        return self.candidates
+
+    def has_duplicates(self) -> bool:
+        """True if a digit appears twice in a row, column or box"""
+        seen = [0] * 27
+        for i, digit in enumerate(self.cells):
+            if digit:
+                bit = 1 << (digit - 1)
+                for unit in CELL_UNITS[i]:
+                    if seen[unit] & bit:
+                        return True
+                    seen[unit] |= bit
+        return False
+
+    def agrees_with(self, other: 'Board') -> bool:
+        """True if every filled cell holds the same digit in ``other``"""
+        return all(not digit or digit == expected for digit, expected in zip(self.cells, other.cells))
+
+    def empty_cells(self) -> List[int]:
+        return [i for i, digit in enumerate(self.cells) if not digit]
+
+    def clone(self) -> 'Board':
+        """Copy-on-write copy: the buffers are only duplicated when one side is modified"""
+        clone = object.__new__(type(self))
+        clone.cells = self.cells
+        clone.candidates = self.candidates
+        clone._shared = self._shared = True
+        return clone
+
+    def _own(self):
+        """Stop sharing buffers with clones before a modification"""
+        if self._shared:
+            self.cells = self.cells[:]
+            if self.candidates is not None:
+                self.candidates = self.candidates[:]
+            self._shared = False
+
+    def place(self, index: int, digit: int):
+        """Fill a cell, removing the digit from its peers' candidates if they are computed"""
+        self._own()
+        self.cells[index] = digit
+        if self.candidates is not None:
+            self.candidates[index] = 0
+            mask = ~(1 << (digit - 1))
+            for peer in PEERS[index]:
+                self.candidates[peer] &= mask
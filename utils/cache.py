@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.generator import canonical_form, transform_hint
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+
+class MemoryBackend:
+    """In-process cache store bounded by entry count and total value size.
+
+    Values are stored as JSON strings so their size is known and callers
+    never share mutable objects. With the 'lru' policy reads refresh an
+    entry; with 'fifo' entries are evicted in insertion order.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 16 * 1024 * 1024,
+                 ttl: Optional[float] = 3600, eviction: str = 'lru'):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.eviction = eviction
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.time():
+                self._remove(key)
+                return None
+            if self.eviction == 'lru':
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        expires = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes}
+
+
+class SQLiteBackend:
+    """Cache store in a local SQLite file shared by all worker processes.
+
+    Stands in for an external shared cache: every gunicorn worker opening
+    the same file sees the same entries. Limits and eviction behave like
+    MemoryBackend, but are checked every ``EVICT_CHECK_INTERVAL`` writes
+    per process (counting rows is a table scan), so the store can briefly
+    overshoot them.
+    """
+
+    EVICT_CHECK_INTERVAL = 64
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 16 * 1024 * 1024,
+                 ttl: Optional[float] = 3600, eviction: str = 'lru'):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.eviction = eviction
+        self._writes = 0
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires REAL, used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_used ON cache (used)")
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        now = time.time()
+        if expires is not None and expires < now:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        if self.eviction == 'lru':
+            conn.execute("UPDATE cache SET used = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, key: str, value: str):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, expires, used) VALUES (?, ?, ?, ?, ?)",
+            (key, value, size, expires, now)
+        )
+        self._writes += 1
+        if self._writes % self.EVICT_CHECK_INTERVAL:
+            return
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        if entries > self.max_entries or total > self.max_bytes:
+            self._evict(conn, entries, total)
+
+    def _evict(self, conn, entries, total):
+        conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        excess_entries = entries - self.max_entries
+        rows = conn.execute("SELECT key, size FROM cache ORDER BY used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if excess_entries <= 0 and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            excess_entries -= 1
+            total -= size
+        conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def stats(self) -> Dict:
+        entries, total = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        return {'entries': entries, 'bytes': total}
+
+
+def create_backend(name: str, **options):
+    """Build a cache backend by name ('memory' or 'sqlite')"""
+    if name == 'memory':
+        options.pop('path', None)
+        return MemoryBackend(**options)
+    if name == 'sqlite':
+        return SQLiteBackend(**options)
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+class HintCache:
+    """Cache of hint analyses keyed by a hash of (current_state, solution).
+
+    With ``canonical`` boards are keyed by their symmetry canonical form
+    and hints are stored in canonical coordinates, so one analysis serves
+    every relabelled, reflected or shuffled copy of a board. Computing the
+    canonical form takes a few milliseconds, more than most analyses, so
+    it only pays off when many players share equivalent boards. Hit and
+    miss counts are tracked per process; size figures come from the
+    backend and are shared when the backend is.
+    """
+
+    def __init__(self, backend, canonical: bool = False):
+        self.backend = backend
+        self.canonical = canonical
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(current_state: str, solution: str) -> str:
+        return hashlib.blake2b(f"{current_state}:{solution}".encode(), digest_size=16).hexdigest()
+
+    def get_or_compute(self, current_state: str, solution: str,
+                       compute: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Return the cached hint for a board, computing and storing it on a miss.
+
+        A hint cut short by the time budget (``complete`` False) is returned
+        but not stored, so a later request can find the best one.
+        """
+        transform = None
+        if self.canonical:
+            current_state, solution, transform = canonical_form(current_state, solution)
+        key = self.make_key(current_state, solution)
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            hint = json.loads(cached)
+            return transform_hint(hint, transform.inverse()) if transform else hint
+
+        with self._lock:
+            self.misses += 1
+        hint = compute()
+        if hint is not None and hint.get('complete', True):
+            self.backend.set(key, json.dumps(transform_hint(hint, transform) if transform else hint))
+        return hint
+
+    def get_or_compute_path(self, current_state: str, solution: str, max_steps: int,
+                            compute: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return up to ``max_steps`` hints in solving order, cached like get_or_compute.
+
+        A cached path serves any request for as many steps or fewer, and
+        any request at all once it ends where no further hint exists. Its
+        first hint is also stored under the board's own key, so /hint and
+        /hint/path share their analyses.
+        """
+        transform = None
+        if self.canonical:
+            current_state, solution, transform = canonical_form(current_state, solution)
+        key = self.make_key(current_state, solution)
+        cached = self.backend.get(key + ':path')
+        if cached is not None:
+            entry = json.loads(cached)
+            if entry['exhausted'] or len(entry['hints']) >= max_steps:
+                with self._lock:
+                    self.hits += 1
+                hints = entry['hints'][:max_steps]
+                return [transform_hint(hint, transform.inverse()) for hint in hints] if transform else hints
+
+        with self._lock:
+            self.misses += 1
+        path = compute()
+        stored = [transform_hint(hint, transform) for hint in path] if transform else path
+        # solving_path has no time budget, so a path is only short when no hint is left
+        self.backend.set(key + ':path', json.dumps({'hints': stored, 'exhausted': len(path) < max_steps}))
+        if stored and self.backend.get(key) is None:
+            self.backend.set(key, json.dumps(dict(stored[0], complete=True)))
+        return path
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        stats = {
+            'backend': type(self.backend).__name__,
+            'canonical': self.canonical,
+            'eviction': self.backend.eviction,
+            'max_entries': self.backend.max_entries,
+            'max_bytes': self.backend.max_bytes,
+            'ttl': self.backend.ttl,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else None
+        }
+        stats.update(self.backend.stats())
+        return stats
@@ -0,0 +1,74 @@
+"""Compact binary encoding of boards for storage and transport.
+
+A board (81 digits, '0' for empty) packs two digits per byte, 41 bytes
+in all. A game (puzzle plus solution) is stored as the packed solution
+followed by an 81-bit mask of which cells are clues: 41 + 11 = 52 bytes
+instead of two 81-character strings. For JSON the game bytes are
+base64url encoded (70 characters).
+"""
+import base64
+from typing import Tuple
+
+BOARD_BYTES = 41
+MASK_BYTES = 11
+GAME_BYTES = BOARD_BYTES + MASK_BYTES
+
+_DIGITS = frozenset('0123456789')
+
+
+def _check_board(board: str):
+    if len(board) != 81 or not _DIGITS.issuperset(board):
+        raise ValueError("Board must be 81 digits")
+
+
+def pack_board(board: str) -> bytes:
+    """Pack an 81-digit board into 41 bytes, one digit per nibble"""
+    _check_board(board)
+    # Digits are valid hex characters, so hex decoding is exactly nibble packing
+    return bytes.fromhex(board + '0')
+
+
+def unpack_board(data: bytes) -> str:
+    """Inverse of pack_board"""
+    if len(data) != BOARD_BYTES:
+        raise ValueError(f"Packed board must be {BOARD_BYTES} bytes")
+    return data.hex()[:81]
+
+
+def pack_game(puzzle: str, solution: str) -> bytes:
+    """Pack a puzzle and its solution into 52 bytes.
+
+    Every clue in ``puzzle`` must match ``solution``, since clues are
+    stored only as a mask over the solution.
+    """
+    _check_board(puzzle)
+    packed = pack_board(solution)
+    mask = 0
+    for given, answer in zip(puzzle, solution):
+        mask <<= 1
+        if given != '0':
+            if given != answer:
+                raise ValueError("Puzzle clues must match the solution")
+            mask |= 1
+    return packed + mask.to_bytes(MASK_BYTES, 'big')
+
+
+def unpack_game(data: bytes) -> Tuple[str, str]:
+    """Inverse of pack_game, returning (puzzle, solution)"""
+    if len(data) != GAME_BYTES:
+        raise ValueError(f"Packed game must be {GAME_BYTES} bytes")
+    solution = unpack_board(data[:BOARD_BYTES])
+    clues = format(int.from_bytes(data[BOARD_BYTES:], 'big'), '081b')
+    puzzle = ''.join(answer if clue == '1' else '0' for clue, answer in zip(clues, solution))
+    return puzzle, solution
+
+
+def encode_game(puzzle: str, solution: str) -> str:
+    """Pack a game into a URL-safe base64 string for JSON responses"""
+    return base64.urlsafe_b64encode(pack_game(puzzle, solution)).decode('ascii').rstrip('=')
+
+
+def decode_game(text: str) -> Tuple[str, str]:
+    """Inverse of encode_game"""
+    padded = text + '=' * (-len(text) % 4)
+    return unpack_game(base64.urlsafe_b64decode(padded))
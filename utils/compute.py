@@ -0,0 +1,197 @@
+"""Process pool for the CPU-bound work behind web requests.
+
+Puzzle generation and hint analysis hold the GIL from a fraction of a
+millisecond up to seconds. Run in the request thread, that stalls every
+other request the worker is serving. ComputePool sends them to a pool of
+worker processes that is started ahead of time:
+
+- At most ``max_pending`` calls are queued or running at once. Further
+  calls raise ComputeBusy straight away rather than queueing.
+- call() waits up to ``timeout`` seconds, then raises ComputeTimeout. A
+  call that is still queued is cancelled. One that reaches a worker
+  after its deadline is skipped there. A call that is already running
+  cannot be interrupted and keeps its worker busy until it returns, so
+  long-running functions should also take their own time budget.
+- Queue wait and run time are recorded separately per task. Waits that
+  grow while run times stay flat mean the pool is saturated; run times
+  that grow mean the work itself got slower. Metrics the function
+  records in the worker (e.g. hint and generator stage timings) are
+  handed back with the result and recorded in the calling process.
+
+With ``workers=0`` calls run inline in the calling thread and cannot
+time out.
+"""
+import atexit
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from utils import metrics
+from utils.metrics import COMPUTE_CALLS, COMPUTE_RUN, COMPUTE_WAIT
+
+
+class ComputeBusy(RuntimeError):
+    """The pool already holds ``max_pending`` calls"""
+
+
+class ComputeTimeout(TimeoutError):
+    """A call did not finish within its timeout"""
+
+
+def _run(func: Callable, args: tuple, deadline: Optional[float]):
+    """Worker entry point: skip calls whose caller already gave up, else run and time them"""
+    started = time.time()
+    if deadline is not None and started > deadline:
+        raise ComputeTimeout("Call expired while queued")
+    result = func(*args)
+    return result, started, time.time(), metrics.drain()
+
+
+def _ready():
+    return None
+
+
+class ComputePool:
+    """Bounded, warm process pool with per-call timeouts (see module docstring)"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, timeout: Optional[float] = 10.0):
+        self.workers = workers
+        self.max_pending = max(max_pending, 1)
+        self.timeout = timeout
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._registered = False
+        self._started = False
+        self._starting = []
+
+    def start(self, wait: bool = False):
+        """Start the worker processes now rather than on the first call (once).
+
+        With ``wait``, also wait until they are up, even if an earlier call
+        started them without waiting.
+        """
+        if not self._started:
+            with self._lock:
+                first = self.workers > 0 and not self._started
+                self._started = True
+            if first:
+                executor = self._get_executor()
+                self._starting = [executor.submit(_ready) for _ in range(self.workers)]
+        if wait:
+            for future in self._starting:
+                future.result()
+
+    def call(self, task: str, func: Callable, *args, timeout: Optional[float] = None):
+        """Run ``func(*args)`` in a worker and return its result.
+
+        ``task`` labels the call in the metrics. Raises ComputeBusy,
+        ComputeTimeout, or whatever ``func`` raised.
+        """
+        if self.workers <= 0:
+            return self._call_inline(task, func, args)
+        timeout = self.timeout if timeout is None else timeout
+        future = self._submit(task, func, args, timeout)
+        try:
+            result = future.result(timeout)[0]
+        except TimeoutError:
+            future.cancel()
+            COMPUTE_CALLS.inc(task=task, outcome='timeout')
+            raise ComputeTimeout(f"{task} did not finish within {timeout}s")
+        except Exception:
+            COMPUTE_CALLS.inc(task=task, outcome='error')
+            raise
+        COMPUTE_CALLS.inc(task=task, outcome='ok')
+        return result
+
+    def _call_inline(self, task: str, func: Callable, args: tuple):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception:
+            COMPUTE_CALLS.inc(task=task, outcome='error')
+            raise
+        COMPUTE_RUN.observe(time.perf_counter() - start, task=task)
+        COMPUTE_CALLS.inc(task=task, outcome='ok')
+        return result
+
+    def _submit(self, task: str, func: Callable, args: tuple, timeout: Optional[float]):
+        with self._lock:
+            busy = self._pending >= self.max_pending
+            if not busy:
+                self._pending += 1
+        if busy:
+            COMPUTE_CALLS.inc(task=task, outcome='rejected')
+            raise ComputeBusy(f"Compute pool is full ({self.max_pending} calls queued or running)")
+
+        submitted = time.time()
+        deadline = None if timeout is None else submitted + timeout
+        executor = self._get_executor()
+        try:
+            try:
+                future = executor.submit(_run, func, args, deadline)
+            except BrokenProcessPool:
+                # A worker died; replace the pool once
+                self._discard(executor)
+                executor = self._get_executor()
+                future = executor.submit(_run, func, args, deadline)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(lambda f: self._on_done(task, submitted, executor, f))
+        return future
+
+    def _on_done(self, task: str, submitted: float, executor: ProcessPoolExecutor, future):
+        with self._lock:
+            self._pending -= 1
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            _, started, finished, recorded = future.result()
+            metrics.merge(recorded)
+            COMPUTE_WAIT.observe(max(started - submitted, 0.0), task=task)
+            COMPUTE_RUN.observe(finished - started, task=task)
+        elif isinstance(error, BrokenProcessPool):
+            self._discard(executor)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so that forking servers start the pool in each worker
+        # after the fork rather than sharing one inherited from the master.
+        with self._lock:
+            if self._executor is None:
+                # Workers keep their metrics local; _run hands them back
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=metrics.configure, initargs=(None,)
+                )
+                if not self._registered:
+                    atexit.register(self.shutdown)
+                    self._registered = True
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        """Configuration and current queue depth; wait and run times are in /metrics"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'timeout': self.timeout,
+                'running': self._executor is not None
+            }
@@ -0,0 +1,139 @@
+import random
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from app import app, db
+from models import DailyPuzzle, Game, insert_ignoring_conflicts
+from utils.background import PeriodicJob
+from utils.generator import generate_puzzle
+
+# Daily puzzles already loaded by this process, keyed by date. Rows never
+# change once created, so entries only leave the cache when they get old.
+_cache = {}
+_lock = threading.Lock()
+
+# ComputePool that generates new daily puzzles (see use_compute_pool); inline when None
+_compute = None
+
+
+def use_compute_pool(pool):
+    """Generate new daily puzzles in ``pool`` (a utils.compute.ComputePool) instead of inline"""
+    global _compute
+    _compute = pool
+
+
+def current_date() -> date:
+    """The date whose puzzle is served as today's challenge"""
+    return datetime.now().date()
+
+
+def _payload(daily_puzzle: DailyPuzzle) -> Dict:
+    return {
+        'game_id': daily_puzzle.game_id,
+        'puzzle': daily_puzzle.puzzle,
+        'solution': daily_puzzle.solution,
+        'difficulty': daily_puzzle.difficulty,
+        'date': daily_puzzle.puzzle_date.strftime('%Y-%m-%d')
+    }
+
+
+def _load_or_create(day: date) -> Dict:
+    """Read a day's puzzle, creating it if missing, without racing other workers.
+
+    A new puzzle and its Game row are inserted in one transaction with
+    ON CONFLICT DO NOTHING on puzzle_date; if another worker won the race
+    the transaction is rolled back (dropping the unused Game row) and the
+    winner's row is read instead.
+    """
+    query = select(DailyPuzzle).where(DailyPuzzle.puzzle_date == day)
+    daily_puzzle = db.session.execute(query).scalar_one_or_none()
+
+    if daily_puzzle is None:
+        difficulty = random.choice(['easy', 'medium', 'hard'])
+        if _compute is not None:
+            puzzle, solution = _compute.call('daily', generate_puzzle, difficulty)
+        else:
+            puzzle, solution = generate_puzzle(difficulty)
+        game = Game(puzzle=puzzle, solution=solution, difficulty=difficulty)
+        db.session.add(game)
+        db.session.flush()
+        inserted = db.session.execute(insert_ignoring_conflicts(DailyPuzzle, [{
+            'puzzle_date': day,
+            'board': (puzzle, solution),
+            'difficulty': difficulty,
+            'created_at': datetime.utcnow(),
+            'game_id': game.id
+        }], ['puzzle_date'])).rowcount
+        if inserted:
+            db.session.commit()
+            app.logger.info(f"Created daily puzzle for {day} with difficulty: {difficulty}")
+        else:
+            db.session.rollback()
+        daily_puzzle = db.session.execute(query).scalar_one()
+
+    if daily_puzzle.game_id is None:
+        # Rows created before games were persisted get a Game on first use
+        game = Game(puzzle=daily_puzzle.puzzle, solution=daily_puzzle.solution,
+                    difficulty=daily_puzzle.difficulty)
+        db.session.add(game)
+        db.session.flush()
+        linked = db.session.execute(
+            update(DailyPuzzle)
+            .where(DailyPuzzle.id == daily_puzzle.id, DailyPuzzle.game_id.is_(None))
+            .values(game_id=game.id)
+        ).rowcount
+        if linked:
+            db.session.commit()
+        else:
+            db.session.rollback()
+        db.session.refresh(daily_puzzle)
+
+    return _payload(daily_puzzle)
+
+
+def get_daily_puzzle(day: Optional[date] = None) -> Dict:
+    """Return a day's puzzle (today's by default), served from memory after the first load"""
+    if day is None:
+        day = current_date()
+    payload = _cache.get(day)
+    if payload is not None:
+        return payload
+
+    # One loader per process; the others wait and then read the cache
+    with _lock:
+        payload = _cache.get(day)
+        if payload is None:
+            payload = _load_or_create(day)
+            _cache[day] = payload
+            for cached_day in [d for d in _cache if d < day - timedelta(days=1)]:
+                del _cache[cached_day]
+    return payload
+
+
+def pregenerate(days: int, start: Optional[date] = None) -> List[str]:
+    """Make sure puzzles exist for ``days`` days from ``start`` (today by default).
+
+    Loaded puzzles are cached, so tomorrow's puzzle is already in memory
+    when the date changes. Returns the dates handled.
+    """
+    if start is None:
+        start = current_date()
+    handled = []
+    for offset in range(days):
+        handled.append(get_daily_puzzle(start + timedelta(days=offset))['date'])
+    return handled
+
+
+class DailyPuzzleScheduler(PeriodicJob):
+    """Background thread that keeps the next few days' puzzles generated"""
+    name = 'daily-puzzle-scheduler'
+
+    def __init__(self, days: int, interval: float):
+        super().__init__(interval)
+        self.days = days
+
+    def run_once(self):
+        pregenerate(self.days)
@@ -1,27 +1,172 @@
-import os
-import psycopg2
-from psycopg2.extras import DictCursor
+"""Raw SQL helpers on top of the application's pooled SQLAlchemy engine.
 
+Queries use the driver's own parameter style (``%s`` for psycopg2, ``?``
+for sqlite3) and borrow connections from the same pool as the ORM, which
+is configured by the ``DB_POOL_*`` settings in app.py.
+"""
+import csv
+import io
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Sequence
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app import app, db
+
+_metrics = {
+    'checkouts': 0,
+    'timeouts': 0,
+    'wait_seconds': 0.0,
+    'max_wait_seconds': 0.0
+}
+_metrics_lock = threading.Lock()
+
+
+@contextmanager
 def get_db_connection():
-    """Create a database connection using environment variables"""
-    return psycopg2.connect(
-        dbname=os.environ.get('PGDATABASE'),
-        user=os.environ.get('PGUSER'),
-        password=os.environ.get('PGPASSWORD'),
-        host=os.environ.get('PGHOST'),
-        port=os.environ.get('PGPORT')
-    )
+    """Borrow a connection from the pool, recording how long the wait took"""
+    start = time.perf_counter()
+    try:
+        conn = db.engine.connect()
+    except PoolTimeoutError:
+        with _metrics_lock:
+            _metrics['timeouts'] += 1
+        raise
+    waited = time.perf_counter() - start
+    with _metrics_lock:
+        _metrics['checkouts'] += 1
+        _metrics['wait_seconds'] += waited
+        _metrics['max_wait_seconds'] = max(_metrics['max_wait_seconds'], waited)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
 
 def execute_sql(query, params=None, fetchall=True):
-    """Execute SQL query and return results"""
+    """Execute SQL query and return results.
+
+    Statements that produce rows return them as dicts (all of them, or the
+    first one with ``fetchall=False``); anything else is committed and
+    returns None.
+    """
+    try:
+        with get_db_connection() as conn:
+            result = conn.exec_driver_sql(query, params or ())
+            if result.returns_rows:
+                rows = result.mappings()
+                if fetchall:
+                    return [dict(row) for row in rows]
+                row = rows.first()
+                return dict(row) if row is not None else None
+            conn.commit()
+            return None
+    except Exception as e:
+        app.logger.error(f"Database error: {str(e)}")
+        raise
+
+
+def executemany(query: str, rows: Sequence[Sequence]) -> int:
+    """Run one statement for every parameter row in a single transaction.
+
+    Returns the number of rows affected where the driver reports it.
+    On error nothing is committed, and the error is logged and re-raised.
+    """
+    if not rows:
+        return 0
+    try:
+        with get_db_connection() as conn:
+            result = conn.exec_driver_sql(query, list(rows))
+            conn.commit()
+            return result.rowcount
+    except Exception as e:
+        app.logger.error(f"executemany of {len(rows)} rows failed: {str(e)}")
+        raise
+
+
+def copy_rows(table: str, columns: Sequence[str], rows: Iterable[Sequence], batch_size: int = 1000) -> int:
+    """Bulk-load rows into a table.
+
+    On PostgreSQL the rows are streamed through ``COPY ... FROM STDIN`` in
+    batches of ``batch_size``; other databases fall back to batched
+    executemany inserts. Everything is loaded in one transaction. Returns
+    the number of rows loaded; on error nothing is loaded, and the error
+    is logged and re-raised.
+    """
+    preparer = db.engine.dialect.identifier_preparer
+    target = preparer.quote(table)
+    column_list = ', '.join(preparer.quote(column) for column in columns)
+    postgres = db.engine.dialect.name == 'postgresql'
+    if postgres:
+        statement = f"COPY {target} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    else:
+        placeholders = ', '.join('?' if db.engine.dialect.paramstyle == 'qmark' else '%s' for _ in columns)
+        statement = f"INSERT INTO {target} ({column_list}) VALUES ({placeholders})"
+
+    loaded = 0
     try:
         with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                cur.execute(query, params)
-                if query.strip().upper().startswith('SELECT'):
-                    return cur.fetchall() if fetchall else cur.fetchone()
-                conn.commit()
-                return None
+            cursor = conn.connection.dbapi_connection.cursor() if postgres else None
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    loaded += _load_batch(conn, cursor, statement, batch)
+                    batch = []
+            if batch:
+                loaded += _load_batch(conn, cursor, statement, batch)
+            conn.commit()
     except Exception as e:
-        print(f"Database error: {e}")
+        app.logger.error(f"Bulk load into {table} failed after {loaded} rows, rolled back: {str(e)}")
         raise
+    return loaded
+
+
+def _load_batch(conn, cursor, statement, batch) -> int:
+    if cursor is None:
+        conn.exec_driver_sql(statement, batch)
+        return len(batch)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(batch)
+    buffer.seek(0)
+    cursor.copy_expert(statement, buffer)
+    return len(batch)
+
+
+def stream_sql(query: str, params=None, batch_size: int = 1000) -> Iterator[Dict]:
+    """Yield the rows of a large query as dicts without loading them all.
+
+    On PostgreSQL this uses a server-side cursor fetching ``batch_size``
+    rows at a time. The connection stays checked out until the generator
+    is exhausted or closed.
+    """
+    with get_db_connection() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).exec_driver_sql(
+            query, params or ()
+        )
+        for row in result.mappings():
+            yield dict(row)
+
+
+def pool_stats() -> Dict:
+    """Current pool occupancy plus checkout counts and waits for this process"""
+    pool = db.engine.pool
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    capacity = app.config['DB_POOL_MAX_SIZE']
+    checked_out = pool.checkedout() if hasattr(pool, 'checkedout') else None
+    stats = {
+        'pool': type(pool).__name__,
+        'min_size': app.config['DB_POOL_MIN_SIZE'],
+        'max_size': capacity,
+        'timeout': app.config['DB_POOL_TIMEOUT'],
+        'checked_out': checked_out,
+        'idle': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+        'overflow': pool.overflow() if hasattr(pool, 'overflow') else None,
+        'utilisation': checked_out / capacity if checked_out is not None and capacity else None,
+        'avg_wait_seconds': metrics['wait_seconds'] / metrics['checkouts'] if metrics['checkouts'] else None
+    }
+    stats.update(metrics)
+    return stats
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from app import app, db
+from models import Game
+from utils.cache import MemoryBackend
+
+# Solutions are immutable, so cached entries never go stale; the TTL only
+# keeps abandoned games from pinning memory.
+solution_cache = MemoryBackend(
+    max_entries=app.config['GAME_CACHE_MAX_ENTRIES'],
+    max_bytes=app.config['GAME_CACHE_MAX_ENTRIES'] * 81,
+    ttl=app.config['GAME_CACHE_TTL']
+)
+
+
+def create_game(puzzle: str, solution: str, difficulty: str) -> Optional[int]:
+    """Persist a game session and return its id, or None if the database is unavailable"""
+    try:
+        game = Game(puzzle=puzzle, solution=solution, difficulty=difficulty)
+        db.session.add(game)
+        db.session.commit()
+    except Exception as e:
+        app.logger.error(f"Failed to save game: {str(e)}")
+        db.session.rollback()
+        return None
+    solution_cache.set(str(game.id), solution)
+    return game.id
+
+
+def get_solution(game_id) -> Optional[str]:
+    """Look up a game's solution, from the in-process cache when possible"""
+    key = str(game_id)
+    solution = solution_cache.get(key)
+    if solution is None:
+        game = db.session.get(Game, game_id)
+        if game is None:
+            return None
+        solution = game.solution
+        solution_cache.set(key, solution)
+    return solution
@@ -1,56 +1,64 @@
+import json
+import logging
+import os
 import random
-from typing import List, Tuple, Dict
-
-def generate_puzzle(difficulty: str) -> Tuple[str, str]:
-    """Generate a Sudoku puzzle and its solution based on difficulty level"""
-    def is_valid(board, row, col, num):
-        # Check row
-        for x in range(9):
-            if board[row][x] == num:
-                return False
-        
-        # Check column
-        for x in range(9):
-            if board[x][col] == num:
-                return False
-        
-        # Check 3x3 box
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(3):
-            for j in range(3):
-                if board[i + start_row][j + start_col] == num:
-                    return False
-        return True
-
-    def solve(board):
-        for i in range(9):
-            for j in range(9):
-                if board[i][j] == 0:
-                    for num in range(1, 10):
-                        if is_valid(board, i, j, num):
-                            board[i][j] = num
-                            if solve(board):
-                                return True
-                            board[i][j] = 0
-                    return False
-        return True
-
-    # Initialize empty board
-    board = [[0 for _ in range(9)] for _ in range(9)]
-    
-    # Fill diagonal boxes
-    nums = list(range(1, 10))
-    for i in range(0, 9, 3):
-        random.shuffle(nums)
-        for j in range(3):
-            for k in range(3):
-                board[i + j][i + k] = nums[j * 3 + k]
-    
-    # Solve the board
-    solve(board)
-    
-    # Create solution string
-    solution = ''.join(str(num) for row in board for num in row)
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple, Dict
+
+from utils.board import (
+    BOX_OF, BOXES, CELL_SLOTS, CELL_UNITS, COL_OF, PEERS, ROW_OF, UNITS, Board
+)
+from utils.metrics import GENERATOR_STAGE, HINT_STAGE
+from utils.solver import TECHNIQUES, count_solutions, rate_puzzle, solve
+
+logger = logging.getLogger(__name__)
+
+# Seconds a single uniqueness-verified generation may spend retrying to hit
+# the requested difficulty before settling for the closest puzzle found.
+DEFAULT_TIME_BUDGET = 0.5
+
+# Each difficulty digs holes while the puzzle stays solvable with the
+# allowed techniques (which also proves uniqueness), down to a clue floor.
+# 'hard' digs with the bounded solution counter instead and is only
+# accepted when singles are not enough to solve it.
+DIFFICULTY_PROFILES = {
+    'easy': {'technique': 'naked_single', 'min_clues': 36},
+    'medium': {'technique': 'hidden_single', 'min_clues': 28},
+    'hard': {'technique': 'search', 'min_clues': 17}
+}
+
+RATING_DIFFICULTY = {
+    'naked_single': 'easy',
+    'hidden_single': 'medium',
+    'search': 'hard'
+}
+
+# Vetted puzzles that transformed_puzzle turns into fresh-looking variants;
+# rebuilt with `flask puzzle-bank export-seeds`
+SEED_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_puzzles.json')
+
+def generate_puzzle(difficulty: str, unique: bool = True,
+                    time_budget: float = DEFAULT_TIME_BUDGET,
+                    from_seeds: bool = False) -> Tuple[str, str]:
+    """Generate a Sudoku puzzle and its solution based on difficulty level.
+
+    With ``unique`` (the default) the puzzle is guaranteed to have exactly
+    one solution and is graded by solving technique; see
+    generate_unique_puzzle. Otherwise a fixed number of random cells is
+    removed without any checks. With ``from_seeds`` a random symmetry of a
+    vetted seed puzzle is returned instead when one is available; see
+    transformed_puzzle.
+    """
+    if from_seeds:
+        result = transformed_puzzle(difficulty)
+        if result is not None:
+            return result['puzzle'], result['solution']
+    if unique:
+        result = generate_unique_puzzle(difficulty, time_budget)
+        return result['puzzle'], result['solution']
+
+    solution = random_solution()
     
     # Create puzzle by removing numbers
     cells_to_remove = {
@@ -59,237 +67,846 @@ def generate_puzzle(difficulty: str) -> Tuple[str, str]:
         'hard': 50
     }
     
-    puzzle = [row[:] for row in board]
+    puzzle = list(solution)
     remove_count = cells_to_remove.get(difficulty, 30)
     
-    positions = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(positions)
+    for index in random.sample(range(81), remove_count):
+        puzzle[index] = '0'
     
-    for i, j in positions[:remove_count]:
-        puzzle[i][j] = 0
-    
-    puzzle_string = ''.join(str(num) for row in puzzle for num in row)
-    return puzzle_string, solution
+    return ''.join(puzzle), solution
 
 
-def analyze_hint_candidates(current_state, solution):
-    """Analyze the current state and find the best hint candidates with related cells"""
-    try:
-        # Validate input parameters
-        if not isinstance(current_state, str) or not isinstance(solution, str):
-            raise ValueError("Current state and solution must be strings")
-        
-        if len(current_state) != 81 or len(solution) != 81:
-            raise ValueError("Current state and solution must be exactly 81 characters long")
-            
-        if not all(c in '0123456789' for c in current_state):
-            raise ValueError("Current state contains invalid characters")
-            
-        if not all(c in '123456789' for c in solution):
-            raise ValueError("Solution contains invalid characters")
-        
-        # Check if the puzzle is already solved
-        if current_state == solution:
-            return None
-            
-        candidates = []
-        board = [list(current_state[i:i+9]) for i in range(0, 81, 9)]
-        solution_board = [list(solution[i:i+9]) for i in range(0, 81, 9)]
-        
-        for row in range(9):
-            for col in range(9):
-                if board[row][col] == '0':
-                    try:
-                        impact_score = calculate_hint_impact(board, row, col, solution_board[row][col])
-                        technique, related_cells = determine_solving_technique_with_cells(board, row, col, solution_board[row][col])
-                        
-                        # Validate hint data
-                        if not isinstance(technique, str) or not related_cells:
-                            continue
-                            
-                        candidate = {
-                            'row': row,
-                            'col': col,
-                            'value': solution_board[row][col],
-                            'impact_score': impact_score,
-                            'technique': technique,
-                            'related_cells': related_cells
-                        }
-                        
-                        # Ensure all required fields are present
-                        if all(k in candidate for k in ['row', 'col', 'value', 'technique', 'related_cells']):
-                            candidates.append(candidate)
-                            
-                    except Exception as e:
-                        print(f"Error processing hint candidate at position ({row}, {col}): {str(e)}")
+def random_solution(rng=random) -> str:
+    """Build a random completed grid"""
+    board = Board(bytearray(81))
+
+    # Fill the diagonal boxes, which never constrain each other
+    nums = list(range(1, 10))
+    for box in (0, 4, 8):
+        rng.shuffle(nums)
+        for index, digit in zip(BOXES[box], nums):
+            board.cells[index] = digit
+
+    # Solve the board
+    return solve(board)
+
+
+def dig_holes(solution: str, difficulty: str, rng=random, timings: Dict = None) -> str:
+    """Remove clues from a solution while the puzzle stays uniquely solvable.
+
+    Time spent checking uniqueness is added to ``timings['uniqueness_check']``.
+    """
+    profile = DIFFICULTY_PROFILES.get(difficulty, DIFFICULTY_PROFILES['easy'])
+    technique = profile['technique']
+    allowed = TECHNIQUES[:TECHNIQUES.index(technique) + 1]
+    puzzle = list(solution)
+    clues = 81
+
+    checked = 0.0
+
+    positions = list(range(81))
+    rng.shuffle(positions)
+    for index in positions:
+        if clues <= profile['min_clues']:
+            break
+        puzzle[index] = '0'
+        start = time.perf_counter()
+        if technique == 'search':
+            keep = count_solutions(puzzle, 2) == 1
+        else:
+            keep = rate_puzzle(puzzle, technique) in allowed
+        checked += time.perf_counter() - start
+        if keep:
+            clues -= 1
+        else:
+            puzzle[index] = solution[index]
+
+    if timings is not None:
+        timings['uniqueness_check'] = timings.get('uniqueness_check', 0.0) + checked
+    return ''.join(puzzle)
+
+
+def generate_unique_puzzle(difficulty: str, time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+                           rng=random, max_attempts: Optional[int] = None) -> Dict:
+    """Generate a puzzle with exactly one solution, graded by technique.
+
+    Puzzles are regenerated until their rating matches ``difficulty`` or
+    ``time_budget`` seconds have passed (or ``max_attempts`` puzzles were
+    tried), in which case the puzzle whose rating came closest is
+    returned. With no time budget the result depends only on ``rng``. The
+    result holds the puzzle, the solution, the requested and the rated
+    difficulty, the clue count, the number of attempts and the generation
+    time in seconds.
+    """
+    if difficulty not in DIFFICULTY_PROFILES:
+        difficulty = 'easy'
+    levels = list(DIFFICULTY_PROFILES)
+    target = levels.index(difficulty)
+
+    start = time.perf_counter()
+    best = None
+    best_distance = None
+    attempts = 0
+
+    while True:
+        attempts += 1
+        timings = {}
+        stage_start = time.perf_counter()
+        solution = random_solution(rng)
+        filled = time.perf_counter()
+        puzzle = dig_holes(solution, difficulty, rng, timings)
+        dug = time.perf_counter()
+        rating = RATING_DIFFICULTY[rate_puzzle(puzzle)]
+        GENERATOR_STAGE.observe(filled - stage_start, stage='fill')
+        GENERATOR_STAGE.observe(dug - filled - timings['uniqueness_check'], stage='dig')
+        GENERATOR_STAGE.observe(timings['uniqueness_check'], stage='uniqueness_check')
+        GENERATOR_STAGE.observe(time.perf_counter() - dug, stage='rate')
+        distance = abs(levels.index(rating) - target)
+        if best is None or distance < best_distance:
+            best = (puzzle, solution, rating)
+            best_distance = distance
+        if distance == 0 or attempts == max_attempts:
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+
+    puzzle, solution, rating = best
+    return {
+        'puzzle': puzzle,
+        'solution': solution,
+        'difficulty': difficulty,
+        'rating': rating,
+        'clues': 81 - puzzle.count('0'),
+        'attempts': attempts,
+        'generation_time': time.perf_counter() - start
+    }
+
+
+def generate_chunk(difficulty: str, seed: str, count: int, max_attempts: int = 50,
+                   canonical: bool = False) -> Dict:
+    """Generate ``count`` puzzles from a seed string; process-pool entry point.
+
+    The output depends only on the arguments, not on timing or which
+    process runs it. With ``canonical`` each puzzle also gets its
+    canonicalize() form under 'canonical', so that the parent does not
+    spend a few milliseconds per puzzle on it before inserting. Returns
+    the puzzles with the worker's pid and the seconds spent, for
+    per-worker throughput.
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    puzzles = [
+        generate_unique_puzzle(difficulty, time_budget=None, rng=rng, max_attempts=max_attempts)
+        for _ in range(count)
+    ]
+    if canonical:
+        for result in puzzles:
+            result['canonical'] = canonicalize(result['puzzle'], result['solution'])
+    return {'puzzles': puzzles, 'pid': os.getpid(), 'elapsed': time.perf_counter() - start}
+
+
+class Transform:
+    """A Sudoku symmetry: a cell permutation followed by a digit relabelling.
+
+    ``cells[k]`` is the index of the source cell that lands in cell ``k``
+    and ``digits`` maps each source digit character to its new one ('0'
+    stays '0'). Every row/column/band/stack permutation, transpose and
+    relabelling, and any composition of them, has this form.
+    """
+    __slots__ = ('cells', 'digits', '_table', '_targets')
+
+    def __init__(self, cells, digits):
+        self.cells = tuple(cells)
+        self.digits = dict(digits)
+        self.digits['0'] = '0'
+        self._table = str.maketrans(self.digits)
+        self._targets = None
+
+    def apply(self, board: str) -> str:
+        return ''.join([board[k] for k in self.cells]).translate(self._table)
+
+    def map_cell(self, index: int) -> int:
+        """Where source cell ``index`` ends up"""
+        if self._targets is None:
+            targets = [0] * 81
+            for target, source in enumerate(self.cells):
+                targets[source] = target
+            self._targets = targets
+        return self._targets[index]
+
+    def map_digit(self, digit: str) -> str:
+        return self.digits[digit]
+
+    def inverse(self) -> 'Transform':
+        return Transform([self.map_cell(i) for i in range(81)],
+                         {new: old for old, new in self.digits.items()})
+
+
+def _minlex_transforms(solution: str) -> Tuple[str, Tuple[Transform, ...]]:
+    """Minimal lexicographic form of a solved grid and every transform reaching it.
+
+    The first row of the minimal form is always 123456789 (digits are
+    relabelled in order of appearance), so the search is over which row
+    comes first (9 rows, optionally transposed) and the column order (1296
+    permutations). The second row must be minimal first, and it depends
+    only on the column order: with ``f`` mapping each column to the column
+    where the first row holds the second row's digit, the second row is
+    ``f`` conjugated by the column order. Columns are therefore fixed
+    position by position, keeping only the partial orders whose second
+    row prefix is smallest; once a column's image under ``f`` is needed,
+    placing it at the earliest free position is always best. The
+    surviving orders fix the rest of the grid up to sorting rows within
+    bands and bands by their rows, which is done directly. Typically a
+    few milliseconds; results are memoised per solution.
+    """
+    grids = (solution, ''.join(solution[c * 9 + r] for r in range(9) for c in range(9)))
+    starts = []
+    for transposed, grid in enumerate(grids):
+        rows = [grid[r * 9:r * 9 + 9] for r in range(9)]
+        for first in range(9):
+            position = {digit: c for c, digit in enumerate(rows[first])}
+            band = first - first % 3
+            for second in range(band, band + 3):
+                if second != first:
+                    image = [position[digit] for digit in rows[second]]
+                    # (transposed, first, second, image, order, placed, stack_block, block_stack)
+                    starts.append((transposed, first, second, image,
+                                   [-1] * 9, [-1] * 9, [-1] * 3, [-1] * 3))
+
+    states = starts
+    for j in range(9):
+        block = j // 3
+        best = 9
+        survivors = []
+        for state in states:
+            transposed, first, second, image, order, placed, stack_block, block_stack = state
+            if order[j] >= 0:
+                choices = (order[j],)
+            elif block_stack[block] >= 0:
+                stack = block_stack[block]
+                choices = [c for c in range(3 * stack, 3 * stack + 3) if placed[c] < 0]
+            else:
+                choices = [c for c in range(9) if stack_block[c // 3] < 0]
+
+            for column in choices:
+                if order[j] < 0:
+                    order2, placed2 = order[:], placed[:]
+                    stack_block2, block_stack2 = stack_block[:], block_stack[:]
+                    order2[j] = column
+                    placed2[column] = j
+                    if block_stack2[block] < 0:
+                        block_stack2[block] = column // 3
+                        stack_block2[column // 3] = block
+                else:
+                    order2, placed2, stack_block2, block_stack2 = order, placed, stack_block, block_stack
+
+                target = image[column]
+                value = placed2[target]
+                if value < 0:
+                    # Place the image at the earliest position still open to it
+                    target_block = stack_block2[target // 3]
+                    if target_block < 0:
+                        target_block = block_stack2.index(-1)
+                    start = 3 * target_block
+                    value = next(k for k in range(start, start + 3) if order2[k] < 0)
+                    if value > best:
                         continue
-        
-        if not candidates:
-            return None
-            
-        # Sort candidates by impact score and technique complexity
-        candidates.sort(key=lambda x: (-x['impact_score'], -len(x['technique'])))
-        return candidates[0]
-        
-    except Exception as e:
-        print(f"Error analyzing hint candidates: {str(e)}")
+                    if order2 is order:
+                        order2, placed2 = order[:], placed[:]
+                        stack_block2, block_stack2 = stack_block[:], block_stack[:]
+                    order2[value] = target
+                    placed2[target] = value
+                    if block_stack2[target_block] < 0:
+                        block_stack2[target_block] = target // 3
+                        stack_block2[target // 3] = target_block
+                if value > best:
+                    continue
+                if value < best:
+                    best = value
+                    survivors = []
+                survivors.append((transposed, first, second, image,
+                                  order2, placed2, stack_block2, block_stack2))
+        states = survivors
+
+    best_grid = None
+    transforms = []
+    for transposed, first, second, image, order, placed, _, _ in states:
+        grid = grids[transposed]
+        table = str.maketrans({grid[first * 9 + order[k]]: str(k + 1) for k in range(9)})
+        relabelled = [''.join(grid[r * 9 + c] for c in order).translate(table) for r in range(9)]
+        band = first - first % 3
+        third = 3 * band + 3 - first - second
+        bands = sorted(
+            sorted((relabelled[r], r) for r in range(b, b + 3))
+            for b in (0, 3, 6) if b != band
+        )
+        row_order = [first, second, third] + [r for rows in bands for _, r in rows]
+        candidate = ''.join(relabelled[r] for r in row_order)
+        if best_grid is not None and candidate > best_grid:
+            continue
+        if best_grid is None or candidate < best_grid:
+            best_grid = candidate
+            transforms = []
+        if transposed:
+            cells = [order[c] * 9 + r for r in row_order for c in range(9)]
+        else:
+            cells = [r * 9 + order[c] for r in row_order for c in range(9)]
+        digits = {grid[first * 9 + order[k]]: str(k + 1) for k in range(9)}
+        transforms.append(Transform(cells, digits))
+    return best_grid, tuple(transforms)
+
+
+_minlex_cached = lru_cache(maxsize=4096)(_minlex_transforms)
+
+
+def canonical_form(puzzle: str, solution: str = None) -> Tuple[str, str, Transform]:
+    """Map a puzzle (or any partly filled board) to its canonical representative.
+
+    Two boards get the same canonical form exactly when one can be turned
+    into the other by relabelling digits, permuting rows within bands,
+    columns within stacks, bands, stacks, and transposing. The solution
+    is put in minimal lexicographic form; if several transforms reach it
+    (the grid has automorphisms) the one giving the smallest puzzle is
+    used. Returns the canonical puzzle and solution and the transform
+    from the input to them. ``solution`` is solved for if not given.
+    Transforms are memoised per solution, so further boards from the same
+    game cost one cell permutation.
+    """
+    if solution is None:
+        solution = solve(puzzle)
+        if solution is None:
+            raise ValueError("Puzzle has no solution")
+    if len(solution) != 81 or '0' in solution:
+        raise ValueError("Solution must be a filled 81-digit grid")
+    canonical_solution, transforms = _minlex_cached(solution)
+    transform = transforms[0]
+    canonical_puzzle = transform.apply(puzzle)
+    for other in transforms[1:]:
+        candidate = other.apply(puzzle)
+        if candidate < canonical_puzzle:
+            canonical_puzzle, transform = candidate, other
+    return canonical_puzzle, canonical_solution, transform
+
+
+def random_transform(rng=random) -> Transform:
+    """A uniformly random symmetry: band, stack, row and column shuffles, transpose and relabelling.
+
+    Rotations and reflections are compositions of these.
+    """
+    bands = rng.sample(range(3), 3)
+    stacks = rng.sample(range(3), 3)
+    rows = [3 * band + r for band in bands for r in rng.sample(range(3), 3)]
+    cols = [3 * stack + c for stack in stacks for c in rng.sample(range(3), 3)]
+    if rng.random() < 0.5:
+        cells = [c * 9 + r for r in rows for c in cols]
+    else:
+        cells = [r * 9 + c for r in rows for c in cols]
+    return Transform(cells, dict(zip('123456789', rng.sample('123456789', 9))))
+
+
+def vet_seed(puzzle: str, solution: str, difficulty: str) -> bool:
+    """Check a seed puzzle is unique, matches its solution and rates as ``difficulty``"""
+    if count_solutions(puzzle, 2) != 1 or solve(puzzle) != solution:
+        return False
+    return RATING_DIFFICULTY.get(rate_puzzle(puzzle)) == difficulty
+
+
+_seed_bank = None
+
+
+def load_seed_bank(path: str = None) -> Dict[str, List[Tuple[str, str]]]:
+    """Seed puzzles by difficulty, read once from SEED_BANK_PATH (or ``path``)"""
+    global _seed_bank
+    if path is None and _seed_bank is not None:
+        return _seed_bank
+    try:
+        with open(path or SEED_BANK_PATH) as f:
+            seeds = {difficulty: [tuple(pair) for pair in pairs] for difficulty, pairs in json.load(f).items()}
+    except (OSError, ValueError) as e:
+        logger.warning("Seed bank unavailable: %s", e)
+        seeds = {}
+    if path is None:
+        _seed_bank = seeds
+    return seeds
+
+
+def transformed_puzzle(difficulty: str, rng=random, seeds: Dict = None) -> Optional[Dict]:
+    """A fresh-looking puzzle made by applying a random symmetry to a seed puzzle.
+
+    Symmetries preserve uniqueness and the techniques needed, so the
+    result keeps the seed's vetted rating at the cost of one cell
+    permutation. Returns a dict shaped like generate_unique_puzzle's, or
+    None if there are no seeds for ``difficulty``.
+    """
+    start = time.perf_counter()
+    candidates = (seeds if seeds is not None else load_seed_bank()).get(difficulty)
+    if not candidates:
         return None
+    puzzle, solution = rng.choice(candidates)
+    transform = random_transform(rng)
+    puzzle = transform.apply(puzzle)
+    return {
+        'puzzle': puzzle,
+        'solution': transform.apply(solution),
+        'difficulty': difficulty,
+        'rating': difficulty,
+        'clues': 81 - puzzle.count('0'),
+        'attempts': 0,
+        'generation_time': time.perf_counter() - start
+    }
 
-def calculate_hint_impact(board, row, col, value):
-    """Calculate how impactful a hint would be based on surrounding empty cells"""
-    impact = 0
-    # Check row
-    impact += sum(1 for c in range(9) if board[row][c] == '0')
-    # Check column
-    impact += sum(1 for r in range(9) if board[r][col] == '0')
-    # Check 3x3 box
-    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if board[r][c] == '0':
-                impact += 1
-    return impact
-
-def determine_solving_technique_with_cells(board, row, col, value):
-    """Determine which solving technique could be used for this cell and return related cells"""
-    related_cells = []
-    
-    # Check for single candidate
-    if is_single_candidate(board, row, col, value):
-        # Get cells that led to the elimination
-        related_cells = get_single_candidate_related_cells(board, row, col, value)
-        return "single_candidate", related_cells
-    
-    # Check for hidden single in row/column/box
-    hidden_single_result = is_hidden_single_with_cells(board, row, col, value)
-    if hidden_single_result[0]:
-        return "hidden_single", hidden_single_result[1]
-    
-    # If no specific technique is found, it's a basic elimination
-    return "basic_elimination", get_basic_elimination_cells(board, row, col)
-
-def is_single_candidate(board, row, col, value):
-    """Check if the cell has only one possible candidate"""
-    possible_values = get_possible_values(board, row, col)
-    return len(possible_values) == 1 and str(value) in possible_values
-
-def get_possible_values(board, row, col):
-    """Get set of possible values for a cell"""
-    if board[row][col] != '0':
-        return set()
-        
-    possible_values = set('123456789')
-    
-    # Remove values from row
-    for c in range(9):
-        if board[row][c] != '0':
-            possible_values.discard(board[row][c])
-            
-    # Remove values from column
-    for r in range(9):
-        if board[r][col] != '0':
-            possible_values.discard(board[r][col])
-            
-    # Remove values from 3x3 box
-    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if board[r][c] != '0':
-                possible_values.discard(board[r][c])
-                
-    return possible_values
-
-def get_single_candidate_related_cells(board, row, col, value):
-    """Get cells that contribute to making this cell a single candidate"""
-    related_cells = []
-    
-    # Add filled cells in the same row
-    for c in range(9):
-        if board[row][c] != '0' and c != col:
-            related_cells.append({'row': row, 'col': c})
-    
-    # Add filled cells in the same column
-    for r in range(9):
-        if board[r][col] != '0' and r != row:
-            related_cells.append({'row': r, 'col': col})
-    
-    # Add filled cells in the same 3x3 box
-    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if board[r][c] != '0' and (r != row or c != col):
-                related_cells.append({'row': r, 'col': c})
-    
-    return related_cells
 
-def is_hidden_single_with_cells(board, row, col, value):
-    """Check if the cell is a hidden single and return related cells"""
+def transform_hint(hint: Dict, transform: Transform) -> Dict:
+    """Move a hint for a board onto ``transform`` applied to that board"""
+    index = transform.map_cell(hint['row'] * 9 + hint['col'])
+    moved = dict(hint)
+    moved['row'], moved['col'] = ROW_OF[index], COL_OF[index]
+    moved['value'] = transform.map_digit(hint['value'])
     related_cells = []
-    str_value = str(value)
-    
-    # Check row
-    row_possible = []
-    for c in range(9):
-        if board[row][c] == '0' and str_value in get_possible_values(board, row, c):
-            row_possible.append(c)
-    if len(row_possible) == 1:
-        # Add all cells in the row
-        related_cells = [{'row': row, 'col': c} for c in range(9) if c != col]
-        return True, related_cells
-    
-    # Check column
-    col_possible = []
-    for r in range(9):
-        if board[r][col] == '0' and str_value in get_possible_values(board, r, col):
-            col_possible.append(r)
-    if len(col_possible) == 1:
-        # Add all cells in the column
-        related_cells = [{'row': r, 'col': col} for r in range(9) if r != row]
-        return True, related_cells
-    
-    # Check box
-    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    box_possible = []
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if board[r][c] == '0' and str_value in get_possible_values(board, r, c):
-                box_possible.append((r, c))
-    if len(box_possible) == 1:
-        # Add all cells in the box
-        related_cells = [
-            {'row': r, 'col': c}
-            for r in range(box_row, box_row + 3)
-            for c in range(box_col, box_col + 3)
-            if r != row or c != col
-        ]
-        return True, related_cells
-    
-    return False, []
+    for cell in hint['related_cells']:
+        index = transform.map_cell(cell['row'] * 9 + cell['col'])
+        related_cells.append({**cell, 'row': ROW_OF[index], 'col': COL_OF[index]})
+    moved['related_cells'] = related_cells
+    return moved
+
+
+def canonicalize(puzzle: str, solution: str) -> Tuple[str, str]:
+    """Canonical (puzzle, solution) so equivalent puzzles share one stored form; see canonical_form"""
+    canonical_puzzle, canonical_solution, _ = canonical_form(puzzle, solution)
+    return canonical_puzzle, canonical_solution
+
+
+def relabel_digits(puzzle: str, solution: str, rng=random) -> Tuple[str, str]:
+    """Apply a random digit permutation to a puzzle and its solution"""
+    digits = list('123456789')
+    rng.shuffle(digits)
+    table = str.maketrans('123456789', ''.join(digits))
+    return puzzle.translate(table), solution.translate(table)
+
+
+class CandidateGrid(Board):
+    """A Board with per-unit digit positions, shared by the hint detectors.
+
+    ``candidates`` is always computed (see Board). ``positions[u][d - 1]``
+    has bit ``k`` set when digit ``d`` can go in the ``k``-th cell of unit
+    ``u`` (units as in utils.board.UNITS). ``empty[u]`` counts the empty
+    cells of unit ``u``.
+    """
+    __slots__ = ('positions', 'empty')
+
+    def __init__(self, state):
+        board = state if isinstance(state, Board) else Board.parse(state)
+        # The grid is modified as hints are found, so it must not share the caller's buffers
+        super().__init__(board.cells[:], board.candidates[:] if board.candidates else None)
+        self.compute_candidates()
+
+        self.positions = []
+        self.empty = []
+        for unit in UNITS:
+            digit_positions = [0] * 9
+            empty = 0
+            for k, i in enumerate(unit):
+                mask = self.candidates[i]
+                if not self.cells[i]:
+                    empty += 1
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    digit_positions[bit.bit_length() - 1] |= 1 << k
+            self.positions.append(digit_positions)
+            self.empty.append(empty)
+
+    def units_of(self, index: int) -> Tuple[int, int, int]:
+        """Return the (row, column, box) unit numbers of a cell"""
+        return CELL_UNITS[index]
 
-def get_basic_elimination_cells(board, row, col):
-    """Get related cells for basic elimination technique"""
+    def eliminate(self, index: int, mask: int) -> int:
+        """Remove candidates from a cell and return the bits actually removed"""
+        mask &= self.candidates[index]
+        if mask:
+            self._own()
+            self.candidates[index] ^= mask
+            for unit, slot in zip(CELL_UNITS[index], CELL_SLOTS[index]):
+                positions = self.positions[unit]
+                removed = mask
+                while removed:
+                    bit = removed & -removed
+                    removed ^= bit
+                    positions[bit.bit_length() - 1] &= ~(1 << slot)
+        return mask
+
+    def copy(self) -> 'CandidateGrid':
+        """Return an independent copy, e.g. to try eliminations on.
+
+        Cells and candidates are shared copy-on-write (see Board.clone).
+        """
+        clone = self.clone()
+        clone.positions = [digit_positions[:] for digit_positions in self.positions]
+        clone.empty = self.empty[:]
+        return clone
+
+    def place(self, index: int, digit: int):
+        """Fill a cell and update the candidates of its peers incrementally"""
+        self.eliminate(index, self.candidates[index])
+        self._own()
+        self.cells[index] = digit
+        for unit in CELL_UNITS[index]:
+            self.empty[unit] -= 1
+        bit = 1 << (digit - 1)
+        for peer in PEERS[index]:
+            if self.candidates[peer] & bit:
+                self.eliminate(peer, bit)
+
+    def impact(self, index: int) -> int:
+        """Empty cells in the cell's row, column and box, the hint impact score"""
+        row, col, box = self.units_of(index)
+        return self.empty[row] + self.empty[col] + self.empty[box]
+
+
+def classify_cell(grid: CandidateGrid, index: int, value: str) -> Tuple[str, int]:
+    """Find which single applies to a cell using only bit tests.
+
+    Returns ``(technique, unit)``, where ``unit`` is the unit a hidden
+    single was found in (-1 for other techniques).
+    """
+    bit = 1 << (int(value) - 1)
+    if grid.candidates[index] == bit:
+        return "single_candidate", -1
+
+    digit = int(value) - 1
+    for unit, slot in zip(CELL_UNITS[index], CELL_SLOTS[index]):
+        if grid.positions[unit][digit] == 1 << slot:
+            return "hidden_single", unit
+
+    return "basic_elimination", -1
+
+
+def related_cells_for(grid: CandidateGrid, index: int, technique: str, unit: int) -> List[Dict]:
+    """Build the related cells shown with a single or basic elimination hint"""
+    cells = grid.cells
+    if technique == "single_candidate":
+        return [
+            {'row': ROW_OF[i], 'col': COL_OF[i]}
+            for peer_unit in grid.units_of(index)
+            for i in UNITS[peer_unit]
+            if cells[i] and i != index
+        ]
+    if technique == "hidden_single":
+        return [{'row': ROW_OF[i], 'col': COL_OF[i]} for i in UNITS[unit] if i != index]
     return [
-        {'row': row, 'col': c}
-        for c in range(9)
-        if c != col and board[row][c] != '0'
+        {'row': ROW_OF[i], 'col': COL_OF[i]}
+        for i in UNITS[ROW_OF[index]]
+        if i != index and cells[i]
     ]
 
-def can_place_number(board, row, col, num):
-    """Check if a number can be placed in a cell"""
-    if board[row][col] != '0':
-        return False
-    # Check row
-    for c in range(9):
-        if board[row][c] == num:
-            return False
-    # Check column
-    for r in range(9):
-        if board[r][col] == num:
-            return False
-    # Check 3x3 box
-    box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if board[r][c] == num:
-                return False
-    return True
\ No newline at end of file
+
+def detect_technique(grid: CandidateGrid, index: int, value: str):
+    """Which single applies to a cell, and the related cells to show with it"""
+    technique, unit = classify_cell(grid, index, value)
+    return technique, related_cells_for(grid, index, technique, unit)
+
+
+# Elimination techniques tried, cheapest first, when no single is available.
+# Each entry is (cost, name, detector); see hint_technique.
+HINT_TECHNIQUES = []
+
+# Order in which hints are preferred: the simplest explanation wins
+HINT_PRIORITY = ['single_candidate', 'hidden_single']
+
+# Cells of each row/column segment of a box, and of each box segment of a line,
+# as masks over unit slots
+BOX_ROW_SLOTS = (0b000000111, 0b000111000, 0b111000000)
+BOX_COL_SLOTS = (0b001001001, 0b010010010, 0b100100100)
+LINE_BOX_SLOTS = BOX_ROW_SLOTS
+
+
+def hint_technique(name: str, cost: int):
+    """Register an elimination detector for the hint pipeline.
+
+    A detector takes a CandidateGrid and yields ``(pattern, eliminations)``
+    pairs, where ``pattern`` lists the cell indexes that justify the
+    deduction and ``eliminations`` is a list of ``(index, mask)``
+    candidates it rules out. Detectors run in order of ``cost``.
+    """
+    def decorator(func):
+        HINT_TECHNIQUES.append((cost, name, func))
+        HINT_TECHNIQUES.sort(key=lambda entry: entry[0])
+        HINT_PRIORITY[2:] = [entry[1] for entry in HINT_TECHNIQUES] + ['basic_elimination']
+        return func
+    return decorator
+
+
+def _slot_cells(unit: int, slots: int) -> List[int]:
+    members = UNITS[unit]
+    return [members[k] for k in range(9) if slots >> k & 1]
+
+
+@hint_technique('pointing_pair', cost=1)
+def find_pointing_pairs(grid: CandidateGrid):
+    """A digit confined to one line of a box is removed from the rest of that line"""
+    for box in range(9):
+        unit = 18 + box
+        for digit in range(9):
+            slots = grid.positions[unit][digit]
+            if slots.bit_count() < 2:
+                continue
+            bit = 1 << digit
+            cells = _slot_cells(unit, slots)
+            for segment in range(3):
+                if not slots & ~BOX_ROW_SLOTS[segment]:
+                    line = ROW_OF[cells[0]]
+                elif not slots & ~BOX_COL_SLOTS[segment]:
+                    line = 9 + COL_OF[cells[0]]
+                else:
+                    continue
+                eliminations = [
+                    (i, bit) for i in UNITS[line]
+                    if BOX_OF[i] != box and grid.candidates[i] & bit
+                ]
+                if eliminations:
+                    yield cells, eliminations
+
+
+@hint_technique('box_line_reduction', cost=2)
+def find_box_line_reductions(grid: CandidateGrid):
+    """A digit confined to one box within a line is removed from the rest of that box"""
+    for unit in range(18):
+        for digit in range(9):
+            slots = grid.positions[unit][digit]
+            if slots.bit_count() < 2:
+                continue
+            for segment in range(3):
+                if slots & ~LINE_BOX_SLOTS[segment]:
+                    continue
+                bit = 1 << digit
+                cells = _slot_cells(unit, slots)
+                eliminations = [
+                    (i, bit) for i in UNITS[18 + BOX_OF[cells[0]]]
+                    if unit not in CELL_UNITS[i] and grid.candidates[i] & bit
+                ]
+                if eliminations:
+                    yield cells, eliminations
+
+
+@hint_technique('naked_pair', cost=3)
+def find_naked_pairs(grid: CandidateGrid):
+    """Two cells of a unit limited to the same two digits claim them for the unit"""
+    for unit in range(27):
+        pairs = {}
+        for i in UNITS[unit]:
+            mask = grid.candidates[i]
+            if mask.bit_count() != 2:
+                continue
+            if mask not in pairs:
+                pairs[mask] = i
+                continue
+            cells = [pairs[mask], i]
+            eliminations = [
+                (j, mask) for j in UNITS[unit]
+                if j not in cells and grid.candidates[j] & mask
+            ]
+            if eliminations:
+                yield cells, eliminations
+
+
+@hint_technique('hidden_pair', cost=4)
+def find_hidden_pairs(grid: CandidateGrid):
+    """Two digits limited to the same two cells of a unit clear other candidates there"""
+    for unit in range(27):
+        seen = {}
+        for digit in range(9):
+            slots = grid.positions[unit][digit]
+            if slots.bit_count() != 2:
+                continue
+            if slots not in seen:
+                seen[slots] = digit
+                continue
+            pair = 1 << digit | 1 << seen[slots]
+            cells = _slot_cells(unit, slots)
+            eliminations = [
+                (i, grid.candidates[i] & ~pair) for i in cells
+                if grid.candidates[i] & ~pair
+            ]
+            if eliminations:
+                yield cells, eliminations
+
+
+def _unlocked_cell(grid: CandidateGrid, removed, solution: str):
+    """Find a cell that became a single after ``removed`` eliminations"""
+    for index, mask in removed:
+        candidates = grid.candidates[index]
+        if candidates and not candidates & (candidates - 1) \
+                and candidates.bit_length() == int(solution[index]):
+            return index
+    for index, mask in removed:
+        for unit in CELL_UNITS[index]:
+            positions = grid.positions[unit]
+            digits = mask
+            while digits:
+                bit = digits & -digits
+                digits ^= bit
+                slots = positions[bit.bit_length() - 1]
+                if slots and not slots & (slots - 1):
+                    cell = UNITS[unit][slots.bit_length() - 1]
+                    if int(solution[cell]) == bit.bit_length():
+                        return cell
+    return None
+
+
+def find_elimination_hint(grid: CandidateGrid, solution: str, timings: Dict,
+                          max_rounds: int = 20, deadline: float = None):
+    """Run the technique pipeline until an elimination unlocks a single.
+
+    Returns ``(technique, index, cells)`` for the first deduction that
+    leaves a cell with a single candidate or a digit with a single place
+    in a unit, or None. ``cells`` lists the pattern cells followed by the
+    cells that lost candidates, which is the order the front-end
+    expects. Eliminations that unlock nothing are kept and the pipeline
+    restarts from the cheapest technique. Time spent in each detector is
+    accumulated into ``timings``. The search gives up once
+    ``time.perf_counter()`` passes ``deadline``.
+    """
+    for _ in range(max_rounds):
+        changed = False
+        for _, name, detect in HINT_TECHNIQUES:
+            start = time.perf_counter()
+            if deadline is not None and start > deadline:
+                return None
+            found = None
+            for pattern, eliminations in detect(grid):
+                removed = []
+                for index, mask in eliminations:
+                    mask = grid.eliminate(index, mask)
+                    if mask:
+                        removed.append((index, mask))
+                if not removed:
+                    continue
+                changed = True
+                index = _unlocked_cell(grid, removed, solution)
+                if index is not None:
+                    found = (name, index, pattern + [i for i, _ in removed if i not in pattern])
+                break
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+            if found or changed:
+                break
+        if found:
+            return found
+        if not changed:
+            return None
+    return None
+
+
+def find_hint(grid: CandidateGrid, solution: str, timings: Dict = None, deadline: float = None):
+    """Find the best hint on a candidate grid; see analyze_hint_candidates.
+
+    The grid itself is left unchanged so callers can keep updating it
+    incrementally between hints. Returns None if no hint can be given.
+    """
+    if timings is None:
+        timings = {}
+    start = time.perf_counter()
+    order = sorted((i for i, digit in enumerate(grid.cells) if not digit),
+                   key=grid.impact, reverse=True)
+    best = None
+    examined = 0
+    expired = False
+    for index in order:
+        examined += 1
+        technique, unit = classify_cell(grid, index, solution[index])
+        rank = HINT_PRIORITY.index(technique)
+        # A basic elimination hint needs a filled cell in the row to point at
+        if (best is None or rank < best[0]) and \
+                (technique != 'basic_elimination' or grid.empty[ROW_OF[index]] < 9):
+            best = (rank, index, technique, unit)
+            if rank == 0:
+                break
+        # Past the deadline only once there is a hint to return
+        if best is not None and deadline is not None and examined < len(order) \
+                and time.perf_counter() > deadline:
+            expired = True
+            break
+    timings['singles'] = time.perf_counter() - start
+
+    if best is None:
+        return None
+    rank, index, technique, unit = best
+    related_cells = None
+
+    # Only pay for the elimination techniques when no single is available
+    if technique == 'basic_elimination' and not expired:
+        found = find_elimination_hint(grid.copy(), solution, timings, deadline=deadline)
+        if found:
+            technique, index, related = found
+            related_cells = [{'row': ROW_OF[i], 'col': COL_OF[i]} for i in related]
+        elif deadline is not None and time.perf_counter() > deadline:
+            expired = True
+    if related_cells is None:
+        related_cells = related_cells_for(grid, index, technique, unit)
+
+    return {
+        'row': ROW_OF[index],
+        'col': COL_OF[index],
+        'value': solution[index],
+        'impact_score': grid.impact(index),
+        'technique': technique,
+        'related_cells': related_cells,
+        'cells_examined': examined,
+        'complete': not expired,
+        'timings': timings
+    }
+
+
+def solving_path(current_state: str, solution: str, max_steps: int = 81) -> List[Dict]:
+    """Return up to ``max_steps`` consecutive hints that solve the board.
+
+    Each hint is what analyze_hint_candidates would return after all the
+    previous hints were filled in, but the candidate grid is built once
+    and updated incrementally as hints are placed. ``current_state`` may
+    be a string or a Board; the inputs are expected to be validated already.
+    """
+    grid = CandidateGrid(current_state)
+    path = []
+    while len(path) < max_steps:
+        hint = find_hint(grid, solution)
+        if hint is None:
+            break
+        index = hint['row'] * 9 + hint['col']
+        grid.place(index, int(hint['value']))
+        hint.pop('timings')
+        hint.pop('complete')
+        path.append(hint)
+    return path
+
+
+def analyze_hint_candidates(current_state, solution, time_budget: float = None):
+    """Analyze the current state and find the best hint candidates with related cells.
+
+    ``current_state`` may be a string or an already parsed Board. Empty
+    cells are examined in order of impact score and the search stops at
+    the first naked single, which is the best hint possible. With a
+    ``time_budget`` (seconds) the best hint found so far is returned once
+    the budget is spent, skipping the elimination techniques if need be;
+    such a hint has ``complete`` set to False and should not be cached.
+    """
+    try:
+        start = time.perf_counter()
+        board = current_state if isinstance(current_state, Board) else Board.parse(current_state)
+        if not isinstance(solution, str):
+            raise ValueError("Solution must be a string")
+        Board.parse(solution, complete=True)
+
+        # Check if the puzzle is already solved
+        if str(board) == solution:
+            return None
+
+        grid = CandidateGrid(board)
+        timings = {'candidate_grid': time.perf_counter() - start}
+        deadline = None if time_budget is None else start + time_budget
+        hint = find_hint(grid, solution, timings, deadline)
+        for stage, elapsed in timings.items():
+            HINT_STAGE.observe(elapsed, stage=stage)
+        return hint
+
+    except Exception as e:
+        print(f"Error analyzing hint candidates: {str(e)}")
+        return None
@@ -0,0 +1,200 @@
+"""Daily challenge leaderboards kept in memory per worker.
+
+Each day's completions are held as a list of ``(seconds, finished_at,
+player)`` keys kept sorted with bisect, plus a player -> key dict, so
+"my rank" is a dict lookup and a binary search and the top K is a slice;
+neither reads the database. New completions go into memory immediately
+and are queued for the database; LeaderboardSync periodically writes the
+queue and rebuilds the loaded days from the (puzzle_date, seconds) index
+to pick up other workers' completions. Every completion is also in the
+submission table, so a worker that dies before flushing loses nothing
+that cannot be recovered.
+
+Solve times are not taken from the client as they are. /daily-challenge
+hands out a signed ``started`` token per fetch; a solve is ranked with
+the larger of the reported seconds and the time since its token was
+issued, and only if that is plausible for the number of empty cells.
+"""
+import bisect
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from itsdangerous import BadData, URLSafeTimedSerializer
+from sqlalchemy import select
+
+from app import app, db
+from models import DailyCompletion, DailyPuzzle, insert_ignoring_conflicts
+from utils.background import PeriodicJob
+
+# Completion rows per INSERT when flushing
+FLUSH_CHUNK = 1000
+
+_boards = {}
+# Completions recorded in this worker that may not be written yet; rows
+# stay queued until their INSERT commits
+_pending = []
+_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+
+class DayBoard:
+    """One day's completion times, fastest first"""
+
+    def __init__(self, keys: Iterable = ()):
+        self.keys = []
+        self.by_player = {}
+        for key in keys:
+            self.add(*key)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, seconds: int, finished_at: datetime, player: str) -> bool:
+        """Insert a completion; a player's first completion is the one that counts"""
+        if player in self.by_player:
+            return False
+        key = (seconds, finished_at, player)
+        bisect.insort(self.keys, key)
+        self.by_player[player] = key
+        return True
+
+    def rank(self, player: str) -> Optional[int]:
+        key = self.by_player.get(player)
+        if key is None:
+            return None
+        return bisect.bisect_left(self.keys, key) + 1
+
+    def top(self, limit: int) -> List[Dict]:
+        return [
+            {'rank': rank, 'player': player, 'seconds': seconds}
+            for rank, (seconds, _, player) in enumerate(self.keys[:limit], 1)
+        ]
+
+
+def _load(day: date) -> DayBoard:
+    """Read a day's completions from the database, merge queued ones and install the board"""
+    rows = db.session.execute(
+        select(DailyCompletion.seconds, DailyCompletion.created_at, DailyCompletion.player)
+        .where(DailyCompletion.puzzle_date == day)
+        .order_by(DailyCompletion.seconds, DailyCompletion.created_at)
+    )
+    board = DayBoard((seconds, finished_at or datetime.min, player) for seconds, finished_at, player in rows)
+    with _lock:
+        for row in _pending:
+            if row['puzzle_date'] == day:
+                board.add(row['seconds'], row['created_at'], row['player'])
+        _boards[day] = board
+        for old_day in sorted(_boards)[:-app.config['LEADERBOARD_MAX_DAYS']]:
+            del _boards[old_day]
+    return board
+
+
+def get_board(day: date) -> DayBoard:
+    """The day's board, loaded from the database on first use in this worker"""
+    board = _boards.get(day)
+    if board is not None:
+        return board
+    with _load_lock:
+        board = _boards.get(day)
+        if board is None:
+            board = _load(day)
+    return board
+
+
+def _token_serializer() -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(app.secret_key, salt='daily-started')
+
+
+def issue_start_token(day: date) -> str:
+    """A signed token recording that ``day``'s challenge was fetched now"""
+    return _token_serializer().dumps(day.isoformat())
+
+
+def solve_time(token, day: date, seconds: int, empty_cells: int):
+    """The time to rank a solve with, or None and why it cannot be ranked.
+
+    Returns ``(seconds, None)`` or ``(None, reason)``. The ranked time is
+    the reported ``seconds`` or, if longer, the time since ``token`` was
+    issued for ``day``, and must be at least LEADERBOARD_MIN_SECONDS_PER_CELL
+    per empty cell.
+    """
+    if not isinstance(token, str):
+        return None, 'started token from /daily-challenge is required for the leaderboard'
+    try:
+        token_day, issued = _token_serializer().loads(token, max_age=2 * 86400, return_timestamp=True)
+    except BadData:
+        return None, 'started token is invalid or expired'
+    if token_day != day.isoformat():
+        return None, 'started token is for another day'
+    elapsed = (datetime.now(issued.tzinfo) - issued).total_seconds()
+    ranked = max(seconds, int(elapsed))
+    if ranked < empty_cells * app.config['LEADERBOARD_MIN_SECONDS_PER_CELL']:
+        return None, 'solve time is faster than plausible'
+    return ranked, None
+
+
+def record_completion(day: date, player: str, seconds: int) -> int:
+    """Add a verified daily solve and return the player's rank"""
+    board = get_board(day)
+    now = datetime.utcnow()
+    with _lock:
+        # A rebuild may have replaced the board meanwhile
+        board = _boards.get(day, board)
+        if board.add(seconds, now, player):
+            _pending.append({'puzzle_date': day, 'player': player, 'seconds': seconds, 'created_at': now})
+        return board.rank(player)
+
+
+def leaderboard(day: date, limit: int, player: Optional[str] = None) -> Dict:
+    """Top ``limit`` completions of a day and, if given, ``player``'s own entry"""
+    board = get_board(day)
+    with _lock:
+        result = {
+            'date': day.strftime('%Y-%m-%d'),
+            'total': len(board),
+            'top': board.top(limit),
+            'player': None
+        }
+        rank = board.rank(player) if player else None
+        if rank is not None:
+            result['player'] = {'rank': rank, 'player': player, 'seconds': board.by_player[player][0]}
+    return result
+
+
+def daily_dates(game_ids: Iterable[int]) -> Dict[int, date]:
+    """Map the ids of daily challenge games to their dates"""
+    rows = db.session.execute(
+        select(DailyPuzzle.game_id, DailyPuzzle.puzzle_date).where(DailyPuzzle.game_id.in_(list(game_ids)))
+    )
+    return {game_id: day for game_id, day in rows}
+
+
+def flush() -> int:
+    """Write queued completions; returns how many were queued"""
+    with _lock:
+        rows = list(_pending)
+    for offset in range(0, len(rows), FLUSH_CHUNK):
+        db.session.execute(insert_ignoring_conflicts(
+            DailyCompletion, rows[offset:offset + FLUSH_CHUNK], ['puzzle_date', 'player']
+        ))
+    db.session.commit()
+    with _lock:
+        # Only appends happen meanwhile, so the written rows are still first
+        del _pending[:len(rows)]
+    return len(rows)
+
+
+def rebuild():
+    """Reload every day this worker holds, picking up other workers' completions"""
+    for day in list(_boards):
+        _load(day)
+
+
+class LeaderboardSync(PeriodicJob):
+    """Background thread that flushes queued completions and rebuilds the boards"""
+    name = 'leaderboard-sync'
+
+    def run_once(self):
+        flush()
+        rebuild()
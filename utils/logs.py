@@ -0,0 +1,71 @@
+import atexit
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+from utils.metrics import LOG_RECORDS
+
+
+class SampledQueueHandler(QueueHandler):
+    """Queue handler that keeps a sample of routine records and never blocks.
+
+    Records below WARNING are kept with probability ``sample_rate``;
+    warnings and errors are always kept. Records are queued unformatted
+    (formatting happens on the listener thread), and dropped if the queue
+    is full rather than making the request wait.
+    """
+
+    def __init__(self, log_queue: queue.Queue, sample_rate: float):
+        super().__init__(log_queue)
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING and random.random() >= self.sample_rate:
+            LOG_RECORDS.inc(outcome='sampled_out')
+            return False
+        return super().filter(record)
+
+    def prepare(self, record):
+        # The queue stays in this process, so the record needs no pickling
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            LOG_RECORDS.inc(outcome='queued')
+        except queue.Full:
+            LOG_RECORDS.inc(outcome='dropped')
+
+
+def configure_logging(logger: logging.Logger, level: str, sample_rate: float, queue_size: int):
+    """Move ``logger``'s handlers onto a background listener fed by a SampledQueueHandler.
+
+    The logger stops propagating, so its records are not also written
+    synchronously and unsampled by handlers on the root logger. The
+    listener thread does not survive fork(), so a forked child (e.g. a
+    gunicorn worker of a --preload master) gets a new queue and listener.
+    """
+    handlers = logger.handlers[:] or [logging.StreamHandler()]
+    for handler in handlers:
+        logger.removeHandler(handler)
+    queue_handler = SampledQueueHandler(queue.Queue(maxsize=queue_size), sample_rate)
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    listener = None
+
+    def start():
+        nonlocal listener
+        # Records the parent had queued but not written are left to the parent
+        queue_handler.queue = queue.Queue(maxsize=queue_size)
+        listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+
+    def stop():
+        listener.stop()
+
+    start()
+    os.register_at_fork(after_in_child=start)
+    atexit.register(stop)
@@ -0,0 +1,299 @@
+"""In-process metrics exported in the Prometheus text format.
+
+Histograms and counters live in memory and cost a lock and a bisect per
+observation. With several worker processes each process periodically
+writes its values to ``<directory>/metrics_<pid>_<start>.json`` and
+render() sums the files of every process, so /metrics gives the same
+totals whichever worker serves it. Files of exited processes are kept
+(their counts still happened); clear the directory when deploying.
+Forked children start from zero and write their own file, except pool
+workers (utils.compute, utils.puzzle_pool), which keep their values local
+and hand them back to the parent with each result (see drain()).
+
+This module only uses the standard library so the generator can record
+stage timings in processes without the Flask app.
+"""
+import atexit
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds; tuned for requests and solver stages from ~100us up
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_directory = None
+_interval = 5.0
+_started = time.time()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def merge(self, samples: Iterable[Tuple[Tuple[str, ...], object]]):
+        """Add values drained from this metric in another process"""
+        _ensure_writer()
+        with self._lock:
+            for key, value in samples:
+                current = self._values.get(key)
+                if current is None:
+                    self._values[key] = value
+                elif self.type == 'counter':
+                    self._values[key] = current + value
+                else:
+                    self._values[key] = [a + b for a, b in zip(current, value)]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            samples = [[list(key), value if self.type == 'counter' else list(value)]
+                       for key, value in self._values.items()]
+        return {'type': self.type, 'help': self.documentation, 'labelnames': list(self.labelnames),
+                'samples': samples}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        _ensure_writer()
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Values are per-bucket counts (not cumulative) followed by the sum"""
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        _ensure_writer()
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[slot] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        snapshot = super().snapshot()
+        snapshot['buckets'] = list(self.buckets)
+        return snapshot
+
+
+REQUEST_LATENCY = Histogram(
+    'sudoku_http_request_duration_seconds', 'Request latency by endpoint',
+    ('endpoint', 'method', 'status')
+)
+HINT_STAGE = Histogram(
+    'sudoku_hint_stage_seconds',
+    'Time spent per hint stage (request validation, analysis, and each detector inside it)',
+    ('stage',)
+)
+GENERATOR_STAGE = Histogram(
+    'sudoku_generator_stage_seconds', 'Time spent per puzzle generation stage', ('stage',)
+)
+COMPUTE_WAIT = Histogram(
+    'sudoku_compute_queue_wait_seconds', 'Time compute pool calls waited for a worker process', ('task',)
+)
+COMPUTE_RUN = Histogram(
+    'sudoku_compute_run_seconds', 'Time compute pool calls ran in a worker process', ('task',)
+)
+COMPUTE_CALLS = Counter(
+    'sudoku_compute_calls', 'Compute pool calls by what the caller got back (ok, error, timeout, rejected)',
+    ('task', 'outcome')
+)
+LOG_RECORDS = Counter(
+    'sudoku_log_records', 'Log records by what the sampled queue handler did with them', ('outcome',)
+)
+
+
+def configure(directory: Optional[str], interval: float = 5.0):
+    """Share metrics between processes through files in ``directory`` (None keeps them local)"""
+    global _directory, _interval
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _directory = directory
+    _interval = interval
+
+
+def _path() -> str:
+    return os.path.join(_directory, f"metrics_{os.getpid()}_{int(_started * 1000)}.json")
+
+
+def write():
+    """Write this process's values to its file (atomically)"""
+    if not _directory:
+        return
+    path = _path()
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump({name: metric.snapshot() for name, metric in _registry.items()}, f)
+    os.replace(temporary, path)
+
+
+def _write_loop():
+    while True:
+        time.sleep(_interval)
+        try:
+            write()
+        except OSError:
+            pass
+
+
+def _ensure_writer():
+    """Start the file writer thread the first time this process records something"""
+    global _writer
+    if _writer is not None or not _directory:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name='metrics-writer', daemon=True)
+            _writer.start()
+
+
+def _after_fork():
+    """A forked child starts with empty metrics, a fresh file and no writer thread"""
+    global _started, _writer, _writer_lock
+    _started = time.time()
+    _writer = None
+    _writer_lock = threading.Lock()
+    for metric in _registry.values():
+        metric._lock = threading.Lock()
+        metric.reset()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+@atexit.register
+def _write_at_exit():
+    try:
+        write()
+    except OSError:
+        pass
+
+
+def drain() -> Dict[str, List]:
+    """Take every value recorded in this process so far, leaving the metrics empty.
+
+    Pool worker processes return this with their results so that the
+    parent can merge() it; that way their timings reach /metrics with or
+    without a metrics directory.
+    """
+    drained = {}
+    for name, metric in _registry.items():
+        with metric._lock:
+            values, metric._values = metric._values, {}
+        if values:
+            drained[name] = list(values.items())
+    return drained
+
+
+def merge(drained: Dict[str, List]):
+    """Add values returned by drain() in another process to this process's metrics"""
+    for name, samples in drained.items():
+        metric = _registry.get(name)
+        if metric is not None:
+            metric.merge(samples)
+
+
+def collect() -> Dict:
+    """Sum the snapshots of every process (just this one without a directory)"""
+    if _directory:
+        write()
+        snapshots = []
+        for path in glob.glob(os.path.join(_directory, 'metrics_*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    else:
+        snapshots = [{name: metric.snapshot() for name, metric in _registry.items()}]
+
+    merged = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, dict(data, samples={}))
+            for labels, value in data['samples']:
+                key = tuple(labels)
+                if data['type'] == 'counter':
+                    target['samples'][key] = target['samples'].get(key, 0) + value
+                else:
+                    current = target['samples'].get(key)
+                    target['samples'][key] = value if current is None else [a + b for a, b in zip(current, value)]
+    return merged
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """All metrics, summed over processes, in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for name, data in sorted(collect().items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        names = data['labelnames']
+        for key, value in sorted(data['samples'].items()):
+            if data['type'] == 'counter':
+                lines.append(f"{name}_total{_labels(names, key)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(data['buckets']) + ['+Inf'], value[:-1]):
+                cumulative += count
+                le = 'le="{}"'.format(bound if bound == '+Inf' else _number(float(bound)))
+                lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,208 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from app import app, db
+from models import DailyPuzzle, Game
+from utils.board import CELL_UNITS, COL_OF, PEERS, ROW_OF
+
+
+class MoveError(ValueError):
+    """A move that cannot be applied (bad cell or value, or a given cell)"""
+
+
+class MoveTracker:
+    """A board with per-unit digit counts, updated in O(1) per placement or erase.
+
+    ``counts[u][d]`` is how many times digit ``d`` appears in unit ``u``
+    (units as in utils.board.UNITS) and ``duplicates`` is the number of
+    (unit, digit) pairs that appear more than once, so a filled board with
+    no duplicates is solved without looking at the solution.
+    """
+
+    def __init__(self, puzzle: str, state: Optional[str] = None):
+        self.givens = [digit != '0' for digit in puzzle]
+        self.cells = [int(digit) for digit in (state or puzzle)]
+        self.counts = [[0] * 10 for _ in range(27)]
+        self.duplicates = 0
+        self.filled = 0
+        # Moves stored for the game when this tracker was last in sync
+        self.move_count = 0
+        self.lock = threading.Lock()
+        for index, digit in enumerate(self.cells):
+            if digit:
+                self._add(index, digit)
+
+    def _add(self, index, digit):
+        self.filled += 1
+        for unit in CELL_UNITS[index]:
+            count = self.counts[unit][digit]
+            if count == 1:
+                self.duplicates += 1
+            self.counts[unit][digit] = count + 1
+
+    def _remove(self, index, digit):
+        self.filled -= 1
+        for unit in CELL_UNITS[index]:
+            count = self.counts[unit][digit]
+            if count == 2:
+                self.duplicates -= 1
+            self.counts[unit][digit] = count - 1
+
+    def check(self, index: int, digit: int):
+        """Raise MoveError if the move is not allowed"""
+        if not isinstance(index, int) or not 0 <= index < 81:
+            raise MoveError("Cell is outside the board")
+        if not isinstance(digit, int) or isinstance(digit, bool) or not 0 <= digit <= 9:
+            raise MoveError("Value must be a digit from 0 (erase) to 9")
+        if self.givens[index]:
+            raise MoveError(f"Cell ({ROW_OF[index]}, {COL_OF[index]}) is a given")
+
+    def place(self, index: int, digit: int) -> List[int]:
+        """Set a cell (0 erases) and return the peer cells holding the same digit"""
+        self.check(index, digit)
+        old = self.cells[index]
+        if old == digit:
+            return self.conflicts(index)
+        if old:
+            self._remove(index, old)
+        self.cells[index] = digit
+        if digit:
+            self._add(index, digit)
+        return self.conflicts(index)
+
+    def conflicts(self, index: int) -> List[int]:
+        digit = self.cells[index]
+        if not digit or all(self.counts[unit][digit] < 2 for unit in CELL_UNITS[index]):
+            return []
+        return [peer for peer in PEERS[index] if self.cells[peer] == digit]
+
+    @property
+    def complete(self) -> bool:
+        return self.filled == 81 and self.duplicates == 0
+
+    @property
+    def board(self) -> str:
+        return ''.join(map(str, self.cells))
+
+
+def parse_moves(moves) -> List[Tuple[int, int]]:
+    """Turn [{'row', 'col', 'value'}, ...] into (index, digit) pairs"""
+    if not isinstance(moves, list) or not moves:
+        raise MoveError("moves must be a non-empty list")
+    parsed = []
+    for move in moves:
+        if not isinstance(move, dict):
+            raise MoveError("Each move needs row, col and value")
+        row, col, value = move.get('row'), move.get('col'), move.get('value')
+        if not all(isinstance(x, int) and not isinstance(x, bool) for x in (row, col)) \
+                or not (0 <= row < 9 and 0 <= col < 9):
+            raise MoveError("row and col must be integers from 0 to 8")
+        if isinstance(value, str) and len(value) == 1 and value.isdigit():
+            value = int(value)
+        parsed.append((row * 9 + col, value))
+    return parsed
+
+
+def apply_moves(tracker: MoveTracker, moves: List[Tuple[int, int]]) -> Dict:
+    """Apply parsed moves, all or nothing, and describe the outcome"""
+    for index, digit in moves:
+        tracker.check(index, digit)
+    results = []
+    for index, digit in moves:
+        conflicts = tracker.place(index, digit)
+        results.append({
+            'row': ROW_OF[index],
+            'col': COL_OF[index],
+            'value': digit,
+            'conflicts': [{'row': ROW_OF[peer], 'col': COL_OF[peer]} for peer in conflicts]
+        })
+    return {
+        'results': results,
+        'filled': tracker.filled,
+        'duplicates': tracker.duplicates,
+        'complete': tracker.complete
+    }
+
+
+def replay_moves(puzzle: str, moves) -> Dict:
+    """Verify a move list from the starting puzzle without touching stored state"""
+    return apply_moves(MoveTracker(puzzle), parse_moves(moves))
+
+
+# Trackers for games played through this worker. The database row is
+# authoritative; see play_moves.
+_trackers = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def _get_tracker(game_id: int) -> Optional[MoveTracker]:
+    with _trackers_lock:
+        tracker = _trackers.get(game_id)
+        if tracker is not None:
+            _trackers.move_to_end(game_id)
+            return tracker
+
+    game = db.session.get(Game, game_id)
+    if game is None:
+        return None
+    shared = db.session.execute(
+        select(DailyPuzzle.id).where(DailyPuzzle.game_id == game_id)
+    ).first()
+    if shared is not None:
+        raise MoveError("The daily challenge is shared by all players; send its moves with replay")
+    tracker = MoveTracker(game.puzzle, game.state)
+    tracker.move_count = game.move_count
+    with _trackers_lock:
+        tracker = _trackers.setdefault(game_id, tracker)
+        _trackers.move_to_end(game_id)
+        while len(_trackers) > app.config['MOVE_TRACKER_CACHE_SIZE']:
+            _trackers.popitem(last=False)
+    return tracker
+
+
+def _forget(game_id: int, tracker: MoveTracker):
+    with _trackers_lock:
+        if _trackers.get(game_id) is tracker:
+            del _trackers[game_id]
+
+
+def play_moves(game_id: int, moves) -> Optional[Dict]:
+    """Apply moves to a game's stored board; None if the game does not exist.
+
+    The tracker is kept in memory, so a move costs O(1) plus one UPDATE.
+    The UPDATE only succeeds if the stored move count still matches the
+    tracker's; otherwise another worker has moved this game since, so the
+    tracker is dropped and the moves are applied to a freshly loaded one.
+    The tracker is also dropped if the UPDATE or commit fails, so moves
+    that were not stored never reach a later request.
+    """
+    parsed = parse_moves(moves)
+    for _ in range(2):
+        tracker = _get_tracker(game_id)
+        if tracker is None:
+            return None
+        with tracker.lock:
+            # Every move is checked before any is placed, so a MoveError
+            # leaves the tracker as it was
+            outcome = apply_moves(tracker, parsed)
+            try:
+                updated = db.session.execute(
+                    update(Game)
+                    .where(Game.id == game_id, Game.move_count == tracker.move_count)
+                    .values(state=tracker.board, move_count=tracker.move_count + len(parsed))
+                ).rowcount
+                if updated:
+                    db.session.commit()
+            except Exception:
+                _forget(game_id, tracker)
+                raise
+            if updated:
+                tracker.move_count += len(parsed)
+                outcome['move_count'] = tracker.move_count
+                return outcome
+            db.session.rollback()
+        _forget(game_id, tracker)
+    raise RuntimeError(f"Game {game_id} is being moved concurrently")
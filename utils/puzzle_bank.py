@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, select
+
+from app import db
+from models import PuzzleBank, insert_ignoring_conflicts
+from utils.generator import canonicalize, random_transform
+
+# How long the per-difficulty id range is cached before being re-read
+BOUNDS_TTL = 300.0
+
+# Random ids looked up per sampling round, and rounds before falling back
+# to the first row after a random id (see sample_puzzle)
+SAMPLE_BATCH = 32
+SAMPLE_ROUNDS = 3
+
+_bounds = {}
+_bounds_lock = threading.Lock()
+
+
+def insert_puzzles(puzzles: Iterable[Dict]) -> int:
+    """Canonicalise and insert generated puzzles in one statement.
+
+    Each puzzle is a dict with 'puzzle', 'solution' and 'rating' keys as
+    returned by generate_unique_puzzle, and optionally 'canonical' as
+    added by generate_chunk (computed here otherwise). Duplicates (within
+    the batch or already stored) are skipped. Returns the number of rows
+    inserted.
+    """
+    rows = {}
+    for result in puzzles:
+        canonical, solution = result.get('canonical') or canonicalize(result['puzzle'], result['solution'])
+        rows[canonical] = {
+            'board': (canonical, solution),
+            'difficulty': result['rating']
+        }
+    if not rows:
+        return 0
+    inserted = db.session.execute(
+        insert_ignoring_conflicts(PuzzleBank, list(rows.values()), ['board'])
+    ).rowcount
+    db.session.commit()
+    with _bounds_lock:
+        _bounds.clear()
+    return inserted
+
+
+def _id_bounds(difficulty: str):
+    """Return the cached (min id, max id) for a difficulty, or None if empty"""
+    now = time.monotonic()
+    with _bounds_lock:
+        cached = _bounds.get(difficulty)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    bounds = db.session.execute(
+        select(func.min(PuzzleBank.id), func.max(PuzzleBank.id))
+        .where(PuzzleBank.difficulty == difficulty)
+    ).one()
+    bounds = None if bounds[0] is None else tuple(bounds)
+    with _bounds_lock:
+        _bounds[difficulty] = (now + BOUNDS_TTL, bounds)
+    return bounds
+
+
+def sample_puzzle(difficulty: str, rng=random) -> Optional[Dict]:
+    """Pick a uniformly random banked puzzle without scanning the table.
+
+    Difficulties share one id sequence and conflicting inserts leave
+    gaps, so the first row at or after a random id would favour rows that
+    follow long gaps. Instead SAMPLE_BATCH random ids from the
+    difficulty's id range are looked up by primary key and the first
+    drawn id that is a row of this difficulty wins (rejection sampling),
+    which is uniform over its rows. After SAMPLE_ROUNDS rounds without a
+    hit, which needs a very sparse difficulty, the first row at or after
+    a random id is used. The stored canonical form is given a random
+    symmetry (see random_transform) before being returned. Returns None
+    if the bank has no puzzles for the difficulty.
+    """
+    bounds = _id_bounds(difficulty)
+    if bounds is None:
+        return None
+
+    query = select(PuzzleBank.id, PuzzleBank.board).where(PuzzleBank.difficulty == difficulty)
+    row = None
+    for _ in range(SAMPLE_ROUNDS):
+        drawn = [rng.randint(*bounds) for _ in range(SAMPLE_BATCH)]
+        found = {hit.id: hit for hit in db.session.execute(query.where(PuzzleBank.id.in_(set(drawn))))}
+        row = next((found[id_] for id_ in drawn if id_ in found), None)
+        if row is not None:
+            break
+    else:
+        row = db.session.execute(
+            query.where(PuzzleBank.id >= rng.randint(*bounds)).order_by(PuzzleBank.id).limit(1)
+        ).first()
+        if row is None:
+            row = db.session.execute(query.order_by(PuzzleBank.id).limit(1)).first()
+        if row is None:
+            return None
+
+    transform = random_transform(rng)
+    puzzle, solution = (transform.apply(board) for board in row.board)
+    return {
+        'puzzle': puzzle,
+        'solution': solution,
+        'rating': difficulty
+    }
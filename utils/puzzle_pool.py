@@ -0,0 +1,185 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+from utils import metrics
+from utils.generator import DIFFICULTY_PROFILES, generate_unique_puzzle
+
+logger = logging.getLogger(__name__)
+
+
+def _generate(difficulty: str) -> Dict:
+    """Process pool entry point; must live at module level to be picklable"""
+    return generate_unique_puzzle(difficulty)
+
+
+def _refill(difficulty: str):
+    """Background refill entry point: the puzzle plus the generator timings recorded for it"""
+    return generate_unique_puzzle(difficulty), metrics.drain()
+
+
+class PuzzlePool:
+    """Per-difficulty pool of ready puzzles refilled by background processes.
+
+    ``get`` pops a puzzle in O(1). Whenever a difficulty drops below
+    ``low_water`` puzzles (counting ones already being generated), enough
+    jobs are queued on a process pool to bring it back up to
+    ``high_water``. If the pool is empty the puzzle is generated
+    synchronously and counted as a miss; given a ``compute`` pool (see
+    utils.compute) that generation runs there rather than in the calling
+    thread. With ``workers=0`` the background refill is disabled and
+    every request is served synchronously.
+    """
+
+    RATE_WINDOW = 60.0
+
+    def __init__(self, low_water: int = 10, high_water: int = 30, workers: int = 2, compute=None):
+        self.low_water = low_water
+        self.high_water = max(high_water, low_water)
+        self.workers = workers
+        self.compute = compute
+        self._puzzles = {difficulty: deque() for difficulty in DIFFICULTY_PROFILES}
+        self._in_flight = {difficulty: 0 for difficulty in DIFFICULTY_PROFILES}
+        self._hits = {difficulty: 0 for difficulty in DIFFICULTY_PROFILES}
+        self._misses = {difficulty: 0 for difficulty in DIFFICULTY_PROFILES}
+        self._refilled = {difficulty: 0 for difficulty in DIFFICULTY_PROFILES}
+        self._refill_times = deque()
+        self._errors = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._registered = False
+
+    def get(self, difficulty: str) -> Dict:
+        """Return a generated puzzle for ``difficulty``"""
+        if difficulty not in self._puzzles:
+            difficulty = 'easy'
+        try:
+            result = self._puzzles[difficulty].popleft()
+            hit = True
+        except IndexError:
+            result = None
+            hit = False
+
+        with self._lock:
+            if hit:
+                self._hits[difficulty] += 1
+            else:
+                self._misses[difficulty] += 1
+        self.refill(difficulty)
+
+        if result is None:
+            if self.compute is not None:
+                result = self.compute.call('generate', _generate, difficulty)
+            else:
+                result = generate_unique_puzzle(difficulty)
+        return result
+
+    def start(self):
+        """Queue an initial fill for every difficulty"""
+        for difficulty in self._puzzles:
+            self.refill(difficulty)
+
+    def refill(self, difficulty: str):
+        """Queue background generation if ``difficulty`` is below the low-water mark"""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            level = len(self._puzzles[difficulty]) + self._in_flight[difficulty]
+            if level >= self.low_water:
+                return
+            needed = self.high_water - level
+            self._in_flight[difficulty] += needed
+
+        executor = self._get_executor()
+        for submitted in range(needed):
+            try:
+                try:
+                    future = executor.submit(_refill, difficulty)
+                except BrokenProcessPool:
+                    # A worker died; replace the pool once
+                    self._discard(executor)
+                    executor = self._get_executor()
+                    future = executor.submit(_refill, difficulty)
+            except RuntimeError:
+                # Executor shut down (interpreter exiting) or broken again; drop the rest
+                with self._lock:
+                    self._in_flight[difficulty] -= needed - submitted
+                return
+            future.add_done_callback(lambda f, d=difficulty, e=executor: self._on_generated(d, e, f))
+
+    def _on_generated(self, difficulty, executor, future):
+        error = None if future.cancelled() else future.exception()
+        if isinstance(error, BrokenProcessPool):
+            # Replaced here so that the next refill does not submit to a dead pool
+            self._discard(executor)
+        with self._lock:
+            self._in_flight[difficulty] -= 1
+            if future.cancelled() or error is not None:
+                self._errors += 1
+                return
+            self._refilled[difficulty] += 1
+            self._refill_times.append(time.monotonic())
+        puzzle, recorded = future.result()
+        metrics.merge(recorded)
+        self._puzzles[difficulty].append(puzzle)
+
+    def _get_executor(self):
+        # Created lazily so that forking servers start the pool in each worker
+        # after the fork rather than sharing one inherited from the master.
+        with self._lock:
+            if self._executor is None:
+                # Workers keep their metrics local; _refill hands them back
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=metrics.configure, initargs=(None,)
+                )
+                if not self._registered:
+                    atexit.register(self.shutdown)
+                    self._registered = True
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.warning("Puzzle pool worker died; starting a new process pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        """Pool depth, refill rate and hit/miss counts per difficulty"""
+        now = time.monotonic()
+        with self._lock:
+            while self._refill_times and now - self._refill_times[0] > self.RATE_WINDOW:
+                self._refill_times.popleft()
+            refill_rate = len(self._refill_times) / self.RATE_WINDOW
+            difficulties = {}
+            for difficulty, puzzles in self._puzzles.items():
+                hits = self._hits[difficulty]
+                misses = self._misses[difficulty]
+                difficulties[difficulty] = {
+                    'depth': len(puzzles),
+                    'in_flight': self._in_flight[difficulty],
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else None,
+                    'refilled': self._refilled[difficulty]
+                }
+            return {
+                'low_water': self.low_water,
+                'high_water': self.high_water,
+                'workers': self.workers,
+                'refill_rate_per_second': refill_rate,
+                'refill_errors': self._errors,
+                'difficulties': difficulties
+            }
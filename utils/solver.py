@@ -0,0 +1,296 @@
+"""Bitmask constraint-propagation Sudoku solver.
+
+Digits are stored as bits (digit ``d`` is ``1 << (d - 1)``) in per-row,
+per-column and per-box masks, so candidate sets for a cell are a single
+``ALL & ~(row | col | box)`` expression instead of 27 list lookups.
+Search picks the cell with the fewest candidates (MRV) after propagating
+naked and hidden singles.
+"""
+from typing import List, Optional, Sequence, Tuple, Union
+
+from utils.board import ALL, BOX_OF, COL_OF, DIGIT_BITS, ROW_OF, UNITS, Board, BoardError
+
+Grid = Union[str, Sequence, Board]
+
+
+def parse_grid(grid: Grid) -> List[int]:
+    """Convert a grid to a flat list of 81 ints (0 for empty cells).
+
+    Accepts a Board, an 81-character string ('0' or '.' for empty cells),
+    a flat sequence of 81 values, or a 9x9 list of rows. Values may be
+    ints or one-character strings.
+    """
+    if isinstance(grid, Board):
+        return list(grid.cells)
+    if isinstance(grid, str):
+        try:
+            return list(Board.parse(grid).cells)
+        except BoardError as e:
+            if e.characters:
+                raise ValueError(f"Invalid cell value: {e.characters[0]!r}")
+            raise ValueError("Grid must contain exactly 81 cells")
+    if len(grid) == 9:
+        cells = [value for row in grid for value in row]
+    else:
+        cells = grid
+
+    if len(cells) != 81:
+        raise ValueError("Grid must contain exactly 81 cells")
+
+    parsed = []
+    for value in cells:
+        if value == '.':
+            value = 0
+        try:
+            digit = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid cell value: {value!r}")
+        if not 0 <= digit <= 9:
+            raise ValueError(f"Invalid cell value: {value!r}")
+        parsed.append(digit)
+    return parsed
+
+
+def _load(cells: List[int]) -> Optional[Tuple[List[int], List[int], List[int]]]:
+    """Build the row/column/box masks, or return None if the givens clash"""
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, digit in enumerate(cells):
+        if not digit:
+            continue
+        bit = 1 << (digit - 1)
+        r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+        if (rows[r] | cols[c] | boxes[b]) & bit:
+            return None
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+    return rows, cols, boxes
+
+
+def _propagate(cells, rows, cols, boxes):
+    """Fill naked and hidden singles in place.
+
+    Returns ``(ok, index, mask)`` where ``ok`` is False on a contradiction,
+    and ``index``/``mask`` describe the empty cell with the fewest
+    candidates (``index`` is -1 once the grid is full).
+    """
+    while True:
+        progress = False
+        best = -1
+        best_count = 10
+        best_mask = 0
+
+        for i in range(81):
+            if cells[i]:
+                continue
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            mask = ALL & ~(rows[r] | cols[c] | boxes[b])
+            if not mask:
+                return False, -1, 0
+            if not mask & (mask - 1):
+                cells[i] = mask.bit_length()
+                rows[r] |= mask
+                cols[c] |= mask
+                boxes[b] |= mask
+                progress = True
+                continue
+            count = mask.bit_count()
+            if count < best_count:
+                best, best_count, best_mask = i, count, mask
+
+        if progress:
+            continue
+        if best < 0:
+            return True, -1, 0
+
+        for unit in UNITS:
+            once = twice = placed = 0
+            for i in unit:
+                if cells[i]:
+                    placed |= 1 << (cells[i] - 1)
+                else:
+                    mask = ALL & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                    twice |= once & mask
+                    once |= mask
+            if (once | placed) != ALL:
+                return False, -1, 0
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for i in unit:
+                    if cells[i]:
+                        continue
+                    r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                    if bit & ~(rows[r] | cols[c] | boxes[b]):
+                        cells[i] = bit.bit_length()
+                        rows[r] |= bit
+                        cols[c] |= bit
+                        boxes[b] |= bit
+                        progress = True
+                        break
+
+        if not progress:
+            return True, best, best_mask
+
+
+def _search(cells, rows, cols, boxes, limit, found):
+    ok, index, mask = _propagate(cells, rows, cols, boxes)
+    if not ok:
+        return
+    if index < 0:
+        found.append(cells)
+        return
+
+    r, c, b = ROW_OF[index], COL_OF[index], BOX_OF[index]
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        branch = cells[:]
+        branch[index] = bit.bit_length()
+        branch_rows = rows[:]
+        branch_cols = cols[:]
+        branch_boxes = boxes[:]
+        branch_rows[r] |= bit
+        branch_cols[c] |= bit
+        branch_boxes[b] |= bit
+        _search(branch, branch_rows, branch_cols, branch_boxes, limit, found)
+        if len(found) >= limit:
+            return
+
+
+def solve(grid: Grid) -> Optional[str]:
+    """Solve a puzzle and return the solution as an 81-character string.
+
+    Returns None if the puzzle has no solution. When a puzzle has several
+    solutions the first one found is returned; the search order is
+    deterministic, so the same input always yields the same solution.
+    """
+    cells = parse_grid(grid)
+    masks = _load(cells)
+    if masks is None:
+        return None
+    found = []
+    _search(cells, *masks, 1, found)
+    if not found:
+        return None
+    return ''.join(str(digit) for digit in found[0])
+
+
+def count_solutions(grid: Grid, limit: int = 2) -> int:
+    """Count the solutions of a puzzle, stopping once ``limit`` are found"""
+    cells = parse_grid(grid)
+    masks = _load(cells)
+    if masks is None:
+        return 0
+    found = []
+    _search(cells, *masks, limit, found)
+    return len(found)
+
+
+def is_solved(grid: Grid, puzzle: Optional[Grid] = None) -> bool:
+    """True if ``grid`` is a complete, valid board keeping the givens of ``puzzle``.
+
+    Each cell's digit bit is ORed into its row, column and box mask. With
+    81 cells and 27 units of 9, every mask is ALL only if no cell is empty
+    and no unit repeats a digit, so no solution is needed to check it.
+    """
+    board = grid if isinstance(grid, str) else ''.join(map(str, parse_grid(grid)))
+    if len(board) != 81:
+        return False
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, char in enumerate(board):
+        bit = DIGIT_BITS.get(char, 0)
+        rows[ROW_OF[i]] |= bit
+        cols[COL_OF[i]] |= bit
+        boxes[BOX_OF[i]] |= bit
+    for unit in (rows, cols, boxes):
+        for mask in unit:
+            if mask != ALL:
+                return False
+    if puzzle is not None:
+        givens = puzzle if isinstance(puzzle, str) else ''.join(map(str, parse_grid(puzzle)))
+        return all(given in '0.' or given == digit for given, digit in zip(givens, board))
+    return True
+
+
+TECHNIQUES = ('naked_single', 'hidden_single', 'search')
+
+
+def rate_puzzle(grid: Grid, max_technique: str = 'search') -> Optional[str]:
+    """Return the hardest technique a human needs to solve the puzzle.
+
+    The puzzle is solved logically, preferring naked singles and falling
+    back to hidden singles only when none are left. If singles stall the
+    rating is 'search'. Solving stops early as soon as a technique harder
+    than ``max_technique`` would be needed, and that technique is returned.
+    Returns None if the givens lead to a contradiction.
+    """
+    cells = parse_grid(grid)
+    masks = _load(cells)
+    if masks is None:
+        return None
+    rows, cols, boxes = masks
+    limit = TECHNIQUES.index(max_technique)
+    hardest = 0
+
+    while True:
+        placed = False
+        remaining = False
+        for i in range(81):
+            if cells[i]:
+                continue
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            mask = ALL & ~(rows[r] | cols[c] | boxes[b])
+            if not mask:
+                return None
+            if mask & (mask - 1):
+                remaining = True
+                continue
+            cells[i] = mask.bit_length()
+            rows[r] |= mask
+            cols[c] |= mask
+            boxes[b] |= mask
+            placed = True
+
+        if placed:
+            continue
+        if not remaining:
+            return TECHNIQUES[hardest]
+        if limit < 1:
+            return TECHNIQUES[1]
+
+        for unit in UNITS:
+            once = twice = seen = 0
+            for i in unit:
+                if cells[i]:
+                    seen |= 1 << (cells[i] - 1)
+                else:
+                    mask = ALL & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                    twice |= once & mask
+                    once |= mask
+            if (once | seen) != ALL:
+                return None
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for i in unit:
+                    if cells[i]:
+                        continue
+                    r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+                    if bit & ~(rows[r] | cols[c] | boxes[b]):
+                        cells[i] = bit.bit_length()
+                        rows[r] |= bit
+                        cols[c] |= bit
+                        boxes[b] |= bit
+                        placed = True
+                        break
+
+        if not placed:
+            return TECHNIQUES[2]
+        hardest = 1
@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert, select
+
+from app import db
+from models import Game, Submission
+from utils.board import Board, BoardError
+from utils.leaderboard import daily_dates, record_completion, solve_time
+from utils.solver import is_solved
+
+try:
+    from utils.batch import verify_batch
+except ImportError:  # NumPy is optional; boards are then checked one at a time
+    verify_batch = None
+
+# Game ids per IN (...) lookup in bulk mode, well under SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+
+class SubmissionError(ValueError):
+    """A submission with missing or malformed fields"""
+
+
+def parse_submission(data: Dict, game_id: Optional[int] = None) -> Dict:
+    """Check a submission's fields and return them as Submission column values"""
+    if not isinstance(data, dict):
+        raise SubmissionError("Each submission must be an object")
+    if game_id is None:
+        game_id = data.get('game_id')
+    if not isinstance(game_id, int) or isinstance(game_id, bool):
+        raise SubmissionError("game_id must be an integer")
+    try:
+        board = str(Board.parse(data.get('board')))
+    except BoardError:
+        raise SubmissionError("board must be a string of 81 digits")
+    player = data.get('player')
+    if player is not None and (not isinstance(player, str) or len(player) > 64):
+        raise SubmissionError("player must be a string of at most 64 characters")
+    seconds = data.get('seconds')
+    if seconds is not None and (not isinstance(seconds, int) or isinstance(seconds, bool) or seconds < 0):
+        raise SubmissionError("seconds must be a non-negative integer")
+    return {'game_id': game_id, 'board': board, 'player': player, 'seconds': seconds}
+
+
+def _rank_daily(results: List[Dict], rows: List[Dict], tokens: List, puzzles: Dict[int, str]):
+    """Put valid, timed solves of daily challenges on the leaderboard.
+
+    ``tokens`` holds each row's 'started' token and ``puzzles`` the givens
+    by game id. Solves that cannot be ranked get the reason in 'rank_error'.
+    """
+    timed = [
+        (result, row, token) for result, row, token in zip(results, rows, tokens)
+        if row['valid'] and row['player'] and row['seconds'] is not None
+    ]
+    if not timed:
+        return
+    dates = daily_dates({row['game_id'] for _, row, _ in timed})
+    for result, row, token in timed:
+        day = dates.get(row['game_id'])
+        if day is None:
+            continue
+        seconds, error = solve_time(token, day, row['seconds'], puzzles[row['game_id']].count('0'))
+        if error:
+            result['rank'] = None
+            result['rank_error'] = error
+        else:
+            result['rank'] = record_completion(day, row['player'], seconds)
+
+
+def submit_board(game_id: int, data: Dict) -> Optional[Dict]:
+    """Verify and record one completed board; None if the game does not exist.
+
+    Valid solves of a daily challenge that include player, seconds and the
+    started token are ranked on its leaderboard and the result includes
+    the rank (see utils.leaderboard.solve_time).
+    """
+    fields = parse_submission(data, game_id)
+    game = db.session.get(Game, game_id)
+    if game is None:
+        return None
+    submission = Submission(valid=is_solved(fields['board'], game.puzzle), **fields)
+    db.session.add(submission)
+    db.session.commit()
+    result = {'submission_id': submission.id, 'game_id': game_id, 'valid': submission.valid}
+    _rank_daily([result], [dict(fields, valid=submission.valid)], [data.get('started')], {game_id: game.puzzle})
+    return result
+
+
+def _load_puzzles(game_ids: List[int]) -> Dict[int, str]:
+    puzzles = {}
+    for offset in range(0, len(game_ids), LOOKUP_CHUNK):
+        rows = db.session.execute(
+            select(Game.id, Game.board).where(Game.id.in_(game_ids[offset:offset + LOOKUP_CHUNK]))
+        )
+        for game_id, board in rows:
+            puzzles[game_id] = board[0]
+    return puzzles
+
+
+def submit_boards(items: List[Dict]) -> List[Dict]:
+    """Verify and record many submissions with one lookup per chunk and one INSERT.
+
+    Returns a result per item, in order. Malformed items and unknown games
+    get an 'error' and are not recorded. Daily solves are ranked as in
+    submit_board.
+    """
+    results = [None] * len(items)
+    parsed = []
+    for position, item in enumerate(items):
+        try:
+            parsed.append((position, parse_submission(item)))
+        except SubmissionError as e:
+            game_id = item.get('game_id') if isinstance(item, dict) else None
+            results[position] = {'game_id': game_id, 'valid': False, 'error': str(e)}
+
+    puzzles = _load_puzzles(sorted({fields['game_id'] for _, fields in parsed}))
+    known = []
+    for position, fields in parsed:
+        if fields['game_id'] in puzzles:
+            known.append((position, fields))
+        else:
+            results[position] = {'game_id': fields['game_id'], 'valid': False, 'error': 'Game not found'}
+
+    boards = [fields['board'] for _, fields in known]
+    givens = [puzzles[fields['game_id']] for _, fields in known]
+    if verify_batch is not None and known:
+        valid = verify_batch(boards, givens)
+    else:
+        valid = [is_solved(board, puzzle) for board, puzzle in zip(boards, givens)]
+
+    rows = []
+    for (position, fields), ok in zip(known, valid):
+        rows.append(dict(fields, valid=ok))
+        results[position] = {'game_id': fields['game_id'], 'valid': ok}
+    if rows:
+        db.session.execute(insert(Submission), rows)
+        db.session.commit()
+        _rank_daily(
+            [results[position] for position, _ in known], rows,
+            [items[position].get('started') for position, _ in known], puzzles
+        )
+    return results
@@ -0,0 +1,133 @@
+"""Start-up work done before a worker takes traffic, and the readiness it reports.
+
+A fresh worker pays for its first requests: the database pool opens its
+connections, the seed bank is read from disk, today's daily puzzle is
+loaded (or generated) and the compute pool starts its processes. WarmUp
+runs such steps in a background thread, in the order they were
+registered, and keeps the time each took. It is started per process
+after any fork, either by a server hook before the worker accepts
+connections (see gunicorn.conf.py) or by the first request, so a forking
+server's master never starts pools or opens connections that its workers
+would inherit. A step that fails is logged and retried every
+``retry_interval`` seconds, so a worker whose database was briefly
+unreachable becomes ready once it is back. Steps must therefore be safe
+to repeat.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+
+class WarmUp:
+    """Named start-up steps; ready once every enabled step has succeeded.
+
+    ``enabled`` is 'all', 'none' or a comma-separated list of step names,
+    as in the WARM_UP setting. Steps run inside ``context()`` (e.g. an app
+    context) and ``on_ready`` is called once they have all succeeded.
+    Until arm() is called there is nothing to wait for and the process
+    counts as ready.
+    """
+
+    def __init__(self, enabled: str = 'all', logger: logging.Logger = None,
+                 context: Callable = nullcontext, on_ready: Optional[Callable[[], None]] = None,
+                 retry_interval: float = 5.0):
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger(__name__)
+        self.context = context
+        self.on_ready = on_ready
+        self.retry_interval = retry_interval
+        self.armed = False
+        self._steps = {}
+        self._seconds = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._first_pass = threading.Event()
+
+    def step(self, name: str):
+        """Decorator registering a function as the step ``name``"""
+        def register(func: Callable[[], None]) -> Callable[[], None]:
+            self._steps[name] = func
+            return func
+        return register
+
+    def enabled_steps(self) -> List[str]:
+        if self.enabled.strip().lower() == 'all':
+            return list(self._steps)
+        if self.enabled.strip().lower() == 'none':
+            return []
+        names = [name.strip() for name in self.enabled.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self._steps]
+        if unknown:
+            raise ValueError(f"Unknown warm-up step(s): {', '.join(unknown)}")
+        return [name for name in self._steps if name in names]
+
+    def arm(self):
+        """Make readiness wait for the steps; checks the step names"""
+        self.enabled_steps()
+        self.armed = True
+
+    def start(self, wait: bool = False):
+        """Run the steps in a background thread, once per process (armed only).
+
+        With ``wait``, return once every step has been tried once.
+        """
+        if not self.armed:
+            return
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # After a fork the parent's thread is gone; start afresh
+                    self._pid = os.getpid()
+                    self._first_pass = threading.Event()
+                    self._thread = threading.Thread(target=self._loop, name='warm-up', daemon=True)
+                    self._thread.start()
+        if wait:
+            self._first_pass.wait()
+
+    def _loop(self):
+        while True:
+            with self.context():
+                ready = self.run()
+            self._first_pass.set()
+            if ready:
+                if self.on_ready is not None:
+                    self.on_ready()
+                return
+            time.sleep(self.retry_interval)
+
+    def run(self) -> bool:
+        """Run the enabled steps that have not succeeded yet and return whether all have"""
+        for name in self.enabled_steps():
+            if name in self._seconds:
+                continue
+            start = time.perf_counter()
+            try:
+                self._steps[name]()
+            except Exception as e:
+                self._errors[name] = str(e).splitlines()[0] if str(e) else type(e).__name__
+                self.logger.error(f"Warm-up step {name} failed: {str(e)}")
+                continue
+            self._seconds[name] = time.perf_counter() - start
+            self._errors.pop(name, None)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return not self.armed or all(name in self._seconds for name in self.enabled_steps())
+
+    def stats(self) -> Dict:
+        """Readiness plus each enabled step's duration in seconds, last error (first line), or neither if not run yet"""
+        steps = {}
+        for name in self.enabled_steps():
+            if name in self._seconds:
+                steps[name] = {'seconds': round(self._seconds[name], 4)}
+            elif name in self._errors:
+                steps[name] = {'error': self._errors[name]}
+            else:
+                steps[name] = {}
+        return {'ready': self.ready, 'started': self._pid == os.getpid(), 'steps': steps}